@@ -0,0 +1,259 @@
+"""
+Microbenchmarks of the hot paths of ``crypto.tools``, ``crypto.primitives``
+and ``crypto.ideal``, each over a few input sizes. Results can be saved as
+a JSON baseline and later runs compared against it::
+
+    python -m crypto.benchmarks.micro run --output baseline.json
+    python -m crypto.benchmarks.micro run --output today.json
+    python -m crypto.benchmarks.micro compare baseline.json today.json
+
+``compare`` exits with status 1 if a benchmark got slower than the
+baseline by more than the threshold (10% by default). Baselines only make
+sense on the machine they were recorded on, so keep one per machine.
+Inputs are generated from a fixed seed, so every run times the same work.
+"""
+import argparse
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+import timeit
+
+from crypto import primitives, tools
+from crypto.ideal.block_cipher import BlockCipher
+
+_SEED = 107
+
+
+def _bytes(rng, n):
+    return ''.join(chr(rng.randrange(256)) for _ in xrange(n))
+
+
+def _prime(rng, bits):
+    n = rng.getrandbits(bits) | (1 << bits - 1) | 1
+    while not tools.is_prime(n):
+        n += 2
+    return n
+
+
+def bench_random_string(rng, size):
+    return lambda: primitives.random_string(size)
+
+
+def bench_xor_strings(rng, size):
+    a, b = _bytes(rng, size), _bytes(rng, size)
+    return lambda: tools.xor_strings(a, b)
+
+
+def bench_string_to_int(rng, size):
+    s = _bytes(rng, size)
+    return lambda: tools.string_to_int(s)
+
+
+def bench_int_to_string(rng, size):
+    x = rng.getrandbits(size * 8)
+    return lambda: tools.int_to_string(x, size)
+
+
+def bench_split(rng, size):
+    s = _bytes(rng, size)
+    return lambda: tools.split(s, 16)
+
+
+def bench_exp(rng, bits):
+    N = rng.getrandbits(bits) | (1 << bits - 1) | 1
+    a, n = rng.getrandbits(bits) % N, rng.getrandbits(bits)
+    return lambda: tools.exp(a, n, N)
+
+
+def bench_is_prime(rng, bits):
+    p = _prime(rng, bits)
+    return lambda: tools.is_prime(p)
+
+
+def bench_egcd(rng, bits):
+    a, b = rng.getrandbits(bits), rng.getrandbits(bits)
+    return lambda: tools.egcd(a, b)
+
+
+def bench_aes(rng, size):
+    k, m = _bytes(rng, 16), _bytes(rng, size)
+    return lambda: primitives.AES(k, m)
+
+
+def _block_cipher(rng, entries):
+    cipher = BlockCipher(16, 16)
+    key = _bytes(rng, 16)
+    blocks = [_bytes(rng, 16) for _ in xrange(entries)]
+    ciphers = [cipher.encrypt(key, block) for block in blocks]
+    return cipher, key, blocks, ciphers
+
+
+def bench_block_cipher_encrypt(rng, entries):
+    cipher, key, blocks, _ = _block_cipher(rng, entries)
+    block = itertools.cycle(blocks).next
+    return lambda: cipher.encrypt(key, block())
+
+
+def bench_block_cipher_decrypt(rng, entries):
+    cipher, key, _, ciphers = _block_cipher(rng, entries)
+    c = itertools.cycle(ciphers).next
+    return lambda: cipher.decrypt(key, c())
+
+
+#: Benchmarks: name, function building the timed callable from a seeded
+#: ``random.Random`` and a size, and the sizes. Sizes are bytes, bits for
+#: the number theory and table entries for the ideal block cipher.
+BENCHMARKS = (
+    ('primitives.random_string', bench_random_string, (16, 256, 4096)),
+    ('tools.xor_strings', bench_xor_strings, (16, 256, 4096)),
+    ('tools.string_to_int', bench_string_to_int, (16, 256, 4096)),
+    ('tools.int_to_string', bench_int_to_string, (16, 256, 4096)),
+    ('tools.split', bench_split, (16, 256, 4096)),
+    ('tools.exp', bench_exp, (256, 1024, 2048)),
+    ('tools.is_prime', bench_is_prime, (64, 256, 1024)),
+    ('tools.egcd', bench_egcd, (128, 512, 1024)),
+    ('primitives.AES', bench_aes, (16, 256, 4096)),
+    ('ideal.BlockCipher.encrypt', bench_block_cipher_encrypt,
+     (100, 10000, 100000)),
+    ('ideal.BlockCipher.decrypt', bench_block_cipher_decrypt,
+     (100, 10000, 100000)),
+)
+
+
+def measure(fn, min_time=0.2, repeat=5):
+    """
+    Times a callable without arguments.
+
+    :param fn: The callable.
+    :param min_time: Seconds every timed loop should take at least; the
+                     number of calls per loop is doubled until it does.
+    :param repeat: Number of timed loops.
+    :return: ``(seconds, number)``: the time of a call in the fastest loop,
+             and the number of calls per loop.
+    """
+    timer = timeit.Timer(fn)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    return min(timer.repeat(repeat, number)) / number, number
+
+
+def run(pattern=None, min_time=0.2, repeat=5):
+    """
+    Runs the benchmarks.
+
+    :param pattern: If given, only the benchmarks whose name contains it.
+    :param min_time: See :func:`measure`.
+    :param repeat: See :func:`measure`.
+    :return: Dict with the ``results``, per ``name[size]``, and a
+             ``machine`` description.
+    """
+    results = {}
+    for name, bench, sizes in BENCHMARKS:
+        if pattern is not None and pattern not in name:
+            continue
+        for size in sizes:
+            fn = bench(random.Random(_SEED), size)
+            seconds, number = measure(fn, min_time, repeat)
+            results['%s[%d]' % (name, size)] = {'seconds': seconds,
+                                                'number': number}
+    return {'machine': {'python': platform.python_version(),
+                        'platform': platform.platform(),
+                        'node': platform.node(),
+                        'time': time.time()},
+            'results': results}
+
+
+def compare(baseline, current, threshold=0.1):
+    """
+    Compares two runs.
+
+    :param baseline: Result of :func:`run` to compare against.
+    :param current: Result of :func:`run` to check.
+    :param threshold: Relative slowdown that counts as a regression.
+    :return: List of ``(name, baseline seconds, current seconds, ratio,
+             status)`` for the benchmarks in both, status being
+             ``'regression'``, ``'improvement'`` or ``'ok'``.
+    """
+    rows = []
+    names = set(baseline['results']) & set(current['results'])
+    for name in sorted(names, key=_order):
+        before = baseline['results'][name]['seconds']
+        after = current['results'][name]['seconds']
+        ratio = after / before
+        status = 'ok'
+        if ratio > 1 + threshold:
+            status = 'regression'
+        elif ratio < 1 / (1 + threshold):
+            status = 'improvement'
+        rows.append((name, before, after, ratio, status))
+    return rows
+
+
+def _order(name):
+    base, _, size = name.rpartition('[')
+    return base, int(size.rstrip(']'))
+
+
+def _load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def _format(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return '%.2f %s' % (seconds / scale, unit)
+    return '%.0f ns' % (seconds / 1e-9)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m crypto.benchmarks.micro',
+        description='Microbenchmarks of tools, primitives and ideal '
+                    'primitives.')
+    sub = parser.add_subparsers(dest='command')
+    r = sub.add_parser('run', help='run the benchmarks')
+    r.add_argument('--filter', help='only benchmarks whose name contains '
+                                    'this')
+    r.add_argument('--min-time', type=float, default=0.2,
+                   help='seconds per timed loop')
+    r.add_argument('--repeat', type=int, default=5,
+                   help='timed loops per benchmark')
+    r.add_argument('--output', help='file to save the results to as JSON')
+    r.add_argument('--baseline', help='results to compare against')
+    r.add_argument('--threshold', type=float, default=0.1)
+    c = sub.add_parser('compare', help='compare two saved runs')
+    c.add_argument('baseline')
+    c.add_argument('current')
+    c.add_argument('--threshold', type=float, default=0.1,
+                   help='relative slowdown that counts as a regression')
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        current = run(args.filter, args.min_time, args.repeat)
+        if args.output is not None:
+            with open(args.output, 'w') as f:
+                json.dump(current, f, indent=2, sort_keys=True)
+        if args.baseline is None:
+            for name in sorted(current['results'], key=_order):
+                print '%-40s %12s' % (
+                    name, _format(current['results'][name]['seconds']))
+            return 0
+        baseline = _load(args.baseline)
+    else:
+        baseline, current = _load(args.baseline), _load(args.current)
+
+    rows = compare(baseline, current, args.threshold)
+    for name, before, after, ratio, status in rows:
+        print '%-40s %12s %12s %7.2fx  %s' % (
+            name, _format(before), _format(after), ratio,
+            '' if status == 'ok' else status.upper())
+    return 1 if any(row[4] == 'regression' for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
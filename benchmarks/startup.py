@@ -0,0 +1,121 @@
+"""
+Measures how long it takes to start using the package: importing its
+modules in a fresh interpreter, and starting simulator worker processes::
+
+    python -m crypto.benchmarks.startup --repeat 10
+
+Every import is timed in a new process, so nothing is cached in memory
+between runs, and the report lists which heavy dependencies the import
+pulled in. None of them should show up for pure Python schemes.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+#: Modules whose import is timed.
+MODULES = ('crypto.tools', 'crypto.primitives', 'crypto.games.game_prf',
+           'crypto.simulator.world_sim', 'crypto.run')
+
+#: Dependencies that are slow to import and only needed by some schemes or
+#: runs.
+HEAVY = ('Crypto', 'IPython', 'numpy', 'multiprocessing', 'decimal')
+
+_SCRIPT = """
+import json, sys, time
+start = time.time()
+import %s
+elapsed = time.time() - start
+json.dump({'seconds': elapsed,
+           'heavy': [m for m in %r if m in sys.modules]}, sys.stdout)
+"""
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def import_time(module, repeat=5):
+    """
+    Times the import of ``module`` in fresh interpreters.
+
+    :param module: Name of the module.
+    :param repeat: Number of interpreters to start.
+    :return: Dict with the ``min`` and ``median`` seconds of the import,
+             the ``process`` seconds of the whole interpreter run (median)
+             and the ``heavy`` dependencies it loaded.
+    """
+    times, totals = [], []
+    for _ in xrange(repeat):
+        start = time.time()
+        out = subprocess.check_output(
+            [sys.executable, '-c', _SCRIPT % (module, HEAVY)])
+        totals.append(time.time() - start)
+        result = json.loads(out)
+        times.append(result['seconds'])
+    return {'min': min(times), 'median': median(times),
+            'process': median(totals), 'heavy': result['heavy']}
+
+
+def _prf(k, x):
+    return x
+
+
+def _adversary(fn):
+    return fn('\x00' * 16) == '\x00' * 16
+
+
+def worker_start(workers=2, repeat=5):
+    """
+    Times starting a simulator's worker processes and getting the result
+    of a first trial from each of them.
+
+    :param workers: Number of worker processes.
+    :param repeat: Number of pools to start.
+    :return: Dict with the ``min`` and ``median`` seconds.
+    """
+    from crypto.games.game_prf import GamePRF
+    from crypto.simulator.world_sim import WorldSim
+
+    times = []
+    for _ in xrange(repeat):
+        sim = WorldSim(GamePRF(_prf, 16, 16), _adversary)
+        start = time.time()
+        sim.pool(workers).call('run_trials', [(0, 1)] * workers)
+        times.append(time.time() - start)
+        sim.close()
+    return {'min': min(times), 'median': median(times)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m crypto.benchmarks.startup',
+        description='Measure import and worker start up times.')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='measurements per module')
+    parser.add_argument('--workers', type=int, default=2,
+                        help='worker processes to start')
+    parser.add_argument('--json', action='store_true',
+                        help='print the results as JSON')
+    args = parser.parse_args(argv)
+
+    results = {'imports': dict((m, import_time(m, args.repeat))
+                               for m in MODULES),
+               'workers': worker_start(args.workers, args.repeat)}
+    if args.json:
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write('\n')
+        return
+    for m in MODULES:
+        r = results['imports'][m]
+        print '%-28s %7.1f ms  (process %6.1f ms)  %s' % (
+            m, r['median'] * 1000, r['process'] * 1000,
+            ', '.join(r['heavy']) or '-')
+    print '%-28s %7.1f ms' % ('%d workers' % args.workers,
+                              results['workers']['median'] * 1000)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+"""
+End to end benchmark of the simulators: trials per second, latency of
+single trials and peak memory for every (game, simulator) pair, and how
+the throughput scales with the number of workers::
+
+    python -m crypto.benchmarks.throughput --workers 1,2,4,8 --json out.json
+
+Every pair plays a reference scheme against a reference adversary:
+
+* ``prf``: WorldSim and GamePRF with AES as the PRF.
+* ``lr``: LRSim and GameLR with AES in ECB mode, and the adversary that
+  spots repeated blocks.
+* ``cca``: CCASim and GameCCA with the same scheme, and an adversary that
+  decrypts a ciphertext with a repeated block.
+* ``ufcma``: UFCMASim and GameUFCMA with the ideal MAC, and an adversary
+  that guesses a tag.
+* ``bind``: BINDSim and GameBIND with an RSA based commitment. Every
+  trial generates a 1024 bit RSA key, so it runs few trials.
+
+Latencies are measured on trials run one by one in this process. The
+throughput at each worker count is measured after a short warm up run
+that starts the worker pool, so it is the steady state rate; peak memory
+is the largest of the trials' processes, see ``base_sim.memory_peak``.
+"""
+import argparse
+import json
+import multiprocessing
+import random
+import time
+
+from crypto.games.game_bind import GameBIND
+from crypto.games.game_cca import GameCCA
+from crypto.games.game_lr import GameLR
+from crypto.games.game_prf import GamePRF
+from crypto.games.game_ufcma import GameUFCMA
+from crypto.ideal.message_authentication_code import MAC
+from crypto.primitives import AES, AES_I, random_string, rsa_keygen
+from crypto.simulator.bind_sim import BINDSim
+from crypto.simulator.cca_sim import CCASim
+from crypto.simulator.lr_sim import LRSim
+from crypto.simulator.ufcma_sim import UFCMASim
+from crypto.simulator.world_sim import WorldSim
+from crypto.tools import split
+
+
+def ecb_encrypt(k, m):
+    return ''.join(AES(k, block) for block in split(m, 16))
+
+
+def ecb_decrypt(k, c):
+    return ''.join(AES_I(k, block) for block in split(c, 16))
+
+
+def prf_adversary(fn):
+    y = fn('\x00' * 16)
+    return fn('\x00' * 16) == y and ord(y[0]) & 1
+
+
+def lr_adversary(lr):
+    c = lr('\x00' * 32, '\x00' * 16 + '\x01' * 16)
+    return 0 if c[:16] == c[16:] else 1
+
+
+def cca_adversary(lr, dec):
+    c = lr('\x00' * 16, '\x01' * 16)
+    m = dec(c + c)
+    return 0 if m[:16] == '\x00' * 16 else 1
+
+
+def ufcma_adversary(tag):
+    for i in xrange(4):
+        tag(chr(i) * 16)
+    return '\xff' * 16, random_string(16)
+
+
+def rsa_commitment_parameters():
+    """
+    :return: Public parameters ``(N, e, y)`` of the commitment
+             ``y^m k^e mod N``, binding if RSA is hard.
+    """
+    key = rsa_keygen(128)
+    return key['n'], key['e'], random.randrange(2, key['n'])
+
+
+def rsa_commitment_verify((N, e, y), c, m, k):
+    return int(c == pow(y, m, N) * pow(k, e, N) % N)
+
+
+def bind_adversary((N, e, y)):
+    k0, k1 = random.randrange(1, N), random.randrange(1, N)
+    return pow(k0, e, N), 0, 1, k0, k1
+
+
+def _prf_sim(**kwargs):
+    return WorldSim(GamePRF(AES, 16, 16), prf_adversary, **kwargs)
+
+
+def _lr_sim(**kwargs):
+    return LRSim(GameLR(ecb_encrypt, 16), lr_adversary, **kwargs)
+
+
+def _cca_sim(**kwargs):
+    return CCASim(GameCCA(ecb_encrypt, ecb_decrypt, 16, 16), cca_adversary,
+                  **kwargs)
+
+
+def _ufcma_sim(**kwargs):
+    mac = MAC(16, 16)
+    return UFCMASim(GameUFCMA(mac.tag, mac.verify, 16), ufcma_adversary,
+                    **kwargs)
+
+
+def _bind_sim(**kwargs):
+    return BINDSim(GameBIND(rsa_commitment_parameters,
+                            rsa_commitment_verify), bind_adversary, **kwargs)
+
+
+#: Benchmarked pairs: name, function building the simulator and number of
+#: trials per world of a throughput measurement.
+PAIRS = (
+    ('prf', _prf_sim, 20000),
+    ('lr', _lr_sim, 20000),
+    ('cca', _cca_sim, 20000),
+    ('ufcma', _ufcma_sim, 20000),
+    ('bind', _bind_sim, 8),
+)
+
+
+def percentile(values, p):
+    """
+    :param values: Sorted list of numbers.
+    :param p: Percentile, between 0 and 100.
+    :return: The nearest rank percentile.
+    """
+    return values[min(len(values) - 1, int(len(values) * p / 100.0))]
+
+
+def latency(make, trials):
+    """
+    Runs trials one by one and measures how long each took.
+
+    :param make: Function building the simulator.
+    :param trials: Trials to run per world.
+    :return: Dict of the ``p50``, ``p90``, ``p99`` and ``max`` latency in
+             seconds.
+    """
+    sim = make()
+    times = sorted(elapsed for world in sim.worlds
+                   for _, elapsed in sim.iter_trials(world, trials))
+    return {'p50': percentile(times, 50), 'p90': percentile(times, 90),
+            'p99': percentile(times, 99), 'max': times[-1]}
+
+
+def throughput(make, trials, workers):
+    """
+    Measures the trials per second of ``compute_advantage``.
+
+    :param make: Function building the simulator.
+    :param trials: Trials to run per world.
+    :param workers: Number of worker processes, 1 for none.
+    :return: Dict of the ``trials_per_second``, the ``seconds`` taken, the
+             ``advantage`` found and the ``memory_peak`` in bytes.
+    """
+    sim = make(trace_memory=True)
+    workers = workers if workers > 1 else None
+    try:
+        sim.compute_advantage(max(1, trials // 100), workers=workers, seed=0)
+        start = time.time()
+        e = sim.compute_advantage(trials, workers=workers, seed=1)
+        elapsed = time.time() - start
+    finally:
+        sim.close()
+    return {'trials_per_second': e.trials / elapsed, 'seconds': elapsed,
+            'advantage': float(e),
+            'memory_peak': (e.resources or {}).get('memory.peak')}
+
+
+def benchmark(names=None, workers=(1,), scale=1.0):
+    """
+    Runs the benchmark.
+
+    :param names: Names of the pairs to run, all if ``None``.
+    :param workers: Worker counts to measure the throughput at.
+    :param scale: Factor applied to the number of trials of every pair.
+    :return: Dict of results per pair: its ``latency``, and its
+             ``throughput`` per worker count with the ``speedup`` and
+             ``efficiency`` relative to the first worker count.
+    """
+    results = {}
+    for name, make, trials in PAIRS:
+        if names is not None and name not in names:
+            continue
+        trials = max(1, int(trials * scale))
+        result = {'trials': trials,
+                  'latency': latency(make, max(1, min(trials, 2000))),
+                  'throughput': {}}
+        base = None
+        for w in workers:
+            t = throughput(make, trials, w)
+            if base is None:
+                base = (w, t['trials_per_second'])
+            t['speedup'] = t['trials_per_second'] / base[1]
+            t['efficiency'] = t['speedup'] * base[0] / w
+            result['throughput'][w] = t
+        results[name] = result
+    return results
+
+
+def _ms(seconds):
+    return '%.3f' % (seconds * 1000)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m crypto.benchmarks.throughput',
+        description='Measure simulator throughput, latency and scaling.')
+    parser.add_argument('--pairs', help='comma separated pairs to run, of ' +
+                        ', '.join(name for name, _, _ in PAIRS))
+    parser.add_argument('--workers', default=None,
+                        help='comma separated worker counts, by default '
+                             'powers of two up to the number of CPUs')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='factor applied to the number of trials')
+    parser.add_argument('--json', help='file to save the results to')
+    args = parser.parse_args(argv)
+
+    if args.workers is None:
+        workers = [1]
+        while workers[-1] * 2 <= multiprocessing.cpu_count():
+            workers.append(workers[-1] * 2)
+    else:
+        workers = [int(w) for w in args.workers.split(',')]
+    names = args.pairs.split(',') if args.pairs else None
+    results = benchmark(names, workers, args.scale)
+    if args.json is not None:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    print '%-6s %8s %8s %8s %8s %8s %12s %8s %8s %10s' % (
+        'pair', 'p50 ms', 'p90 ms', 'p99 ms', 'max ms', 'workers',
+        'trials/s', 'speedup', 'effic.', 'peak MB')
+    for name, _, _ in PAIRS:
+        if name not in results:
+            continue
+        r = results[name]
+        lat = [_ms(r['latency'][k]) for k in ('p50', 'p90', 'p99', 'max')]
+        for w in workers:
+            t = r['throughput'][w]
+            peak = t['memory_peak']
+            print '%-6s %8s %8s %8s %8s %8d %12.1f %8.2f %8.2f %10s' % tuple(
+                [name] + lat + [w, t['trials_per_second'], t['speedup'],
+                                t['efficiency'],
+                                '-' if peak is None else
+                                '%.1f' % (peak / 2.0 ** 20)])
+            name, lat = '', [''] * 4
+
+
+if __name__ == '__main__':
+    main()
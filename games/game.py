@@ -1,3 +1,22 @@
+import copy
+
+
+def split_batch(batch, length=None):
+    """
+    Turns the argument of a batch oracle into a list of queries.
+
+    :param batch: List of queries, or a string holding queries of
+                  ``length`` bytes back to back.
+    :param length: Length of every query, needed to split a string.
+    :return: List of queries.
+    """
+    if not isinstance(batch, (str, buffer, bytearray)):
+        return list(batch)
+    batch = str(batch)
+    if length is None or length == 0 or len(batch) % length:
+        raise ValueError("Batch of length " + str(len(batch)) + " is not a "
+                         "whole number of " + str(length) + " byte queries.")
+    return [batch[i:i + length] for i in xrange(0, len(batch), length)]
 
 
 class Game(object):
@@ -36,3 +55,18 @@ class Game(object):
         """
         return
 
+    def clone(self):
+        """
+        Returns a new game with the same parameters (scheme, key length,
+        ...) but its own per trial state, so the two can run trials at the
+        same time, e.g. in different threads. Lists, dicts and sets held by
+        the game are copied; everything else, including the scheme, is
+        shared.
+
+        :return: A new game of the same class.
+        """
+        game = copy.copy(self)
+        for name, value in vars(self).items():
+            if isinstance(value, (list, dict, set)):
+                setattr(game, name, copy.copy(value))
+        return game
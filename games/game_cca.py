@@ -21,7 +21,8 @@ class GameCCA(GameLR):
         :param block_len: Length of block size in bytes used by ``encrypt`` and
                         ``decrypt``.
         """
-        super(self.__class__, self).__init__(encrypt, key_len, block_len)
+        super(GameCCA, self).__init__(encrypt, key_len)
+        self.block_len = block_len
         self.decrypt = decrypt
         self.c_list = []
 
@@ -41,6 +42,17 @@ class GameCCA(GameLR):
         self.c_list.append(c)
         return c
 
+    def lr_many(self, pairs):
+        """
+        Batch form of :meth:`lr`, see ``GameLR.lr_many``.
+
+        :param pairs: List of ``(l, r)`` pairs.
+        :return: List of the oracle's answers.
+        """
+        cs = super(GameCCA, self).lr_many(pairs)
+        self.c_list.extend(cs)
+        return cs
+
     def dec(self, c):
         """
         This is a decryption oracle. The adversary can query to decrypt any
@@ -53,3 +65,12 @@ class GameCCA(GameLR):
         if c in self.c_list:
             return None
         return self.decrypt(self.key, c)
+
+    def dec_many(self, cs):
+        """
+        Batch form of :meth:`dec`.
+
+        :param cs: List of cipher texts.
+        :return: List of the oracle's answers.
+        """
+        return [self.dec(c) for c in cs]
@@ -9,17 +9,20 @@ class GameCR(game.Game):
     they do have access to the key used by the hash function.
     """
 
-    def __init__(self, hash_f, key_len):
+    def __init__(self, hash_f, key_len, key_gen=None):
         """
         :param hash_f: This is the hash function that the adversary is
                        playing against. It must take two parameters, a key
                        of length key_len and a message.
         :param key_len: Length of key used by hash function.
+        :param key_gen: Optional callable used instead of a random string of
+                        key_len bytes to generate keys.
         """
         super(self.__class__, self).__init__()
         self.hash = hash_f
         self.key_len = key_len
         self.key = ''
+        self.key_gen = key_gen
 
     def initialize(self):
         """
@@ -28,7 +31,10 @@ class GameCR(game.Game):
 
         :return: key to be used by hash function.
         """
-        self.key = random_string(self.key_len)
+        if self.key_gen is None:
+            self.key = random_string(self.key_len)
+        else:
+            self.key = self.key_gen()
         return self.key
 
     def finalize(self, (x1, x2)):
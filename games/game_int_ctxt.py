@@ -9,14 +9,21 @@ class GameINTCTXT(Game):
     have been sent by the sender. The Adversary has access to an encryption
     oracle (enc) and a decryption oracle (dec) that it uses to see if it won.
     """
-    def __init__(self, encrypt, decrypt, key_len):
+    def __init__(self, encrypt, decrypt, key_len, encrypt_many=None,
+                 decrypt_many=None):
         """
         :param encrypt: Encryption function that takes inputs, a key k of
                         key_len length and a message.
         :param decrypt: Decryption function to match encryption function.
         :param key_len: Length of key used by encrypt and decrypt.
+        :param encrypt_many: Optional batch form of encrypt that takes a key
+                             and a list of messages and returns the list of
+                             cipher texts. Used by :meth:`enc_many`.
+        :param decrypt_many: Optional batch form of decrypt, used by
+                             :meth:`dec_many`.
         """
         self._enc, self._dec, self.key_len = encrypt, decrypt, key_len
+        self._enc_many, self._dec_many = encrypt_many, decrypt_many
         self.key = ''
         self.cyphers = []
         self.messages = []
@@ -63,6 +70,49 @@ class GameINTCTXT(Game):
         else:
             return False
 
+    def enc_many(self, ms):
+        """
+        Batch form of :meth:`enc`: messages already queried, before or
+        earlier in the batch, give ``None``.
+
+        :param ms: List of messages to be encrypted.
+        :return: List of the oracle's answers.
+        """
+        seen = set(self.messages)
+        answers = []
+        fresh = []
+        for m in ms:
+            if m in seen:
+                answers.append(None)
+                continue
+            seen.add(m)
+            answers.append(len(fresh))
+            fresh.append(m)
+        if self._enc_many is not None:
+            cs = list(self._enc_many(self.key, fresh))
+        else:
+            cs = [self._enc(self.key, m) for m in fresh]
+        self.messages += fresh
+        self.cyphers += cs
+        return [None if i is None else cs[i] for i in answers]
+
+    def dec_many(self, cs):
+        """
+        Batch form of :meth:`dec`.
+
+        :param cs: List of cipher texts to be decrypted.
+        :return: List of the oracle's answers.
+        """
+        if self._dec_many is not None:
+            ms = self._dec_many(self.key, cs)
+        else:
+            ms = [self._dec(self.key, c) for c in cs]
+        cyphers = set(self.cyphers)
+        answers = [c not in cyphers and m is not None for c, m in zip(cs, ms)]
+        if True in answers:
+            self.win = True
+        return answers
+
     def finalize(self):
         """
         Method called by simulator to determine if adversary won.
@@ -1,4 +1,4 @@
-from crypto.games.game import Game
+from crypto.games.game import Game, split_batch
 from crypto.primitives import random_string
 
 
@@ -8,7 +8,7 @@ class GameKR(Game):
     win in this instantiation of KR you must make at least one oracle query.
     Adversaries have access to an fn oracle.
     """
-    def __init__(self, encrypt, key_len, block_len):
+    def __init__(self, encrypt, key_len, block_len, encrypt_many=None):
         """
         :param encrypt: This must be a callable python function that takes two
                         inputs, k and x where k is a key of length key_len and
@@ -18,9 +18,13 @@ class GameKR(Game):
 
         :param block_len: Length of the block (in bytes) used in the function
                           that will be used in this game.
+        :param encrypt_many: Optional batch form of ``encrypt`` that takes a
+                             key and a list of messages and returns the list
+                             of cipher texts. Used by :meth:`fn_many`.
         """
         super(GameKR,self).__init__()
         self.encrypt, self.key_len, self.block_len = encrypt, key_len, block_len
+        self.encrypt_many = encrypt_many
         self.key = ''
         self.count = 0
         self.messages = {}
@@ -43,6 +47,24 @@ class GameKR(Game):
         self.count += 1
         return self.cyphers[self.count-1]
 
+    def fn_many(self, ms):
+        """
+        Batch form of :meth:`fn`.
+
+        :param ms: List of messages, or a string of blocks back to back.
+        :return: List of their encryptions.
+        """
+        ms = split_batch(ms, self.block_len)
+        if self.encrypt_many is not None:
+            cs = list(self.encrypt_many(self.key, ms))
+        else:
+            cs = [self.encrypt(self.key, m) for m in ms]
+        for m, c in zip(ms, cs):
+            self.messages[self.count] = m
+            self.cyphers[self.count] = c
+            self.count += 1
+        return cs
+
     def finalize(self, key_guess):
         """
         Determines whether the game was won or lost, i.e. if the key_guess is
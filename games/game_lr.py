@@ -10,20 +10,25 @@ class GameLR(Game):
     a left and right encryption. It is useful to determine how well a scheme
     is hiding its data from the adversary.
     """
-    def __init__(self, encrypt, key_len, key_gen=None):
+    def __init__(self, encrypt, key_len, key_gen=None, encrypt_many=None):
         """
         :param encrypt: This must be a callable python function that takes two
                         inputs, k and x where k is a key of length key_len and
                         x is a message.
         :param key_len: Length of the key (in bytes) used in the function that
                         will be tested with this game.
-
+        :param key_gen: Optional callable used instead of a random string of
+                        key_len bytes to generate keys.
+        :param encrypt_many: Optional batch form of ``encrypt`` that takes a
+                             key and a list of messages and returns the list
+                             of cipher texts. Used by :meth:`lr_many`.
         """
         super(GameLR, self).__init__()
         self.encrypt, self.key_len = encrypt, key_len
         self.key = ''
         self.b = -1
         self.key_gen = key_gen
+        self.encrypt_many = encrypt_many
 
     def initialize(self, b=None):
         """
@@ -69,6 +74,33 @@ class GameLR(Game):
         else:
             return self.encrypt(self.key, l)
 
+    def lr_many(self, pairs):
+        """
+        Batch form of :meth:`lr`: returns what calling :meth:`lr` on each
+        pair in turn would return, so unequal lengths and pairs already
+        queried (before or earlier in the batch) give ``None``. The accepted
+        messages are encrypted in one call of ``encrypt_many`` if given.
+
+        :param pairs: List of ``(l, r)`` pairs.
+        :return: List of the oracle's answers.
+        """
+        seen = set(self.message_pairs)
+        answers = []
+        ms = []
+        for l, r in pairs:
+            if len(l) != len(r) or (l, r) in seen:
+                answers.append(None)
+                continue
+            seen.add((l, r))
+            self.message_pairs.append((l, r))
+            answers.append(len(ms))
+            ms.append(r if self.b == 1 else l)
+        if self.encrypt_many is not None:
+            cs = list(self.encrypt_many(self.key, ms))
+        else:
+            cs = [self.encrypt(self.key, m) for m in ms]
+        return [None if i is None else cs[i] for i in answers]
+
     def finalize(self, guess):
         """
         This method is called automatically by the WorldSim and evaluates a
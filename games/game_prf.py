@@ -1,6 +1,6 @@
 import random
 
-from crypto.games.game import Game
+from crypto.games.game import Game, split_batch
 from crypto.primitives import random_string
 
 
@@ -10,7 +10,8 @@ class GamePRF(Game):
     pseudo-random function or not. Adversaries playing this game have
     access to an fn oracle.
     """
-    def __init__(self, prf, key_len, input_len, output_len=None):
+    def __init__(self, prf, key_len, input_len, output_len=None,
+                 prf_many=None):
         """
         :param prf: This must be a callable python function that takes two
                     inputs, k and x where k is a key of length key_len and x is a
@@ -24,6 +25,9 @@ class GamePRF(Game):
                           
         :param output_len: Length of the output (in bytes) of the function
                            that will be used in this game.
+        :param prf_many: Optional batch form of ``prf`` that takes a key and
+                         a list of messages and returns the list of outputs.
+                         Used by :meth:`fn_many`.
         """
         super(GamePRF, self).__init__()
         self.prf, self.key_len, self.input_len = prf, key_len, input_len
@@ -31,7 +35,8 @@ class GamePRF(Game):
             self.output_len = input_len
         else:
             self.output_len = output_len
-        self.key = ''
+        self.prf_many = prf_many
+        self._key = ''
         self.messages = {}
         self.world = None
 
@@ -46,11 +51,26 @@ class GamePRF(Game):
         :return:
         """
         self.messages = {}
-        self.key = random_string(self.key_len)
+        self._key = None
         if world is None:
             world = random.randrange(0, 2, 1)
         self.world = world
 
+    @property
+    def key(self):
+        """
+        The key of the current run, drawn the first time it is read. The
+        random world never reads it, so its runs draw no key: exact
+        enumeration (``BaseSim.exact_ratio``) then does not branch on it.
+        """
+        if self._key is None:
+            self._key = random_string(self.key_len)
+        return self._key
+
+    @key.setter
+    def key(self, key):
+        self._key = key
+
     def fn(self, m):
         """
         This is the fn oracle that is exposed to the adversary via the
@@ -72,6 +92,31 @@ class GamePRF(Game):
         else:
             return self.prf(self.key, m)
 
+    def fn_many(self, ms):
+        """
+        Batch form of :meth:`fn`: returns what calling :meth:`fn` on each
+        message in turn would return, with the length checks and the call
+        into the function done once for the whole batch.
+
+        :param ms: List of messages, or a string of messages back to back.
+        :return: List of the oracle's answers.
+        """
+        ms = split_batch(ms, self.input_len)
+        for m in ms:
+            if len(m) != self.input_len:
+                raise ValueError("Message is of length " + str(len(m)) +
+                                 " but should be " + str(self.input_len) + ".")
+        if self.world == 0:
+            messages = self.messages
+            for m in ms:
+                if m not in messages:
+                    messages[m] = random_string(self.output_len)
+            return [messages[m] for m in ms]
+        key, prf = self.key, self.prf
+        if self.prf_many is not None:
+            return list(self.prf_many(key, ms))
+        return [prf(key, m) for m in ms]
+
     def finalize(self, guess):
         """
         This method is called automatically by the WorldSim and evaluates a
@@ -1,4 +1,4 @@
-from crypto.games.game import Game
+from crypto.games.game import Game, split_batch
 from crypto.primitives import random_string
 
 
@@ -9,7 +9,7 @@ class GameTKR(Game):
 
     Adversaries have access to an fn oracle.
     """
-    def __init__(self, encrypt, key_len, block_len):
+    def __init__(self, encrypt, key_len, block_len, encrypt_many=None):
         """
         :param encrypt: This must be a callable python function that takes two
                         inputs, k and x where k is a key of length key_len and
@@ -19,9 +19,13 @@ class GameTKR(Game):
 
         :param block_len: Length of the block (in bytes) used in the function
                           that will be used in this game.
+        :param encrypt_many: Optional batch form of ``encrypt`` that takes a
+                             key and a list of messages and returns the list
+                             of cipher texts. Used by :meth:`fn_many`.
         """
         super(GameTKR,self).__init__()
         self.encrypt, self.key_len, self.block_len = encrypt, key_len, block_len
+        self.encrypt_many = encrypt_many
         self.key = ''
 
     def initialize(self):
@@ -34,6 +38,18 @@ class GameTKR(Game):
     def fn(self, m):
         return self.encrypt(self.key, m)
 
+    def fn_many(self, ms):
+        """
+        Batch form of :meth:`fn`.
+
+        :param ms: List of messages, or a string of blocks back to back.
+        :return: List of their encryptions.
+        """
+        ms = split_batch(ms, self.block_len)
+        if self.encrypt_many is not None:
+            return list(self.encrypt_many(self.key, ms))
+        return [self.encrypt(self.key, m) for m in ms]
+
     def finalize(self, key_guess):
         """
         Determines whether the game was won or lost, i.e. if the key_guess is
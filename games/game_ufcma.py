@@ -1,5 +1,5 @@
 
-from crypto.games.game import Game
+from crypto.games.game import Game, split_batch
 from crypto.primitives import random_string
 
 
@@ -8,7 +8,8 @@ class GameUFCMA(Game):
     This game is meant to test the security of message authentication schemes.
     Adversaries playing this game have access to a tag and verify oracle.
     """
-    def __init__(self, _tag, _verify, key_len=0, key_gen=None):
+    def __init__(self, _tag, _verify, key_len=0, key_gen=None,
+                 _tag_many=None):
         """
         :param _tag: This must be a callable python function that returns
                      message tags and takes in a key and message (key should
@@ -17,12 +18,18 @@ class GameUFCMA(Game):
                         1 when a tag is valid and 0 when it is not. Its
                         parameters should be key, message, and tag.
         :param key_len: This is the length of the key used by the MAC in bytes.
+        :param key_gen: Optional callable used instead of a random string of
+                        key_len bytes to generate keys.
+        :param _tag_many: Optional batch form of ``_tag`` that takes a key and
+                          a list of messages and returns the list of tags.
+                          Used by :meth:`tag_many`.
         """
         super(GameUFCMA, self).__init__()
         self._tag, self._verify, self.key_len = _tag, _verify, key_len
         self.key = ''
         self.messages = []
         self.key_gen = key_gen
+        self._tag_many = _tag_many
 
     def initialize(self):
         """
@@ -48,6 +55,20 @@ class GameUFCMA(Game):
         self.messages += [message]
         return t
 
+    def tag_many(self, messages):
+        """
+        Batch form of :meth:`tag`.
+
+        :param messages: List of messages to be tagged.
+        :return: List of their tags.
+        """
+        messages = split_batch(messages)
+        if self._tag_many is not None:
+            tags = list(self._tag_many(self.key, messages))
+        else:
+            tags = [self._tag(self.key, m) for m in messages]
+        self.messages += messages
+        return tags
 
     def finalize(self, (message, tag)):
         """
@@ -0,0 +1,273 @@
+"""
+Lockstep versions of GamePRF, GameLR and GameKR that play ``n`` independent
+instances of the game at once. Keys, world bits and the answers of the
+random world are held as NumPy arrays with one row per instance, and every
+oracle query is an array with one row per instance, so a trial costs a few
+array operations instead of a few hundred interpreted lines. They are meant
+for simple fixed length schemes (XOR based candidates, toy block ciphers)
+written against arrays, and are run by the simulators in
+``crypto.simulator.vector_sim``.
+
+Byte strings are ``uint8`` arrays: a query of ``input_len`` bytes to each of
+the ``n`` instances has shape ``(n, input_len)``. A query of shape
+``(input_len,)`` is sent to every instance. The games draw their
+randomness from their :attr:`VectorGame.rng`, a ``numpy.random.RandomState``
+that the simulators replace with a freshly seeded one for every run of
+trials, the way the other simulators seed ``random``. Every thread of a
+threaded run has its own clone of the game and so its own generator.
+
+This module needs NumPy.
+"""
+import numpy
+
+from crypto.games.game import Game
+
+
+def random_bytes(n, length, rng=numpy.random):
+    """
+    :param rng: ``numpy.random.RandomState`` to draw from.
+    :return: ``(n, length)`` array of uniformly random bytes.
+    """
+    return rng.randint(0, 256, (n, length)).astype(numpy.uint8)
+
+
+def random_bits(n, rng=numpy.random):
+    """
+    :param rng: ``numpy.random.RandomState`` to draw from.
+    :return: Array of ``n`` uniformly random bits.
+    """
+    return rng.randint(0, 2, n)
+
+
+class VectorGame(Game):
+    """
+    Base class of the lockstep games.
+    """
+
+    def __init__(self):
+        super(VectorGame, self).__init__()
+        self.n = 0
+        self.rng = numpy.random.RandomState()
+
+    def queries(self, x, length):
+        """
+        Checks the shape of a query and broadcasts it to every instance. The
+        query is copied, so the games' records of past queries stay as they
+        were when the adversary reuses its arrays.
+
+        :param x: ``(n, length)`` or ``(length,)`` array.
+        :param length: Length of the query in bytes.
+        :return: ``(n, length)`` uint8 array.
+        """
+        x = numpy.array(x, dtype=numpy.uint8)
+        if x.shape == (length,):
+            x = numpy.tile(x, (self.n, 1))
+        if x.shape != (self.n, length):
+            raise ValueError("Queries have shape " + str(x.shape) +
+                             " but should be " + str((self.n, length)) + ".")
+        return x
+
+    def worlds(self, n, world):
+        """
+        :param world: World of every instance, or ``None`` to draw each
+                      instance's world at random.
+        :return: Array with the world of every instance.
+        """
+        if world is None:
+            return random_bits(n, self.rng)
+        return numpy.repeat(world, n)
+
+
+class VectorGamePRF(VectorGame):
+    """
+    Lockstep GamePRF. Adversaries get an fn oracle taking and returning
+    arrays and return an array of guesses, one per instance.
+    """
+
+    def __init__(self, prf, key_len, input_len, output_len=None):
+        """
+        :param prf: Function taking an ``(n, key_len)`` array of keys and an
+                    ``(n, input_len)`` array of messages and returning the
+                    ``(n, output_len)`` array of outputs.
+        :param key_len: Length of the key in bytes.
+        :param input_len: Length of the input in bytes.
+        :param output_len: Length of the output in bytes, ``input_len`` if not
+                           given.
+        """
+        super(VectorGamePRF, self).__init__()
+        self.prf, self.key_len, self.input_len = prf, key_len, input_len
+        if output_len is None:
+            self.output_len = input_len
+        else:
+            self.output_len = output_len
+        self.key = None
+        self.world = None
+        self.messages = []
+
+    def initialize(self, n, world=None):
+        """
+        Draws the keys (and worlds) of ``n`` new instances.
+
+        :param n: Number of instances.
+        :param world: World of every instance, random if ``None``.
+        """
+        self.n = n
+        self.key = random_bytes(n, self.key_len, self.rng)
+        self.world = self.worlds(n, world)
+        self.messages = []
+
+    def fn(self, x):
+        """
+        The fn oracle of every instance. In the random world an instance
+        gets the same answer when it repeats a message, as in GamePRF.
+
+        :param x: Messages, one row per instance.
+        :return: ``(n, output_len)`` array of answers.
+        """
+        x = self.queries(x, self.input_len)
+        rand = random_bytes(self.n, self.output_len, self.rng)
+        for m, y in self.messages:
+            same = (m == x).all(axis=1)
+            rand[same] = y[same]
+        self.messages.append((x, rand))
+        real = self.world == 1
+        if not real.any():
+            return rand
+        out = rand.copy()
+        out[real] = numpy.asarray(self.prf(self.key[real], x[real]))
+        return out
+
+    def finalize(self, guess):
+        """
+        :param guess: Guessed world of every instance.
+        :return: Boolean array, True where the guess is correct.
+        """
+        return numpy.asarray(guess) == self.world
+
+
+class VectorGameLR(VectorGame):
+    """
+    Lockstep GameLR. Adversaries get an lr oracle taking and returning
+    arrays and return an array of guesses, one per instance.
+    """
+
+    def __init__(self, encrypt, key_len):
+        """
+        :param encrypt: Function taking an ``(n, key_len)`` array of keys and
+                        an ``(n, length)`` array of messages and returning the
+                        array of cipher texts.
+        :param key_len: Length of the key in bytes.
+        """
+        super(VectorGameLR, self).__init__()
+        self.encrypt, self.key_len = encrypt, key_len
+        self.key = None
+        self.b = None
+        self.message_pairs = []
+
+    def initialize(self, n, b=None):
+        """
+        Draws the keys (and worlds) of ``n`` new instances.
+
+        :param n: Number of instances.
+        :param b: World of every instance, random if ``None``.
+        """
+        self.n = n
+        self.key = random_bytes(n, self.key_len, self.rng)
+        self.b = self.worlds(n, b)
+        self.message_pairs = []
+
+    def lr(self, l, r):
+        """
+        The lr oracle of every instance. An instance that repeats a pair
+        gets no answer, as in GameLR: its row of the result is masked. So
+        does every instance when the left and right messages differ in
+        length, as GameLR then returns None.
+
+        :param l: Left messages, one row per instance.
+        :param r: Right messages, one row per instance.
+        :return: ``numpy.ma`` array of cipher texts.
+        """
+        length = numpy.shape(l)[-1]
+        if numpy.shape(r)[-1] != length:
+            return numpy.ma.masked_all((self.n, length), dtype=numpy.uint8)
+        l, r = self.queries(l, length), self.queries(r, length)
+        repeated = numpy.zeros(self.n, dtype=bool)
+        for pl, pr in self.message_pairs:
+            if pl.shape == l.shape:
+                repeated |= (pl == l).all(axis=1) & (pr == r).all(axis=1)
+        self.message_pairs.append((l, r))
+        m = numpy.where((self.b == 1)[:, None], r, l)
+        c = numpy.asarray(self.encrypt(self.key, m))
+        mask = numpy.zeros(c.shape, dtype=bool)
+        mask[repeated] = True
+        return numpy.ma.masked_array(c, mask=mask)
+
+    def finalize(self, guess):
+        """
+        :param guess: Guessed world of every instance.
+        :return: Boolean array, True where the guess is correct.
+        """
+        return numpy.asarray(guess) == self.b
+
+
+class VectorGameKR(VectorGame):
+    """
+    Lockstep GameKR. Adversaries get an fn oracle taking and returning
+    arrays and return an ``(n, key_len)`` array of key guesses.
+    """
+
+    def __init__(self, encrypt, key_len, block_len):
+        """
+        :param encrypt: Function taking an ``(n, key_len)`` array of keys and
+                        an ``(n, block_len)`` array of messages and returning
+                        the array of cipher texts.
+        :param key_len: Length of the key in bytes.
+        :param block_len: Length of the block in bytes.
+        """
+        super(VectorGameKR, self).__init__()
+        self.encrypt, self.key_len, self.block_len = encrypt, key_len, block_len
+        self.key = None
+        self.messages = []
+        self.cyphers = []
+
+    def initialize(self, n):
+        """
+        Draws the keys of ``n`` new instances.
+
+        :param n: Number of instances.
+        """
+        self.n = n
+        self.key = random_bytes(n, self.key_len, self.rng)
+        self.messages = []
+        self.cyphers = []
+
+    def fn(self, x):
+        """
+        The fn oracle of every instance.
+
+        :param x: Messages, one row per instance.
+        :return: Array of cipher texts.
+        """
+        x = self.queries(x, self.block_len)
+        c = numpy.asarray(self.encrypt(self.key, x))
+        self.messages.append(x)
+        self.cyphers.append(c)
+        return c
+
+    def finalize(self, key_guess):
+        """
+        As in GameKR, an instance wins if it made at least one query, its
+        queries were distinct and the guessed key is consistent with all of
+        them.
+
+        :param key_guess: ``(n, key_len)`` array of guessed keys.
+        :return: Boolean array, True where the instance won.
+        """
+        key_guess = self.queries(key_guess, self.key_len)
+        win = numpy.repeat(bool(self.messages), self.n)
+        for i, (m, c) in enumerate(zip(self.messages, self.cyphers)):
+            c_guess = numpy.asarray(self.encrypt(key_guess, m))
+            win &= (c_guess == c).reshape(self.n, -1).all(axis=1)
+            for prev in self.messages[:i]:
+                win &= ~(prev == m).all(axis=1)
+        return win
@@ -0,0 +1,131 @@
+import copy
+import time
+
+from crypto.games.game import Game, split_batch
+
+#: Oracles that are counted, including their batch forms.
+ORACLES = ('lr', 'fn', 'tag', 'enc', 'dec')
+
+
+def _size(value):
+    """
+    :return: Number of bytes in the strings of ``value``.
+    """
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(_size(v) for v in value)
+    return 0
+
+
+class Instrumented(Game):
+    """
+    Wraps a game to measure the resources adversaries use against it: the
+    number of oracle queries (the ``q`` of concrete security bounds), the
+    bytes they carry, and the time spent in ``initialize``, the oracles and
+    ``finalize``. It can also enforce a query budget: queries beyond it are
+    refused with ``None``, like the games refuse queries that break their
+    rules.
+
+    Simulators notice instrumented games and add the usage of every trial
+    to their results; the estimate's ``resources`` then holds the average
+    usage per trial, and the time left to the adversary. Trials run under
+    ``sandbox.Limits`` happen in another process and are not measured.
+
+    Example Usage::
+
+        sim = WorldSim(Instrumented(GamePRF(prf, 16, 16), budget=8),
+                       adversary)
+        e = sim.compute_advantage()
+        print e, e.resources['queries'], e.resources['time.oracles']
+    """
+
+    def __init__(self, game, budget=None):
+        """
+        :param game: The game to instrument.
+        :param budget: Maximum number of oracle queries per run of the game,
+                       unlimited if ``None``.
+        """
+        super(Instrumented, self).__init__()
+        self.game, self.budget = game, budget
+        self.used = 0
+        self.usage = {}
+
+    def _count(self, key, amount):
+        self.usage[key] = self.usage.get(key, 0) + amount
+
+    def initialize(self, *args):
+        start = time.time()
+        result = self.game.initialize(*args)
+        self._count('time.initialize', time.time() - start)
+        self.used = 0
+        return result
+
+    def finalize(self, *args):
+        start = time.time()
+        result = self.game.finalize(*args)
+        self._count('time.finalize', time.time() - start)
+        return result
+
+    def __getattr__(self, name):
+        if name.startswith('__') or name == 'game':
+            raise AttributeError(name)
+        attr = getattr(self.game, name)
+        if name in ORACLES:
+            return lambda *args: self._query(name, attr, args)
+        if name.endswith('_many') and name[:-5] in ORACLES:
+            return lambda batch: self._query_many(name, attr, batch)
+        return attr
+
+    def _query(self, name, oracle, args):
+        self._count('queries', 1)
+        self._count('queries.' + name, 1)
+        self._count('bytes', _size(args))
+        if self.budget is not None and self.used >= self.budget:
+            self._count('refused', 1)
+            return None
+        self.used += 1
+        start = time.time()
+        result = oracle(*args)
+        self._count('time.oracles', time.time() - start)
+        return result
+
+    def _query_many(self, name, oracle, batch):
+        length = getattr(self.game, 'input_len',
+                         getattr(self.game, 'block_len', None))
+        batch = split_batch(batch, length)
+        name = name[:-5]
+        self._count('queries', len(batch))
+        self._count('queries.' + name, len(batch))
+        self._count('bytes', _size(batch))
+        refused = []
+        if self.budget is not None:
+            allowed = max(0, self.budget - self.used)
+            batch, refused = batch[:allowed], batch[allowed:]
+            self._count('refused', len(refused))
+        self.used += len(batch)
+        start = time.time()
+        results = list(oracle(batch)) if batch else []
+        self._count('time.oracles', time.time() - start)
+        return results + [None] * len(refused)
+
+    def take_usage(self):
+        """
+        Returns the usage recorded since the last call and starts a new
+        count. Simulators call it after every trial.
+
+        :return: Dict of counters: ``queries`` (and ``queries.<oracle>``),
+                 ``bytes``, ``refused``, and ``time.initialize``,
+                 ``time.oracles`` and ``time.finalize`` in seconds.
+        """
+        usage, self.usage = self.usage, {}
+        return usage
+
+    def clone(self):
+        """
+        :return: An instrumented clone of the wrapped game.
+        """
+        game = copy.copy(self)
+        game.game = self.game.clone()
+        game.usage = {}
+        return game
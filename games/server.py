@@ -0,0 +1,411 @@
+"""
+Serves a game's ``initialize``, oracles and ``finalize`` over a Unix domain
+socket, so that adversaries running in another process (or written in
+another language) can play it.
+
+Every message is a frame: a 4 byte big endian length followed by that many
+bytes of payload. A request payload is the encoding of a list
+``[method, [args, args, ...]]``: the method is called once per argument
+list, in order, so a single frame can carry thousands of queries. A batch
+of single message queries of one length may instead be sent as
+``[method, length, messages]``, the messages back to back in one string.
+If the game has a batch form of the oracle (``fn_many`` for ``fn``, see
+``crypto.games``), the whole batch goes to it in one call.
+
+A response payload is one status byte followed by an encoded value: ``+``
+and the list of results; ``=`` and ``[length, results]`` when the results
+are strings of one length, sent back to back in one string; or ``-`` and
+``[index, message]`` when call ``index`` of the batch raised, in which case
+the later calls were not made. The index is -1 when the batch form of the
+oracle raised, as it runs the batch as a whole. Requests are answered in
+order, so a client may pipeline several frames before reading the
+responses.
+
+Values are encoded as a type byte followed by its data:
+
+=====  ==========================================================
+``N``  None
+``T``  True
+``F``  False
+``I``  integer, 8 byte big endian two's complement
+``J``  integer too large for ``I``, as ``S`` encoded decimal digits
+``S``  byte string, 4 byte big endian length then the bytes
+``L``  list, 4 byte big endian count then the encoded items
+=====  ==========================================================
+
+Lists are decoded as tuples, so that e.g. ``finalize((m, t))`` of
+GameUFCMA receives the pair it expects.
+"""
+import os
+import socket
+import struct
+import threading
+
+_LENGTH = struct.Struct('>I')
+_INT = struct.Struct('>q')
+
+#: Game methods that can be called through the server.
+METHODS = ('initialize', 'finalize', 'lr', 'fn', 'tag', 'enc', 'dec',
+           'lr_many', 'fn_many', 'tag_many', 'enc_many', 'dec_many')
+
+
+def encode(value, out, pack=_LENGTH.pack):
+    """
+    Appends the encoding of ``value`` to the list of strings ``out``.
+    """
+    if value is None:
+        out.append('N')
+    elif value is True:
+        out.append('T')
+    elif value is False:
+        out.append('F')
+    elif isinstance(value, str):
+        out.append('S' + _LENGTH.pack(len(value)))
+        out.append(value)
+    elif isinstance(value, (int, long)):
+        if -2 ** 63 <= value < 2 ** 63:
+            out.append('I' + _INT.pack(value))
+        else:
+            digits = str(value)
+            out.append('JS' + _LENGTH.pack(len(digits)) + digits)
+    elif isinstance(value, (list, tuple)):
+        out.append('L' + _LENGTH.pack(len(value)))
+        for item in value:
+            # Strings and argument tuples of strings are most of the
+            # traffic, so they skip the recursive call.
+            if type(item) is tuple and len(item) == 1 and \
+                    type(item[0]) is str:
+                out.append('L\x00\x00\x00\x01S' + pack(len(item[0])))
+                out.append(item[0])
+            elif type(item) is str:
+                out.append('S' + pack(len(item)))
+                out.append(item)
+            else:
+                encode(item, out)
+    elif isinstance(value, unicode):
+        encode(value.encode('utf-8'), out)
+    else:
+        raise TypeError("Cannot encode " + type(value).__name__ + ".")
+
+
+def decode(data, pos=0, unpack=_LENGTH.unpack_from):
+    """
+    :param data: String holding an encoded value at ``pos``.
+    :return: ``(value, end)`` where end is the position after the value.
+    """
+    kind = data[pos]
+    pos += 1
+    if kind == 'S':
+        n, = _LENGTH.unpack_from(data, pos)
+        pos += 4
+        return data[pos:pos + n], pos + n
+    if kind == 'L':
+        n, = unpack(data, pos)
+        pos += 4
+        items = []
+        append = items.append
+        for _ in xrange(n):
+            if data[pos] == 'S':
+                m, = unpack(data, pos + 1)
+                pos += 5 + m
+                append(data[pos - m:pos])
+            else:
+                item, pos = decode(data, pos)
+                append(item)
+        return tuple(items), pos
+    if kind == 'I':
+        return _INT.unpack_from(data, pos)[0], pos + 8
+    if kind == 'N':
+        return None, pos
+    if kind == 'T':
+        return True, pos
+    if kind == 'F':
+        return False, pos
+    if kind == 'J':
+        digits, pos = decode(data, pos)
+        return int(digits), pos
+    raise ValueError("Unknown value type " + repr(kind) + ".")
+
+
+def send_frame(sock, payload):
+    """
+    Sends ``payload`` (a list of strings) as one frame.
+    """
+    sock.sendall(_LENGTH.pack(sum(len(p) for p in payload)) + ''.join(payload))
+
+
+def read_frame(f):
+    """
+    :param f: File object reading from the socket.
+    :return: Payload of the next frame, or None at end of stream.
+    """
+    header = f.read(4)
+    if len(header) < 4:
+        return None
+    n, = _LENGTH.unpack(header)
+    payload = f.read(n)
+    if len(payload) < n:
+        raise IOError("Connection closed in the middle of a frame.")
+    return payload
+
+
+class OracleServer(object):
+    """
+    Serves a game on a Unix domain socket. Every connection plays on its own
+    clone of the game (see ``Game.clone``), so several adversaries can be
+    connected at once without seeing each other's queries.
+
+    Example Usage::
+
+        server = OracleServer(GamePRF(prf, 16, 16), '/tmp/prf.sock')
+        server.serve_forever()
+    """
+
+    def __init__(self, game, path):
+        """
+        :param game: Game to serve.
+        :param path: Filesystem path of the socket. An existing socket file
+                     there is replaced.
+        """
+        self.game, self.path = game, path
+        if os.path.exists(path):
+            os.unlink(path)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.bind(path)
+        self.sock.listen(16)
+        self._closed = False
+
+    def serve_forever(self):
+        """
+        Accepts connections until :meth:`close` is called, serving each on
+        its own thread.
+        """
+        while not self._closed:
+            try:
+                conn, _ = self.sock.accept()
+            except socket.error:
+                if self._closed:
+                    return
+                raise
+            t = threading.Thread(target=self.handle,
+                                 args=(conn, self.game.clone()))
+            t.daemon = True
+            t.start()
+
+    def handle(self, conn, game):
+        """
+        Answers the requests of one connection until it is closed.
+
+        :param conn: Connected socket.
+        :param game: Game the connection plays.
+        """
+        f = conn.makefile('rb', 1 << 16)
+        try:
+            while True:
+                payload = read_frame(f)
+                if payload is None:
+                    return
+                send_frame(conn, self.dispatch(game, payload))
+        finally:
+            f.close()
+            conn.close()
+
+    def dispatch(self, game, payload):
+        """
+        Runs one batch of calls.
+
+        :param game: Game the calls are made on.
+        :param payload: Request payload.
+        :return: Response payload as a list of strings.
+        """
+        i = 0
+        try:
+            request, _ = decode(payload)
+            name = request[0]
+            if name not in METHODS or not hasattr(game, name):
+                raise ValueError("The game has no oracle " + repr(name) + ".")
+            if len(request) == 3:
+                length, data = request[1], request[2]
+                if not length or len(data) % length:
+                    raise ValueError("Messages are not a whole number of " +
+                                     str(length) + " byte queries.")
+                queries = [data[j:j + length]
+                           for j in xrange(0, len(data), length)]
+                arglist = None
+            else:
+                arglist = request[1]
+                queries = _queries(name, arglist)
+            many = getattr(game, name + '_many', None)
+            if many is not None and queries is not None:
+                i = -1
+                results = list(many(queries))
+            else:
+                method = getattr(game, name)
+                if arglist is None:
+                    arglist = [(q,) for q in queries]
+                results = []
+                for i, args in enumerate(arglist):
+                    results.append(method(*args))
+            return _results(results)
+        except Exception as e:
+            return _error(i, e)
+
+    def close(self):
+        """
+        Stops accepting connections and removes the socket file.
+        """
+        self._closed = True
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except socket.error:
+            pass
+        self.sock.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+def _queries(name, arglist):
+    """
+    :return: The queries of a batch as the batch form of oracle ``name``
+             takes them, or None if they do not fit it.
+    """
+    if not arglist:
+        return None
+    if name == 'lr':
+        if all(len(args) == 2 for args in arglist):
+            return list(arglist)
+        return None
+    if all(len(args) == 1 for args in arglist):
+        return [args[0] for args in arglist]
+    return None
+
+
+def _results(results):
+    """
+    :return: Response payload carrying ``results``.
+    """
+    if results and type(results[0]) is str:
+        length = len(results[0])
+        if all(type(r) is str and len(r) == length for r in results):
+            out = ['=']
+            encode((length, ''.join(results)), out)
+            return out
+    out = ['+']
+    try:
+        encode(results, out)
+    except Exception as e:
+        for i, result in enumerate(results):
+            try:
+                encode(result, [])
+            except Exception:
+                return _error(i, e)
+        raise
+    return out
+
+
+def _error(index, e):
+    """
+    :return: Response payload reporting that call ``index`` raised ``e``.
+    """
+    out = ['-']
+    encode((index, type(e).__name__ + ": " + str(e)), out)
+    return out
+
+
+class OracleError(Exception):
+    """
+    Raised by :class:`OracleClient` when a call failed on the server. Its
+    ``index`` is the call of the batch that failed, -1 for the whole batch.
+    """
+
+    def __init__(self, index, message):
+        super(OracleError, self).__init__(message)
+        self.index = index
+
+
+def _message_length(arglist):
+    """
+    :return: Length of the messages if every call of ``arglist`` takes one
+             string of that same length, else None.
+    """
+    if len(arglist) < 2 or len(arglist[0]) != 1 or \
+            type(arglist[0][0]) is not str:
+        return None
+    length = len(arglist[0][0])
+    for args in arglist:
+        if len(args) != 1 or type(args[0]) is not str or \
+                len(args[0]) != length:
+            return None
+    return length
+
+
+class OracleClient(object):
+    """
+    Python end of the protocol, for adversaries running in another process.
+    :meth:`oracle` gives callables that can be passed to an adversary in
+    place of ``game.fn``, ``game.lr``, ...; :meth:`batch` and
+    :meth:`send`/:meth:`receive` amortize the round trip over many queries.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: Filesystem path of the server's socket.
+        """
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(path)
+        self._file = self.sock.makefile('rb', 1 << 16)
+
+    def send(self, name, arglist):
+        """
+        Sends a batch of calls without waiting for the answer.
+
+        :param name: Name of the game method.
+        :param arglist: List of argument tuples, one per call.
+        """
+        out = []
+        length = _message_length(arglist)
+        if length:
+            encode((name, length, ''.join(args[0] for args in arglist)), out)
+        else:
+            encode((name, arglist), out)
+        send_frame(self.sock, out)
+
+    def receive(self):
+        """
+        Reads the answer to the oldest batch not yet received.
+
+        :return: List of results, one per call of the batch.
+        """
+        payload = read_frame(self._file)
+        if payload is None:
+            raise IOError("Server closed the connection.")
+        value, _ = decode(payload, 1)
+        if payload[0] == '-':
+            raise OracleError(*value)
+        if payload[0] == '=':
+            length, data = value
+            return [data[i:i + length] for i in xrange(0, len(data), length)]
+        return list(value)
+
+    def batch(self, name, arglist):
+        """
+        :return: Results of calling ``name`` once per argument tuple.
+        """
+        self.send(name, arglist)
+        return self.receive()
+
+    def call(self, name, *args):
+        """
+        :return: Result of a single call.
+        """
+        return self.batch(name, [args])[0]
+
+    def oracle(self, name):
+        """
+        :return: Callable making single calls of ``name``.
+        """
+        return lambda *args: self.call(name, *args)
+
+    def close(self):
+        self._file.close()
+        self.sock.close()
@@ -0,0 +1,280 @@
+"""
+Binary transcripts of the queries adversaries make. Wrapping a game in
+:class:`Recorded` appends one record per oracle call (and per
+``initialize`` and ``finalize``) to a buffered file; :class:`Transcript`
+memory maps such a file and iterates over its records without copying
+them.
+
+A record is a 4 byte big endian length followed by that many bytes: an
+8 byte trial number, a 1 byte operation (an index into :data:`OPERATIONS`),
+the 4 byte length of the input, the input and the output. Inputs (the
+argument tuple) and outputs are encoded as in ``games.server``. A call
+whose arguments or result that encoding cannot hold is written as an error
+record: the operation has its :data:`ERROR` bit set and the input and
+output hold the ``repr`` of the arguments and the result.
+
+Example Usage::
+
+    sim = WorldSim(Recorded(GamePRF(prf, 16, 16), 'prf-%(pid)d.bin'), adv)
+    sim.compute_advantage(10 ** 6, workers=8)
+    sim.close()
+
+    for path in glob.glob('prf-*.bin'):
+        for record in Transcript(path):
+            if record.operation == 'fn':
+                print record.trial, record.args(), record.result()
+"""
+import atexit
+import copy
+import mmap
+import os
+import struct
+import threading
+from collections import namedtuple
+from multiprocessing import util
+
+from crypto.games.game import Game
+from crypto.games.instrument import ORACLES
+from crypto.games.server import decode, encode
+
+#: Operations recorded, in the order of their ids in records.
+OPERATIONS = (('initialize', 'finalize') + ORACLES +
+              tuple(name + '_many' for name in ORACLES))
+
+#: Bit set in the operation of error records.
+ERROR = 0x80
+
+_IDS = dict((name, i) for i, name in enumerate(OPERATIONS))
+_HEADER = struct.Struct('>IQBI')
+_LENGTH = struct.Struct('>I')
+
+# Files inherited from the parent by forked processes. They are kept alive
+# and never closed, so that the parent's buffered records are not written a
+# second time by a child.
+_inherited = []
+
+
+class TranscriptWriter(object):
+    """
+    Buffered append only transcript file shared by the games of one
+    simulator. Every process writes its own file, opened the first time it
+    records, so the worker processes of a simulator never share a file:
+    ``path`` may contain ``%(pid)d`` for the pid of the process, and
+    processes other than the one that created the writer append ``.<pid>``
+    to a path without it. Files are flushed when the buffer fills up and
+    when the process exits, including worker processes shut down by
+    ``BaseSim.close``, and after every trial run under ``sandbox.Limits``;
+    a process that is killed may leave a truncated last record, which the
+    reader ignores.
+    """
+
+    def __init__(self, path, buffering=1 << 20):
+        """
+        :param path: File to append to, may contain ``%(pid)d``.
+        :param buffering: Size of the write buffer in bytes.
+        """
+        self.path, self.buffering = path, buffering
+        self.owner = os.getpid()
+        self.lock = threading.Lock()
+        self._file = None
+        self._pid = None
+        self.trials = 0
+
+    def _open(self):
+        if self._file is not None:
+            _inherited.append(self._file)
+        self._pid = os.getpid()
+        self._file = open(self.file_path(), 'ab', self.buffering)
+        self.trials = 0
+        util.Finalize(self, self.flush, exitpriority=10)
+        atexit.register(self.flush)
+
+    def file_path(self):
+        """
+        :return: Path of the file this process writes.
+        """
+        pid = os.getpid()
+        if '%(pid)' in self.path:
+            return self.path % {'pid': pid}
+        if pid == self.owner:
+            return self.path
+        return '%s.%d' % (self.path, pid)
+
+    def new_trial(self):
+        """
+        :return: Number of a new trial, unique within this file.
+        """
+        with self.lock:
+            if self._pid != os.getpid():
+                self._open()
+            self.trials += 1
+            return self.trials
+
+    def write(self, trial, operation, args, result):
+        """
+        Appends one record.
+
+        :param trial: Trial number from :meth:`new_trial`.
+        :param operation: Name of the operation, see :data:`OPERATIONS`.
+        :param args: Argument tuple of the call.
+        :param result: What the call returned.
+        """
+        op = _IDS[operation]
+        parts = []
+        try:
+            encode(args, parts)
+            n = sum(map(len, parts))
+            encode(result, parts)
+        except TypeError:
+            op |= ERROR
+            parts = []
+            encode(repr(args), parts)
+            n = sum(map(len, parts))
+            encode(repr(result), parts)
+        body = ''.join(parts)
+        record = _HEADER.pack(13 + len(body), trial, op, n) + body
+        with self.lock:
+            if self._pid != os.getpid():
+                self._open()
+            self._file.write(record)
+
+    def flush(self):
+        """
+        Writes the buffered records of this process to its file.
+        """
+        with self.lock:
+            if self._file is not None and self._pid == os.getpid():
+                self._file.flush()
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state.update(lock=None, _file=None, _pid=None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+
+class Recorded(Game):
+    """
+    Wraps a game to record every call the simulator and the adversary make
+    to it in a transcript file, see :class:`TranscriptWriter`.
+    """
+
+    def __init__(self, game, path, buffering=1 << 20):
+        """
+        :param game: The game to record.
+        :param path: Transcript file, or a :class:`TranscriptWriter`.
+        :param buffering: Size of the write buffer in bytes.
+        """
+        super(Recorded, self).__init__()
+        if not isinstance(path, TranscriptWriter):
+            path = TranscriptWriter(path, buffering)
+        self.game, self.writer = game, path
+        self.trial = 0
+
+    def flush(self):
+        """
+        Writes the buffered records of this process to the transcript, and
+        flushes the wrapped game if it buffers too. ``sandbox.Limits`` calls
+        it after every trial, since its processes are killed rather than
+        left to exit.
+        """
+        self.writer.flush()
+        flush = getattr(self.game, 'flush', None)
+        if flush is not None:
+            flush()
+
+    def initialize(self, *args):
+        self.trial = self.writer.new_trial()
+        result = self.game.initialize(*args)
+        self.writer.write(self.trial, 'initialize', args, None)
+        return result
+
+    def finalize(self, *args):
+        result = self.game.finalize(*args)
+        self.writer.write(self.trial, 'finalize', args, result)
+        return result
+
+    def __getattr__(self, name):
+        if name.startswith('__') or name in ('game', 'writer'):
+            raise AttributeError(name)
+        attr = getattr(self.game, name)
+        if name not in _IDS:
+            return attr
+
+        def oracle(*args):
+            result = attr(*args)
+            self.writer.write(self.trial, name, args, result)
+            return result
+        return oracle
+
+    def clone(self):
+        """
+        :return: A recorded clone of the wrapped game, writing to the same
+                 file.
+        """
+        game = copy.copy(self)
+        game.game = self.game.clone()
+        return game
+
+
+class Record(namedtuple('Record', 'trial operation input output error')):
+    """
+    One record of a transcript. ``input`` and ``output`` are buffers into
+    the mapped file; :meth:`args` and :meth:`result` decode them. In an
+    error record (``error`` is true) they decode to the ``repr`` of the
+    arguments and the result.
+    """
+
+    def args(self):
+        """
+        :return: Argument tuple of the call.
+        """
+        return decode(str(self.input))[0]
+
+    def result(self):
+        """
+        :return: What the call returned.
+        """
+        return decode(str(self.output))[0]
+
+
+class Transcript(object):
+    """
+    Read only view of a transcript file, memory mapped so that iterating
+    over millions of records neither reads the file into memory nor copies
+    the records.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: Transcript file.
+        """
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            self.map = None
+            if size:
+                self.map = mmap.mmap(f.fileno(), size,
+                                     access=mmap.ACCESS_READ)
+
+    def __iter__(self):
+        m = self.map
+        if m is None:
+            return
+        pos, size = 0, len(m)
+        while pos + _HEADER.size <= size:
+            length, trial, op, n = _HEADER.unpack_from(m, pos)
+            end = pos + _LENGTH.size + length
+            if end > size:
+                return
+            start = pos + _HEADER.size
+            yield Record(trial, OPERATIONS[op & ~ERROR], buffer(m, start, n),
+                         buffer(m, start + n, end - start - n),
+                         bool(op & ERROR))
+            pos = end
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
@@ -1,4 +1,5 @@
 from crypto.primitives import *
+from crypto.ideal.tables import register, table_stats
 
 class BlockCipher():
     """
@@ -23,6 +24,9 @@ class BlockCipher():
 
         Hello World!
     """
+    #: Tables of sampled values, reported by :meth:`stats`.
+    stats_tables = ('ciphers', 'messages')
+
     def __init__(self, key_len, block_len):
         """
         :param key_len: Key length for block cipher in bytes.
@@ -31,6 +35,8 @@ class BlockCipher():
         self.key_len, self.block_len = key_len, block_len
         self.messages = {}
         self.ciphers = {}
+        self.hits, self.misses = 0, 0
+        register(self)
 
     def encrypt(self, key, block):
         """
@@ -52,7 +58,10 @@ class BlockCipher():
             raise ValueError("Invalid block length, block length was: " + \
                   str(len(block)) + " should be: " + str(self.block_len) + ".")
 
-        if not (key, block) in self.ciphers:
+        if (key, block) in self.ciphers:
+            self.hits += 1
+        else:
+            self.misses += 1
             cipher = self._new_element(key, self.messages)
             self.ciphers[(key, block)] = cipher
             self.messages[(key, cipher)] = block
@@ -79,13 +88,25 @@ class BlockCipher():
             raise ValueError("Invalid block length, block length was: " + \
                   str(len(cipher)) + " should be: " + str(self.block_len) + ".")
 
-        if not (key, cipher) in self.messages:
+        if (key, cipher) in self.messages:
+            self.hits += 1
+        else:
+            self.misses += 1
             message = self._new_element(key, self.ciphers)
             self.messages[(key, cipher)] = message
             self.ciphers[(key, message)] = cipher
 
         return self.messages[(key, cipher)]
 
+    def stats(self):
+        """
+        Reports how big the tables of sampled values have grown and how
+        often lookups found an existing entry.
+
+        :return: Dict described in ``tables.table_stats``.
+        """
+        return table_stats(self, self.stats_tables)
+
     def _new_element(self, key, l):
         """
         Returns an element that has not yet been picked. We need this function
@@ -1,4 +1,5 @@
 from crypto.primitives import *
+from crypto.ideal.tables import register, table_stats
 
 class DigitalSignature():
     """
@@ -30,6 +31,9 @@ class DigitalSignature():
 
     """
         
+    #: Tables of sampled values, reported by :meth:`stats`.
+    stats_tables = ('tags', 'keys')
+
     def __init__(self, key_len, tag_len):
         """
         :param key_len: Key length for the DS in bytes.
@@ -38,6 +42,8 @@ class DigitalSignature():
         self.key_len, self.tag_len = key_len, tag_len
         self.tags = {}
         self.keys = {}
+        self.hits, self.misses = 0, 0
+        register(self)
 
 
     def key_gen(self):
@@ -69,7 +75,10 @@ class DigitalSignature():
         if sk not in self.keys:
             self.keys[sk]= random_string(self.key_len)
 
-        if not (sk, message) in self.tags:
+        if (sk, message) in self.tags:
+            self.hits += 1
+        else:
+            self.misses += 1
             self.tags[(sk, message)] = random_string(self.tag_len)
 
         return self.tags[(sk, message)]
@@ -97,3 +106,12 @@ class DigitalSignature():
             self.sign(sk, message)
 
         return tag == self.tags[((sk, message))]
+
+    def stats(self):
+        """
+        Reports how big the tables of sampled keys and signatures have grown
+        and how often signature lookups found an existing entry.
+
+        :return: Dict described in ``tables.table_stats``.
+        """
+        return table_stats(self, self.stats_tables)
@@ -1,4 +1,5 @@
 from crypto.primitives import *
+from crypto.ideal.tables import register, table_stats
 
 class HashFunction():
     """
@@ -22,6 +23,9 @@ class HashFunction():
 
         True
     """
+    #: Tables of sampled values, reported by :meth:`stats`.
+    stats_tables = ('hashes',)
+
     def __init__(self, out_len, key_len=0):
         """
         :param out_len: Output length for the hash function in bytes.
@@ -30,6 +34,8 @@ class HashFunction():
         """
         self.key_len, self.out_len = key_len, out_len
         self.hashes = {}
+        self.hits, self.misses = 0, 0
+        register(self)
 
     def hash(self, message, key=None):
         """
@@ -46,7 +52,19 @@ class HashFunction():
                     str(len(key)) + " should be: " + str(self.key_len) + ".")
 
 
-        if not (key, message) in self.hashes:
+        if (key, message) in self.hashes:
+            self.hits += 1
+        else:
+            self.misses += 1
             self.hashes[(key, message)] = random_string(self.out_len)
 
         return self.hashes[(key, message)]
+
+    def stats(self):
+        """
+        Reports how big the table of sampled hashes has grown and how often
+        lookups found an existing entry.
+
+        :return: Dict described in ``tables.table_stats``.
+        """
+        return table_stats(self, self.stats_tables)
@@ -1,4 +1,5 @@
 from crypto.primitives import *
+from crypto.ideal.tables import register, table_stats
 
 class MAC():
     """
@@ -26,6 +27,9 @@ class MAC():
         True
         False
     """
+    #: Tables of sampled values, reported by :meth:`stats`.
+    stats_tables = ('tags',)
+
     def __init__(self, key_len, tag_len):
         """
         :param key_len: Key length for the MAC in bytes.
@@ -33,6 +37,8 @@ class MAC():
         """
         self.key_len, self.tag_len = key_len, tag_len
         self.tags = {}
+        self.hits, self.misses = 0, 0
+        register(self)
 
     def tag(self, key, message):
         """
@@ -48,7 +54,10 @@ class MAC():
             raise ValueError("Invalid key length, key length was: " + \
                     str(len(key)) + " should be: " + str(self.key_len) + ".")
 
-        if not (key, message) in self.tags:
+        if (key, message) in self.tags:
+            self.hits += 1
+        else:
+            self.misses += 1
             self.tags[(key, message)] = random_string(self.tag_len)
 
         return self.tags[(key, message)]
@@ -72,3 +81,11 @@ class MAC():
 
         return tag == self.tags[((key, message))]
 
+    def stats(self):
+        """
+        Reports how big the table of sampled tags has grown and how often
+        lookups found an existing entry.
+
+        :return: Dict described in ``tables.table_stats``.
+        """
+        return table_stats(self, self.stats_tables)
@@ -0,0 +1,70 @@
+import sys
+import weakref
+
+# Every ideal primitive registers itself here, so their tables can be
+# inspected without holding on to them.
+_instances = weakref.WeakValueDictionary()
+
+
+def register(primitive):
+    """
+    Adds an ideal primitive to the ones reported by :func:`report`.
+    """
+    _instances[id(primitive)] = primitive
+
+
+def instances():
+    """
+    :return: List of the ideal primitives still alive.
+    """
+    return [p for p in _instances.values() if p is not None]
+
+
+def table_bytes(table):
+    """
+    Approximates the memory held by a table of lazily sampled values: the
+    dict itself plus its keys and values, counting tuples and the strings
+    in them. Takes time proportional to the size of the table.
+
+    :param table: Dict of a primitive.
+    :return: Size in bytes.
+    """
+    size = sys.getsizeof(table)
+    for item in table.iteritems():
+        for value in item:
+            size += sys.getsizeof(value)
+            if isinstance(value, tuple):
+                size += sum(sys.getsizeof(v) for v in value)
+    return size
+
+
+def table_stats(primitive, names):
+    """
+    Builds the dict returned by the ``stats`` method of the primitives.
+
+    :param primitive: An ideal primitive with ``hits`` and ``misses``
+                      counters.
+    :param names: Names of the primitive's table attributes.
+    :return: Dict with the ``entries`` and ``bytes`` of every table (keyed
+             by name) and the ``hits``, ``misses`` and ``hit_ratio`` of
+             lookups.
+    """
+    lookups = primitive.hits + primitive.misses
+    stats = {'type': primitive.__class__.__name__,
+             'hits': primitive.hits, 'misses': primitive.misses,
+             'hit_ratio': float(primitive.hits) / lookups if lookups else 0.0,
+             'tables': {}}
+    for name in names:
+        table = getattr(primitive, name)
+        stats['tables'][name] = {'entries': len(table),
+                                 'bytes': table_bytes(table)}
+    stats['entries'] = sum(t['entries'] for t in stats['tables'].values())
+    stats['bytes'] = sum(t['bytes'] for t in stats['tables'].values())
+    return stats
+
+
+def report():
+    """
+    :return: List of the ``stats()`` of every live ideal primitive.
+    """
+    return [p.stats() for p in instances()]
@@ -1,7 +1,25 @@
+import os
 import random
 
-from Crypto.Cipher import AES as AES_C
-from Crypto.PublicKey import RSA
+# PyCrypto takes longer to import than the rest of the package, and only
+# AES and rsa_keygen need it, so it is imported the first time they run.
+AES_C = None
+RSA = None
+Random = None
+
+# Process that last generated RSA keys. PyCrypto refuses to use its random
+# pool in a forked child, e.g. a simulator worker, until it is reset.
+_rsa_pid = None
+
+
+def _pycrypto():
+    """
+    Imports the parts of PyCrypto this module uses.
+    """
+    global AES_C, RSA, Random
+    from Crypto import Random
+    from Crypto.Cipher import AES as AES_C
+    from Crypto.PublicKey import RSA
 
 def random_string(length):
     """
@@ -32,6 +50,8 @@ def AES(k, m):
     :param m: should be multiple of 128 bits long
     :return: cipher text
     """
+    if AES_C is None:
+        _pycrypto()
     cipher = AES_C.new(k)
     return cipher.encrypt(bytes(m))
 
@@ -44,6 +64,8 @@ def AES_I(k, m):
     :param m: should be multiple of 128 bits long
     :return: plaintext
     """
+    if AES_C is None:
+        _pycrypto()
     cipher = AES_C.new(k)
     return cipher.decrypt(bytes(m))
 
@@ -58,6 +80,12 @@ def rsa_keygen(len):
              (n - modulo, e - encryption exponent, d - decryption exponent,
              p - first factor of n, q - second factor of n).
     """
+    global _rsa_pid
+    if RSA is None:
+        _pycrypto()
+    if _rsa_pid != os.getpid():
+        Random.atfork()
+        _rsa_pid = os.getpid()
     r = RSA.generate(len * 8)
 
     return {'n': getattr(r.key, 'n'),
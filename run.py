@@ -0,0 +1,225 @@
+"""
+Runs experiments described in JSON files and prints their results as JSON,
+one line per experiment::
+
+    python -m crypto.run experiments.json --workers 8 --cache ~/.sim-cache
+
+An experiment file holds one experiment or a list of them. An experiment
+names a game (a class of ``crypto.games`` or an import path), the scheme
+(constructor arguments of the game given as import paths), the other
+constructor parameters, the adversary, and the options of
+``compute_advantage``::
+
+    {"name": "cbc-mac",
+     "game": "GamePRF",
+     "scheme": {"prf": "schemes.cbc_mac"},
+     "params": {"key_len": 16, "input_len": 32, "output_len": 16},
+     "adversary": "adversaries.extend",
+     "trials": 100000, "seed": 1}
+
+The simulator defaults to the one written for the game; ``simulator``
+(a class of ``crypto.simulator`` or an import path) overrides it. The
+options are ``trials``, ``precision``, ``time_budget``, ``confidence``,
+``bound``, ``method``, ``seed`` and ``workers``, plus ``executor`` for the
+simulator. ``setup`` may name a function that turns the parameters into
+more constructor arguments, see :func:`make_game`. The directory of the
+experiment file is added to the import path, so schemes and adversaries
+can live next to it.
+
+An experiment that fails is reported with its ``error`` and the others
+still run; the exit status is then 1.
+"""
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+import traceback
+
+from crypto.simulator.cache import ResultCache
+
+#: Game classes of ``crypto.games`` and the simulators written for them.
+GAMES = {
+    'GameBIND': ('crypto.games.game_bind.GameBIND',
+                 'crypto.simulator.bind_sim.BINDSim'),
+    'GameCCA': ('crypto.games.game_cca.GameCCA',
+                'crypto.simulator.cca_sim.CCASim'),
+    'GameCR': ('crypto.games.game_cr.GameCR',
+               'crypto.simulator.cr_sim.CRSim'),
+    'GameINTCTXT': ('crypto.games.game_int_ctxt.GameINTCTXT',
+                    'crypto.simulator.ctxt_sim.CTXTSim'),
+    'GameKR': ('crypto.games.game_kr.GameKR',
+               'crypto.simulator.kr_sim.KRSim'),
+    'GameLR': ('crypto.games.game_lr.GameLR',
+               'crypto.simulator.lr_sim.LRSim'),
+    'GamePRF': ('crypto.games.game_prf.GamePRF',
+                'crypto.simulator.world_sim.WorldSim'),
+    'GameTKR': ('crypto.games.game_tkr.GameTKR',
+                'crypto.simulator.kr_sim.KRSim'),
+    'GameUFCMA': ('crypto.games.game_ufcma.GameUFCMA',
+                  'crypto.simulator.ufcma_sim.UFCMASim'),
+    'VectorGameKR': ('crypto.games.game_vector.VectorGameKR',
+                     'crypto.simulator.vector_sim.VectorKRSim'),
+    'VectorGameLR': ('crypto.games.game_vector.VectorGameLR',
+                     'crypto.simulator.vector_sim.VectorLRSim'),
+    'VectorGamePRF': ('crypto.games.game_vector.VectorGamePRF',
+                      'crypto.simulator.vector_sim.VectorWorldSim'),
+}
+
+#: Simulators of ``crypto.simulator`` by class name.
+SIMULATORS = dict((sim.rpartition('.')[2], sim) for _, sim in GAMES.values())
+
+#: Keys of an experiment passed on to ``compute_advantage``.
+OPTIONS = ('precision', 'time_budget', 'confidence', 'bound', 'method',
+           'seed', 'workers')
+
+
+def resolve(path):
+    """
+    Imports the object at ``path``, e.g. ``crypto.tools.xor_strings``.
+    ``module:name`` is accepted as well.
+
+    :param path: Import path of a module attribute.
+    :return: The attribute.
+    """
+    module, _, name = path.replace(':', '.').rpartition('.')
+    if not module:
+        raise ValueError("Import path " + repr(path) + " names no module.")
+    obj = importlib.import_module(module)
+    for part in name.split('.'):
+        obj = getattr(obj, part)
+    return obj
+
+
+def make_game(experiment):
+    """
+    Builds the game of an experiment. If the experiment has a ``setup``, the
+    callable at that import path is called with the ``params`` first and
+    returns more constructor arguments, e.g. RSA parameters that are
+    expensive to generate.
+
+    :param experiment: Dict describing the experiment.
+    :return: The game.
+    """
+    game_path = GAMES.get(experiment['game'], (experiment['game'], None))[0]
+    params = dict(experiment.get('params', {}))
+    for name, path in experiment.get('scheme', {}).items():
+        params[name] = resolve(path)
+    if 'setup' in experiment:
+        params.update(resolve(experiment['setup'])(
+            **experiment.get('params', {})))
+    return resolve(game_path)(*experiment.get('args', ()), **params)
+
+
+def build(experiment, cache=None, executor=None, game=None):
+    """
+    Builds the simulator of an experiment.
+
+    :param experiment: Dict describing the experiment.
+    :param cache: Optional :class:`ResultCache` for the simulator.
+    :param executor: Executor of the simulator's workers, overriding the
+                     experiment's.
+    :param game: The game to simulate, built by :func:`make_game` if not
+                 given.
+    :return: The simulator.
+    """
+    sim_path = GAMES.get(experiment['game'], (None, None))[1]
+    sim_path = experiment.get('simulator', sim_path)
+    if sim_path is None:
+        raise ValueError("No simulator known for " +
+                         repr(experiment['game']) + "; set 'simulator'.")
+    sim_path = SIMULATORS.get(sim_path, sim_path)
+    if game is None:
+        game = make_game(experiment)
+    return resolve(sim_path)(game, resolve(experiment['adversary']),
+                             executor=executor or
+                             experiment.get('executor', 'process'),
+                             cache=cache)
+
+
+def run(experiment, cache=None, workers=None, executor=None, game=None):
+    """
+    Runs one experiment.
+
+    :param experiment: Dict describing the experiment.
+    :param cache: Optional :class:`ResultCache` to look results up in.
+    :param workers: Number of workers, overriding the experiment's.
+    :param executor: Executor of the workers, overriding the experiment's.
+    :param game: The game to simulate, see :func:`build`.
+    :return: Dict of results: the ``advantage``, its interval, the
+             ``trials`` behind it, the ``elapsed`` time and whether it came
+             from the ``cache``.
+    """
+    sim = build(experiment, cache, executor, game)
+    options = dict((k, experiment[k]) for k in OPTIONS if k in experiment)
+    if workers is not None:
+        options['workers'] = workers
+    hits = cache.hits if cache is not None else 0
+    start = time.time()
+    try:
+        e = sim.compute_advantage(experiment.get('trials'), **options)
+    finally:
+        sim.close()
+    return {'advantage': float(e), 'low': e.low, 'high': e.high,
+            'confidence': e.confidence, 'trials': e.trials,
+            'stderr': e.stderr, 'violations': e.violations,
+            'resources': e.resources, 'elapsed': time.time() - start,
+            'cached': cache is not None and cache.hits > hits}
+
+
+def load(path):
+    """
+    :param path: Experiment file.
+    :return: List of the experiments in it.
+    """
+    with open(path) as f:
+        experiments = json.load(f)
+    if isinstance(experiments, dict):
+        experiments = [experiments]
+    return experiments
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m crypto.run',
+        description='Run the experiments of JSON experiment files.')
+    parser.add_argument('files', nargs='+', help='experiment files')
+    parser.add_argument('--workers', type=int,
+                        help="number of workers, overrides the files'")
+    parser.add_argument('--executor', choices=('process', 'thread'),
+                        help="executor of the workers, overrides the files'")
+    parser.add_argument('--cache', help='directory to cache results in')
+    parser.add_argument('--cache-size', type=int, default=1 << 26,
+                        help='bytes the cache may take up')
+    parser.add_argument('--output', help='file to write the results to, '
+                                         'standard output by default')
+    args = parser.parse_args(argv)
+
+    cache = None
+    if args.cache is not None:
+        cache = ResultCache(os.path.expanduser(args.cache), args.cache_size)
+    out = sys.stdout if args.output is None else open(args.output, 'w')
+    failed = False
+    for path in args.files:
+        sys.path.insert(0, os.path.dirname(os.path.abspath(path)))
+        for i, experiment in enumerate(load(path)):
+            result = {'file': path,
+                      'name': experiment.get('name', '%s[%d]' % (path, i))}
+            try:
+                result.update(run(experiment, cache, args.workers,
+                                  args.executor))
+            except Exception as e:
+                traceback.print_exc()
+                result['error'] = '%s: %s' % (e.__class__.__name__, e)
+                failed = True
+            json.dump(result, out, sort_keys=True)
+            out.write('\n')
+            out.flush()
+    if out is not sys.stdout:
+        out.close()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
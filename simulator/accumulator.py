@@ -0,0 +1,179 @@
+import math
+
+#: Number of latency histogram buckets. Bucket ``i`` counts trials that took
+#: less than ``2 ** i`` microseconds (and at least ``2 ** (i - 1)``).
+BUCKETS = 40
+
+
+class Accumulator(object):
+    """
+    Constant memory summary of a stream of trials. It keeps the number of
+    trials and successes, a running mean and variance of the trial outcomes
+    and a logarithmic histogram of trial latencies. Accumulators of
+    different shards can be merged, so trials can be summarized wherever
+    they run and combined afterwards.
+
+    Example Usage:
+
+    .. testcode::
+
+        from crypto.simulator.accumulator import Accumulator
+
+        a, b = Accumulator(), Accumulator()
+        a.add(True, 0.001)
+        b.add(False, 0.003)
+        a.merge(b)
+
+        print a.trials, a.successes, a.mean
+
+    .. testoutput::
+
+        2 1 0.5
+    """
+
+    def __init__(self):
+        self.trials = 0
+        self.successes = 0
+        self.total = 0.0
+        self.m2 = 0.0
+        self.time = 0.0
+        self.histogram = [0] * BUCKETS
+        self.violations = 0
+        self.resources = {}
+        self.memory_peak = 0
+
+    def add(self, outcome, elapsed=0.0):
+        """
+        Records one trial.
+
+        :param outcome: Outcome of the trial. Booleans count as 1 and 0; any
+                        number can be used, e.g. for paired differences.
+        :param elapsed: Time the trial took, in seconds.
+        """
+        delta = outcome - self.mean
+        self.trials += 1
+        if outcome:
+            self.successes += 1
+        self.total += outcome
+        self.m2 += delta * (outcome - self.mean)
+        self.time += elapsed
+        bucket = min(int(elapsed * 1e6).bit_length(), BUCKETS - 1)
+        self.histogram[bucket] += 1
+
+    def add_violation(self, elapsed=0.0):
+        """
+        Records a trial that broke its resource limits. It counts neither
+        as a success nor as a failure.
+
+        :param elapsed: Time the trial took before being stopped, in seconds.
+        """
+        self.violations += 1
+        self.time += elapsed
+
+    def add_resources(self, usage):
+        """
+        Adds resource counters of a trial, e.g. its oracle queries.
+
+        :param usage: Dict of counters to add to :attr:`resources`.
+        """
+        for key, value in usage.items():
+            self.resources[key] = self.resources.get(key, 0) + value
+
+    def merge(self, other):
+        """
+        Adds the trials summarized by ``other`` to this accumulator.
+
+        :param other: Another :class:`Accumulator`.
+        :return: This accumulator.
+        """
+        self.violations += other.violations
+        self.add_resources(other.resources)
+        self.memory_peak = max(self.memory_peak, other.memory_peak)
+        n = self.trials + other.trials
+        if n == 0:
+            self.time += other.time
+            return self
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.trials * other.trials / n
+        self.trials = n
+        self.successes += other.successes
+        self.total += other.total
+        self.time += other.time
+        self.histogram = [a + b for a, b in
+                          zip(self.histogram, other.histogram)]
+        return self
+
+    def to_dict(self):
+        """
+        :return: The state of the accumulator as a JSON serializable dict.
+        """
+        return {'trials': self.trials, 'successes': self.successes,
+                'total': self.total, 'm2': self.m2, 'time': self.time,
+                'histogram': self.histogram, 'violations': self.violations,
+                'resources': self.resources, 'memory_peak': self.memory_peak}
+
+    @classmethod
+    def from_dict(cls, d):
+        """
+        :param d: A dict returned by :meth:`to_dict`.
+        :return: The accumulator it describes.
+        """
+        acc = cls()
+        acc.trials, acc.successes = d['trials'], d['successes']
+        acc.total, acc.m2, acc.time = d['total'], d['m2'], d['time']
+        acc.histogram = list(d['histogram'])
+        acc.violations = d.get('violations', 0)
+        acc.resources = dict(d.get('resources', {}))
+        acc.memory_peak = d.get('memory_peak', 0)
+        return acc
+
+    @property
+    def mean(self):
+        """
+        :return: Mean of the outcomes.
+        """
+        if self.trials == 0:
+            return 0.0
+        return self.total / self.trials
+
+    @property
+    def ratio(self):
+        """
+        :return: successes / trials, 0.0 before any trial.
+        """
+        if self.trials == 0:
+            return 0.0
+        return float(self.successes) / self.trials
+
+    @property
+    def variance(self):
+        """
+        :return: Sample variance of the outcomes.
+        """
+        if self.trials < 2:
+            return 0.0
+        return self.m2 / (self.trials - 1)
+
+    @property
+    def stderr(self):
+        """
+        :return: Standard error of :attr:`mean`.
+        """
+        if self.trials == 0:
+            return float('inf')
+        return math.sqrt(self.variance / self.trials)
+
+    def latency(self, q):
+        """
+        Approximates a latency quantile from the histogram.
+
+        :param q: Quantile between 0 and 1, e.g. ``0.99``.
+        :return: Upper edge, in seconds, of the bucket holding the quantile.
+        """
+        target = q * self.trials
+        seen = 0
+        for i, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= target:
+                return (2 ** i) / 1e6
+        return 0.0
@@ -1,16 +1,773 @@
+import copy
+import hashlib
+import math
+import os
+import random
+import resource
+import time
 
-class BaseSim():
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from crypto.simulator.accumulator import Accumulator
+from crypto.simulator.checkpoint import Checkpoint
+from crypto.simulator.exact import LIMIT, enumerate_coins, root_arity
+from crypto.simulator.metrics import worker_status
+from crypto.simulator.sandbox import VIOLATION
+from crypto.simulator.stats import Estimate, intervals
+
+# Bounds on the number of shards a run is split into and on their size.
+# The shard layout depends only on the trial count and the seed, never on
+# the worker count, so a seeded run gives the same result serially and on
+# any number of workers. Every shard pays for seeding and, with workers, a
+# round trip to a worker, so shards hold enough trials to hide that cost.
+MAX_SHARDS = 1024
+MIN_SHARD = 128
+
+#: Pseudo world of a two world simulator in which every trial runs the game
+#: once in each world on common random numbers.
+PAIRED = 'paired'
+
+#: Pseudo world of a single world simulator in which every trial is
+#: weighted by the likelihood ratio of its importance sampling proposals.
+WEIGHTED = 'weighted'
+
+
+def normal_seed(seed):
+    """
+    :return: ``seed`` with integers of either type as ``int`` where they
+             fit, since ``1`` and ``1L`` seed the same stream.
+    """
+    if isinstance(seed, (int, long)) and not isinstance(seed, bool):
+        return int(seed)
+    return seed
+
+
+def derive_seed(seed, *path):
+    """
+    Derives an independent seed for a sub-stream of a seeded run.
+
+    :param seed: Seed of the whole run.
+    :param path: Anything identifying the sub-stream, e.g. world and shard.
+    :return: A 256 bit integer usable with ``random.seed``.
+    """
+    seed = normal_seed(seed)
+    return long(hashlib.sha256(repr((seed,) + path)).hexdigest(), 16)
+
+
+def fresh_seed():
+    """
+    :return: A new 64 bit seed taken from the operating system.
+    """
+    return long(os.urandom(8).encode('hex'), 16)
+
+
+def shard_count(trials, concurrency=None):
+    """
+    :param trials: Number of trials per world.
+    :param concurrency: Least number of shards, if there are that many
+                        trials.
+    :return: Number of shards a run of ``trials`` trials per world is split
+             into.
+    """
+    shards = max(1, min(trials // MIN_SHARD, MAX_SHARDS))
+    if concurrency is not None:
+        shards = max(shards, min(trials, concurrency))
+    return shards
+
+
+def split_trials(trials, shards):
+    """
+    Splits ``trials`` into ``shards`` parts whose sizes differ by at most one.
+
+    :return: List of shard sizes.
+    """
+    q, r = divmod(trials, shards)
+    return [q + 1] * r + [q] * (shards - r)
+
+
+def memory_peak():
+    """
+    :return: High-water mark of memory use in bytes: of the Python heap since
+             the last call where ``tracemalloc`` is available, otherwise the
+             maximum resident size of the process so far.
+    """
+    if tracemalloc is not None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        peak = tracemalloc.get_traced_memory()[1]
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        return peak
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class BaseSim(object):
     """
     This is the base simulator class that all simulators inherit from. It has
-    the base constructor which all simulators use.
+    the base constructor which all simulators use, and the trial engine that
+    runs a simulator's trials either in this process or on a pool of worker
+    processes or threads.
     """
-    def __init__(self, game, adversary):
+
+    #: Worlds the advantage is computed over. Two world simulators set this
+    #: to ``(0, 1)``; ``None`` means the game has a single world.
+    worlds = (None,)
+
+    #: Default number of trials per world.
+    trials = 1000
+
+    def __init__(self, game, adversary, executor='process', limits=None,
+                 trace_memory=False, metrics=None, cache=None,
+                 concurrency=None):
         """
         :param game: This is the specific instantiation of the game you wish to
                      perform a simulation of.
         :param adversary: This is the adversary you would like to run against
         the game.
+        :param executor: What ``workers`` are: ``'process'`` for forked
+                         processes or ``'thread'`` for threads, each with its
+                         own clone of the game. Use threads when the
+                         scheme blocks on I/O, see ``concurrency``.
+        :param limits: Optional :class:`sandbox.Limits` to run every trial
+                       under. Trials that break them are counted as
+                       violations, apart from successes and failures.
+        :param trace_memory: Record the memory high-water mark of the
+                             trials, see :func:`memory_peak`. It is reported
+                             as ``resources['memory.peak']`` of estimates.
+        :param metrics: Optional :class:`metrics.Metrics` to report the
+                        progress of runs to.
+        :param cache: Optional :class:`cache.ResultCache` to look seeded
+                      runs of :meth:`compute_advantage` up in.
+        :param concurrency: Number of trials to keep in flight at once, for
+                            schemes whose trials mostly wait. A worker runs
+                            the trials of a shard one after another, so runs
+                            are split into at least this many shards; give
+                            as many thread ``workers`` to run them all at
+                            once. Seeded results depend on it, but not on
+                            ``workers``.
         """
+        if executor not in ('process', 'thread'):
+            raise ValueError("Unknown executor " + repr(executor) + ".")
         self.game = game
         self.adversary = adversary
+        self.executor = executor
+        self.limits = limits
+        self.trace_memory = trace_memory
+        self.metrics = metrics
+        self.cache = cache
+        self.concurrency = concurrency
+        self.proposals = ()
+        self._pool = None
+
+    def clone(self):
+        """
+        :return: A copy of this simulator with its own clone of the game
+                 (and sandbox process), sharing the adversary.
+        """
+        sim = copy.copy(self)
+        sim.game = self.game.clone()
+        sim.limits = copy.copy(self.limits)
+        sim._pool = None
+        return sim
+
+    def trial(self, world=None):
+        """
+        Runs a single trial of the game.
+
+        :param world: World to run in, ``None`` for single world games.
+        :return: True for success and False for failure.
+        """
+        if world is None:
+            return bool(self.run())
+        if world == PAIRED:
+            return self.paired_trial()
+        if world == WEIGHTED:
+            return self.weighted_trial()
+        return bool(self.run(world))
+
+    def paired_trial(self):
+        """
+        Runs the game once in each of the two worlds on common random
+        numbers: both runs start from the same state of ``random``, so they
+        get the same key and the same adversary coins wherever the game
+        draws them in the same order. The adversary's guesses in the two
+        worlds are then positively correlated, so a trial whose guess is
+        right in one world tends to have it wrong in the other, which lowers
+        the variance of the mean outcome and of the advantage estimate.
+
+        :return: Mean of the two outcomes. The advantage is
+                 ``advantage([m, m])`` where ``m`` is its expectation.
+        """
+        w0, w1 = self.worlds
+        state = random.getstate()
+        o0 = self.run(w0)
+        random.setstate(state)
+        o1 = self.run(w1)
+        return (bool(o0) + bool(o1)) / 2.0
+
+    def weighted_trial(self):
+        """
+        Runs the game once with the importance sampling proposals in
+        ``self.proposals`` and weights the outcome by their likelihood ratio.
 
+        :return: The likelihood ratio of the trial's coins on success, 0.0 on
+                 failure.
+        """
+        for p in self.proposals:
+            p.reset()
+        if not self.run():
+            return 0.0
+        ratio = 1.0
+        for p in self.proposals:
+            ratio *= p.ratio
+        return ratio
+
+    def iter_trials(self, world=None, trials=None, seed=None):
+        """
+        Runs trials in ``world`` in this process and yields them one at a
+        time, so results can be consumed while the run is going.
+
+        :param world: World to run in, ``None`` for single world games.
+        :param trials: Number of trials to run, unbounded if ``None``.
+        :param seed: If given, ``random`` is seeded with it first.
+        :return: Generator of ``(outcome, elapsed)`` tuples, where elapsed
+                 is the duration of the trial in seconds. With
+                 :attr:`limits` the outcome is ``sandbox.VIOLATION`` for
+                 trials that broke them.
+        """
+        if seed is not None:
+            random.seed(seed)
+        if self.limits is not None:
+            for result in self.limits.iter_trials(self, world, trials):
+                yield result
+            return
+        clock, i = time.time, 0
+        while trials is None or i < trials:
+            start = clock()
+            outcome = self.trial(world)
+            yield outcome, clock() - start
+            i += 1
+
+    def run_trials(self, world, trials, seed=None):
+        """
+        Runs ``trials`` trials in ``world`` in this process.
+
+        :param world: World to run in, ``None`` for single world games.
+        :param trials: Number of trials to run.
+        :param seed: If given, ``random`` is seeded with it first.
+        :return: An :class:`Accumulator` summarizing the trials.
+        """
+        acc = Accumulator()
+        take_usage = getattr(self.game, 'take_usage', None)
+        if self.limits is not None:
+            take_usage = None
+        trace_memory = self.trace_memory and self.limits is None
+        if trace_memory:
+            memory_peak()
+        for outcome, elapsed in self.iter_trials(world, trials, seed):
+            if outcome is VIOLATION:
+                acc.add_violation(elapsed)
+            else:
+                acc.add(outcome, elapsed)
+            if take_usage is not None:
+                usage = take_usage()
+                usage['time.adversary'] = elapsed - sum(
+                    v for k, v in usage.items() if k.startswith('time.'))
+                acc.add_resources(usage)
+            if trace_memory:
+                acc.memory_peak = max(acc.memory_peak, memory_peak())
+        return acc
+
+    def shards(self, world, trials, seed):
+        """
+        Splits the trials of one world into independently seeded shards.
+
+        :return: List of ``(world, trials, seed)`` tuples.
+        """
+        sizes = split_trials(trials, shard_count(trials, self.concurrency))
+        return [(world, n, derive_seed(seed, world, i))
+                for i, n in enumerate(sizes)]
+
+    def pool(self, workers):
+        """
+        Returns the worker pool for this simulator, starting it on first use.
+        The pool is reused by later calls as long as the worker count,
+        executor, game and adversary stay the same.
+
+        :param workers: Number of worker processes or threads.
+        :return: A :class:`TrialPool` or :class:`TrialThreads`.
+        """
+        # Imported here: multiprocessing is only needed once there are
+        # workers, and runs without them should start fast.
+        from crypto.simulator.pool import TrialPool
+        from crypto.simulator.threads import TrialThreads
+        cls = TrialThreads if self.executor == 'thread' else TrialPool
+        if self._pool is not None and not (isinstance(self._pool, cls) and
+                                           self._pool.serves(self, workers)):
+            self.close()
+        if self._pool is None:
+            self._pool = cls(self, workers)
+        return self._pool
+
+    def close(self):
+        """
+        Shuts down the worker pool and the sandbox process, if they were
+        started.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+        if self.limits is not None:
+            self.limits.close()
+
+    def accumulate(self, worlds, trials, workers=None, seed=None,
+                   checkpoint=None, checkpoint_interval=60, node=(0, 1)):
+        """
+        Runs ``trials`` trials in each of ``worlds``.
+
+        Without ``workers``, ``seed`` and ``checkpoint`` the trials run in
+        this process on the global ``random`` stream exactly as a plain loop
+        would; with :attr:`metrics` the loop stops between pieces of it to
+        report progress. Otherwise the trials are split into shards, each
+        with its own stream derived from ``seed`` (a fresh one if not
+        given), and run on ``workers`` processes.
+
+        With ``checkpoint`` the merged results and the set of finished shards
+        are saved to that file every ``checkpoint_interval`` seconds and at
+        the end. If the file exists the run resumes from it, skipping the
+        finished shards, and ends with the same counts an uninterrupted run
+        would have.
+
+        With ``node`` only every ``count``-th shard, starting at ``index``,
+        is run, so ``count`` processes or machines given the same seed and
+        different indices split the run between them without sharing any
+        random stream.
+
+        :param worlds: Worlds to run trials in.
+        :param trials: Number of trials per world, or a list with one
+                       number per world.
+        :param workers: Number of worker processes to use.
+        :param seed: Seed that makes the run reproducible.
+        :param checkpoint: Path of the checkpoint file.
+        :param checkpoint_interval: Seconds between checkpoints.
+        :param node: ``(index, count)`` of this node's part of the run.
+        :return: List of :class:`Accumulator`, one per world.
+        """
+        if isinstance(trials, (int, long)):
+            trials = [trials] * len(worlds)
+        metrics = self.metrics
+        plain = not workers and seed is None and checkpoint is None
+        if plain and metrics is None:
+            return [self.run_trials(w, n) for w, n in zip(worlds, trials)]
+
+        state = None
+        if checkpoint is not None:
+            if seed is None and not os.path.exists(checkpoint):
+                seed = fresh_seed()
+            run = {'seed': seed, 'worlds': list(worlds),
+                   'trials': list(trials),
+                   'shards': [shard_count(n, self.concurrency)
+                              for n in trials],
+                   'node': list(node), 'sim_worlds': list(self.worlds)}
+            state = Checkpoint.open(checkpoint, run)
+            seed = state.seed
+        elif seed is None and not plain:
+            seed = fresh_seed()
+
+        index, count = node
+        if plain:
+            # Pieces of the plain loop on the global stream, so that there
+            # is progress to report between them.
+            pending = [(i, j, (w, size, None))
+                       for i, (w, n) in enumerate(zip(worlds, trials))
+                       for j, size in enumerate(
+                           split_trials(n, shard_count(n)))]
+        else:
+            pending = [(i, j, shard)
+                       for i, (w, n) in enumerate(zip(worlds, trials))
+                       for j, shard in enumerate(self.shards(w, n, seed))
+                       if j % count == index and
+                       (state is None or (i, j) not in state.done)]
+        shards = [shard for i, j, shard in pending]
+        name = 'run_trials' if metrics is None else 'metered_trials'
+        if workers > 1:
+            results = self.pool(workers).imap(name, shards)
+        else:
+            results = enumerate(getattr(self, name)(*s) for s in shards)
+
+        accs = [Accumulator() for w in worlds]
+        if state is not None:
+            accs = state.accs
+        saved = time.time()
+        for done, (k, acc) in enumerate(results, 1):
+            if metrics is not None:
+                acc, status = acc
+            if state is None:
+                accs[pending[k][0]].merge(acc)
+            else:
+                state.record(pending[k][0], pending[k][1], acc)
+                if time.time() - saved >= checkpoint_interval:
+                    state.save()
+                    saved = time.time()
+            if metrics is not None:
+                metrics.progress(self, worlds, accs, done, len(shards),
+                                 workers, status, acc.trials)
+        if state is not None:
+            state.save()
+        if metrics is not None:
+            metrics.commit(accs)
+        return accs
+
+    def metered_trials(self, world, trials, seed=None):
+        """
+        :meth:`run_trials` for runs with :attr:`metrics`, which also reports
+        on the worker that ran the trials.
+
+        :return: ``(acc, status)``: the :class:`Accumulator` and the
+                 ``metrics.worker_status()`` of the worker.
+        """
+        return self.run_trials(world, trials, seed), worker_status()
+
+    def success_ratio(self, world=None, trials=None, workers=None, seed=None):
+        """
+        Runs the game in ``world`` and computes the ratio of successful runs
+        over total runs.
+
+        :return: successes / total_runs
+        """
+        if trials is None:
+            trials = self.trials
+        acc, = self.accumulate([world], trials, workers, seed)
+        if acc.trials == 0 and acc.violations:
+            raise ValueError("All " + str(acc.violations) + " trials "
+                             "violated the resource limits.")
+        return acc.ratio
+
+    def advantage(self, ratios):
+        """
+        Combines success ratios into an advantage. For single world games
+        this is the success ratio itself; for two world games it is
+        Pr[1 => 1] - Pr[0 => 1].
+
+        :param ratios: Success ratios, one per entry of ``self.worlds``.
+        :return: The advantage.
+        """
+        if len(ratios) == 1:
+            return ratios[0]
+        return ratios[1] - (1 - ratios[0])
+
+    def estimate(self, accs, confidence=0.95, bound='wilson', delta=None,
+                 worlds=None):
+        """
+        Turns per world results into an advantage estimate with a
+        confidence interval. The interval is obtained by combining
+        simultaneous intervals for the success ratios of every world, so for
+        two world games it accounts for the error in both ratios.
+
+        :param accs: Accumulators, one per entry of ``worlds``.
+        :param confidence: Confidence level of the reported interval.
+        :param bound: Interval method, see :data:`stats.BOUNDS`.
+        :param delta: Error probability to build the interval with, defaults
+                      to ``1 - confidence``.
+        :param worlds: Worlds the accumulators belong to, ``self.worlds`` if
+                       not given, ``(PAIRED,)`` or ``(WEIGHTED,)``. Weighted
+                       outcomes always use the normal interval, and paired
+                       ones the Bernstein interval instead of Wilson's,
+                       which cannot make use of their lower variance.
+        :return: An :class:`Estimate`, NaN with the widest interval if a
+                 world has no trials.
+        """
+        if delta is None:
+            delta = 1 - confidence
+        if worlds is not None and tuple(worlds) == (WEIGHTED,):
+            bound = 'normal'
+        if worlds is not None and tuple(worlds) == (PAIRED,) and \
+                bound == 'wilson':
+            bound = 'bernstein'
+        # A world whose trials all violated the limits has no mean.
+        means = [acc.mean if acc.trials else float('nan') for acc in accs]
+        bounds = intervals(accs, delta, bound)
+        trials = sum(acc.trials for acc in accs)
+        violations = sum(acc.violations for acc in accs)
+        ratios = means
+        stderr = math.sqrt(sum(acc.stderr ** 2 for acc in accs))
+        if worlds is not None and tuple(worlds) == (PAIRED,):
+            k = len(self.worlds)
+            means, bounds, trials = means * k, bounds * k, trials * k
+            ratios, stderr = None, stderr * k
+        resources = None
+        if any(acc.resources for acc in accs):
+            total = Accumulator()
+            for acc in accs:
+                total.add_resources(acc.resources)
+            runs = float(max(1, trials + violations))
+            resources = dict((k, v / runs)
+                             for k, v in total.resources.items())
+        peak = max(acc.memory_peak for acc in accs)
+        if peak:
+            resources = dict(resources or {}, **{'memory.peak': peak})
+        return Estimate(self.advantage(means),
+                        self.advantage([low for low, high in bounds]),
+                        self.advantage([high for low, high in bounds]),
+                        trials, confidence, ratios, stderr, violations,
+                        resources)
+
+    def compute_advantage(self, trials=None, workers=None, seed=None,
+                          precision=None, confidence=0.95, bound='wilson',
+                          method='independent', proposals=None,
+                          time_budget=None, checkpoint=None,
+                          checkpoint_interval=60):
+        """
+        Runs ``trials`` trials in every world and computes the advantage.
+
+        If ``precision`` is given the simulator instead runs batches of
+        trials until the confidence interval of the advantage has at most
+        that half width. If ``time_budget`` is given it runs as many trials
+        as fit in that many seconds; batch sizes are calibrated from the
+        measured throughput, so the budget is overshot by about one trial's
+        latency at most. The estimate's ``trials`` tells how many ran.
+
+        Two world simulators support two variance reduction methods.
+        ``'paired'`` runs both worlds on common random numbers (see
+        :meth:`paired_trial`); ``'stratified'`` spends the trials of both
+        worlds together, giving each world a share proportional to the
+        standard deviation of its outcomes (Neyman allocation).
+
+        Single world simulators can estimate tiny advantages by importance
+        sampling: pass the :class:`importance.Proposal` objects that the
+        game and adversary sample from as ``proposals``. Every trial is then
+        weighted by its likelihood ratio, the interval is the normal
+        approximation one, and the estimate's ``relative_error`` tells how
+        well the proposals work.
+
+        :param trials: Number of trials per world, ``self.trials`` if not
+                       given. With ``precision`` or ``time_budget`` this is
+                       an upper limit and defaults to no limit.
+        :param workers: Number of worker processes to spread the trials
+                        over. The pool is kept for later calls; see
+                        :meth:`close`.
+        :param seed: Seed that makes the run reproducible, independently of
+                     ``workers``.
+        :param precision: Target half width of the confidence interval.
+        :param confidence: Confidence level of the interval.
+        :param bound: Interval method: ``'hoeffding'``, ``'wilson'`` or
+                      ``'bernstein'``.
+        :param method: ``'independent'``, ``'paired'`` or ``'stratified'``.
+        :param proposals: Importance sampling proposals used by the game and
+                          the adversary.
+        :param time_budget: Wall clock time to spend, in seconds.
+        :param checkpoint: File to periodically save progress to and to
+                           resume from, see :meth:`accumulate`. Only for
+                           runs with a fixed number of trials.
+        :param checkpoint_interval: Seconds between checkpoints.
+        :return: Approximate advantage, as an :class:`Estimate`.
+        """
+        worlds = self._worlds(method, proposals)
+        stratify = method == 'stratified'
+        if trials is None and precision is None and time_budget is None:
+            trials = self.trials
+        key = None
+        if self.cache is not None and seed is not None and \
+                time_budget is None:
+            key = self.cache.key(self, {
+                'trials': trials if trials is None else int(trials),
+                'seed': normal_seed(seed),
+                'precision': precision, 'confidence': confidence,
+                'bound': bound, 'method': method,
+                'time_budget': time_budget,
+                'concurrency': self.concurrency})
+            e = self.cache.get(key)
+            if e is not None:
+                return e
+        if self.metrics is not None:
+            self.metrics.begin(worlds, confidence, bound)
+        if precision is not None or time_budget is not None or stratify:
+            if checkpoint is not None:
+                raise ValueError("Checkpoints need a fixed number of trials "
+                                 "and method 'independent' or 'paired'.")
+            e = self._compute_until(trials, workers, seed, worlds, stratify,
+                                    precision, confidence, bound, time_budget)
+        else:
+            accs = self.accumulate(worlds, trials, workers, seed, checkpoint,
+                                   checkpoint_interval)
+            e = self.estimate(accs, confidence, bound, worlds=worlds)
+        if self.metrics is not None:
+            self.metrics.emit(self)
+        if key is not None:
+            self.cache.put(key, e)
+        return e
+
+    def run_shard(self, path, index, count, seed, trials=None, workers=None,
+                  method='independent', proposals=None,
+                  checkpoint_interval=60):
+        """
+        Runs this node's part of a run split over ``count`` machines (or
+        invocations) and stores the result in ``path``. Every node must be
+        given the same seed, trials and method, and a different ``index``;
+        the nodes then run disjoint sets of shards with non overlapping
+        random streams. Combine the result files with
+        ``python -m crypto.simulator.shards merge``. A node that dies can
+        be rerun with the same arguments and resumes from ``path``.
+
+        :param path: Result file of this node.
+        :param index: Index of this node, from 0 to ``count - 1``.
+        :param count: Number of nodes.
+        :param seed: Seed of the whole run.
+        :param trials: Number of trials per world in the whole run.
+        :param workers: Number of worker processes on this node.
+        :param method: As in :meth:`compute_advantage`, except stratified.
+        :param proposals: As in :meth:`compute_advantage`.
+        :param checkpoint_interval: Seconds between saves of ``path``.
+        :return: List of :class:`Accumulator` of this node, one per world.
+        """
+        if seed is None:
+            raise ValueError("The nodes of a run must share a seed.")
+        if method == 'stratified':
+            raise ValueError("Stratified runs cannot be split into nodes.")
+        if not 0 <= index < count:
+            raise ValueError("Node index should be between 0 and " +
+                             str(count - 1) + ".")
+        worlds = self._worlds(method, proposals)
+        if trials is None:
+            trials = self.trials
+        return self.accumulate(worlds, trials, workers, seed, path,
+                               checkpoint_interval, (index, count))
+
+    def _worlds(self, method, proposals=None):
+        """
+        Checks ``method`` and installs ``proposals``, or removes those of an
+        earlier call if there are none.
+
+        :return: Worlds to accumulate trials in.
+        """
+        if method not in ('independent', 'paired', 'stratified'):
+            raise ValueError("Unknown method " + repr(method) + ".")
+        if method != 'independent' and len(self.worlds) != 2:
+            raise ValueError("Method " + repr(method) + " needs a two "
+                             "world simulator.")
+        if proposals is not None:
+            if self.worlds != (None,):
+                raise ValueError("Importance sampling needs a single world "
+                                 "simulator.")
+            self.proposals = tuple(proposals)
+            return (WEIGHTED,)
+        self.proposals = ()
+        if method == 'paired':
+            return (PAIRED,)
+        return self.worlds
+
+    def _allocate(self, accs, total):
+        """
+        Splits ``total`` trials between worlds proportionally to the
+        standard deviations of their outcomes so far (Neyman allocation).
+        The variances are shrunk towards the largest possible one, 1/4, so a
+        world that has not varied yet still gets trials.
+
+        :return: List of trial counts, one per accumulator.
+        """
+        sds = [math.sqrt((acc.m2 + 0.25) / (acc.trials + 1)) for acc in accs]
+        sizes = [int(total * sd / sum(sds)) for sd in sds]
+        sizes[sds.index(max(sds))] += total - sum(sizes)
+        return sizes
+
+    def _compute_until(self, limit, workers, seed, worlds, stratify,
+                       precision, confidence, bound, time_budget=None):
+        """
+        Runs batches of trials until the interval has half width at most
+        ``precision``, ``limit`` trials per world have run or the next batch
+        would not fit in ``time_budget``. The number of trials doubles at
+        every look, but with a time budget a batch is never larger than what
+        the measured throughput says fits in the time left.
+
+        When stopping depends on the data, look ``k`` uses error probability
+        ``delta / (k (k + 1))`` so that the reported interval holds with the
+        requested confidence even though we stop based on it.
+        """
+        delta = 1 - confidence
+        accs = [Accumulator() for w in worlds]
+        n, look = 0, 0
+        if time_budget is None:
+            batch = max(workers or 1, self.trials // 10)
+        else:
+            batch = workers or 1
+            start = time.time()
+        while True:
+            look += 1
+            if limit is not None:
+                batch = min(batch, limit - n)
+            if seed is not None:
+                batch_seed = derive_seed(seed, 'batch', look)
+            else:
+                batch_seed = None
+            if stratify:
+                sizes = self._allocate(accs, batch * len(worlds))
+            else:
+                sizes = batch
+            batch_accs = self.accumulate(worlds, sizes, workers, batch_seed)
+            for acc, batch_acc in zip(accs, batch_accs):
+                acc.merge(batch_acc)
+            n += batch
+            batch = n
+            if time_budget is not None:
+                elapsed = max(time.time() - start, 1e-6)
+                batch = min(batch, int(n * (time_budget - elapsed) / elapsed))
+            done = n == limit or batch < 1
+            if precision is None:
+                if done:
+                    return self.estimate(accs, confidence, bound,
+                                         worlds=worlds)
+            else:
+                e = self.estimate(accs, confidence, bound,
+                                  delta / (look * (look + 1)), worlds)
+                if e.half_width <= precision or done:
+                    return e
+
+    def exact_ratio(self, world=None, workers=None, limit=LIMIT, prefix=()):
+        """
+        Computes the exact success probability in ``world`` by enumerating
+        every sequence of coins the trial draws from ``random``: the key,
+        the world's random values (e.g. the outputs of a random function)
+        and the adversary's own coins. The number of sequences is the
+        product of the number of values of every draw, so this is only
+        practical for toy parameters, e.g. a key of one or two bytes and an
+        adversary making a query or two. Only coins that are drawn count:
+        GamePRF draws its key when it is first used, so its random world
+        branches on the random function's outputs alone. The trial must be
+        a function of its coins, so schemes that keep state across trials
+        (like the ideal primitives) cannot be enumerated.
+
+        :param world: World to run in, ``None`` for single world games.
+        :param workers: Number of worker processes to split the first draw
+                        (usually the first key byte) over.
+        :param limit: Maximum number of coin sequences to enumerate, or
+                      None for no limit. A run that would need more raises
+                      a ValueError before it starts.
+        :param prefix: Fixed values of the first draws; used by the workers.
+        :return: The probability as a Fraction.
+        """
+        trial = lambda: self.trial(world)
+        if workers > 1 and self.executor == 'thread':
+            raise ValueError("Exact enumeration needs the process executor.")
+        if workers > 1 and not prefix:
+            n = root_arity(trial, limit)
+            if n is not None:
+                parts = self.pool(workers).call(
+                    'exact_ratio', [(world, None, limit, (v,))
+                                    for v in xrange(n)])
+                return sum(parts[1:], parts[0])
+        return enumerate_coins(trial, prefix, limit)
+
+    def compute_exact_advantage(self, workers=None, limit=LIMIT):
+        """
+        Computes the advantage exactly, see :meth:`exact_ratio`.
+
+        :param workers: Number of worker processes to enumerate on.
+        :param limit: Maximum number of coin sequences to enumerate per
+                      world, or None for no limit.
+        :return: The advantage as a Fraction.
+        """
+        return self.advantage([self.exact_ratio(w, workers, limit)
+                               for w in self.worlds])
@@ -8,6 +8,8 @@ class BINDSim(BaseSim):
     game with an Adversary and allows you to compute an approximate advantage.
     """
 
+    trials = 10
+
     def run(self):
         """
         Runs the game with the adversary provided to the constructor.
@@ -17,28 +19,25 @@ class BINDSim(BaseSim):
         self.game.initialize()
         return self.game.finalize(self.adversary(self.game.pi))
 
-    def compute_success_ratio(self):
+    def compute_success_ratio(self, trials=10, workers=None, seed=None):
         """
         Runs the game 10 times and computes the ratio of successful runs
         over total runs. This is fewer runs than usual because RSA math is
         expensive/slow.
 
+        :param trials: Number of runs.
+        :param workers: Number of worker processes to run on.
+        :param seed: Seed that makes the run reproducible.
         :return: successes / total_runs
         """
-        results = []
-        for i in xrange(0, 10):
-            results += [self.run()]
-
-        successes = float(results.count(True))
-        failures = float(results.count(False))
-
-        return successes / (successes + failures)
+        return self.success_ratio(None, trials, workers, seed)
 
-    def compute_advantage(self):
+    def compute_advantage(self, trials=None, **kwargs):
         """
         Adv = Pr[Bind => true]
 
+        Accepts the options of :meth:`BaseSim.compute_advantage`.
+
         :return: Approximate advantage computed using the above equation.
         """
-
-        return self.compute_success_ratio()
\ No newline at end of file
+        return super(BINDSim, self).compute_advantage(trials, **kwargs)
@@ -0,0 +1,312 @@
+import dis
+import hashlib
+import inspect
+import json
+import os
+import types
+
+from crypto.simulator.stats import Estimate
+
+# Values nested deeper than this are fingerprinted by their type only.
+MAX_DEPTH = 32
+
+_SCALARS = (type(None), bool, int, long, float, complex, str, unicode)
+
+_CODE = (types.FunctionType, types.MethodType, types.BuiltinFunctionType,
+         type, types.ClassType, types.ModuleType)
+
+
+def fingerprint(*objects):
+    """
+    Hashes what the results of running ``objects`` depend on. Functions
+    count by their code: the byte code, constants, defaults, the values in
+    their closures and the globals they refer to, recursively, but not line
+    numbers, so editing a scheme or adversary changes the fingerprint while
+    moving it around a file does not. Of those globals, functions, classes,
+    modules and constants count by their value, while lists, dicts and
+    other objects count by their type only: a module may change them as it
+    runs, and the fingerprint must not change with it. For the same reason
+    globals that a function of their module rebinds with a ``global``
+    statement, like a lazily imported module or the last pid, count by their
+    name only. Classes count by
+    their name and the code of their methods, instances by their class, the
+    attributes named like parameters of their constructor and their
+    callable attributes, which leaves out the state games and ideal
+    primitives build up while they run.
+
+    :param objects: Schemes, adversaries, games, parameters...
+    :return: Hex digest.
+    """
+    h = hashlib.sha256()
+    _feed(h, objects, {}, 0)
+    return h.hexdigest()
+
+
+def _feed(h, obj, seen, depth):
+    h.update(type(obj).__name__ + ':')
+    if isinstance(obj, _SCALARS):
+        h.update(repr(obj) + ';')
+        return
+    if depth > MAX_DEPTH or id(obj) in seen:
+        h.update(';')
+        return
+    # Holding on to obj keeps its id from being reused by a temporary.
+    seen[id(obj)] = obj
+    depth += 1
+    if isinstance(obj, (list, tuple)):
+        h.update('%d;' % len(obj))
+        for value in obj:
+            _feed(h, value, seen, depth)
+    elif isinstance(obj, (set, frozenset)):
+        h.update('%d;' % len(obj))
+        for value in sorted(obj, key=repr):
+            _feed(h, value, seen, depth)
+    elif isinstance(obj, dict):
+        h.update('%d;' % len(obj))
+        for key in sorted(obj, key=repr):
+            _feed(h, key, seen, depth)
+            _feed(h, obj[key], seen, depth)
+    elif isinstance(obj, types.CodeType):
+        h.update('%d,%d,%s;' % (obj.co_argcount, obj.co_flags, obj.co_code))
+        _feed(h, obj.co_consts, seen, depth)
+        _feed(h, obj.co_names, seen, depth)
+        _feed(h, obj.co_varnames, seen, depth)
+    elif isinstance(obj, types.FunctionType):
+        code = obj.func_code
+        _feed(h, code, seen, depth)
+        _feed(h, obj.func_defaults, seen, depth)
+        _feed(h, [c.cell_contents for c in obj.func_closure or ()], seen,
+              depth)
+        # Worked out once per module and fingerprint, under a key no id
+        # can equal.
+        module = ('globals', id(obj.func_globals))
+        if module not in seen:
+            seen[module] = _rebound_globals(obj.func_globals)
+        rebound = seen[module]
+        for name in _global_names(code):
+            if name in obj.func_globals:
+                value = obj.func_globals[name]
+                _feed(h, name, seen, depth)
+                if name in rebound:
+                    h.update('global;')
+                elif _immutable(value):
+                    _feed(h, value, seen, depth)
+                else:
+                    h.update(type(value).__name__ + ';')
+    elif isinstance(obj, types.MethodType):
+        _feed(h, obj.im_func, seen, depth)
+        _feed(h, obj.im_self, seen, depth)
+    elif isinstance(obj, types.BuiltinFunctionType):
+        h.update('%s.%s;' % (getattr(obj, '__module__', None), obj.__name__))
+        if not isinstance(obj.__self__, (type(None), types.ModuleType)):
+            _feed(h, obj.__self__, seen, depth)
+    elif isinstance(obj, (staticmethod, classmethod)):
+        _feed(h, obj.__func__, seen, depth)
+    elif isinstance(obj, property):
+        _feed(h, (obj.fget, obj.fset, obj.fdel), seen, depth)
+    elif isinstance(obj, types.ModuleType):
+        h.update(obj.__name__ + ';')
+    elif isinstance(obj, (type, types.ClassType)):
+        h.update('%s.%s;' % (obj.__module__, obj.__name__))
+        for klass in inspect.getmro(obj):
+            if klass.__module__ != '__builtin__':
+                _feed(h, dict((k, v) for k, v in vars(klass).iteritems()
+                              if not k.startswith('__') or k == '__init__'),
+                      seen, depth)
+    else:
+        klass = getattr(obj, '__class__', type(obj))
+        _feed(h, klass, seen, depth)
+        attrs = getattr(obj, '__dict__', {})
+        params = set(_parameters(klass))
+        _feed(h, dict((k, v) for k, v in attrs.iteritems()
+                      if k in params or callable(v)), seen, depth)
+
+
+def _immutable(obj):
+    """
+    :return: Whether ``obj`` is code or a constant, as opposed to data a
+             module may change.
+    """
+    if isinstance(obj, _SCALARS + _CODE):
+        return True
+    if isinstance(obj, (tuple, frozenset)):
+        return all(_immutable(value) for value in obj)
+    return False
+
+
+def _global_names(code):
+    """
+    :return: Names ``code`` and the code nested in it look up.
+    """
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names.update(_global_names(const))
+    return sorted(names)
+
+
+def _stored_globals(code):
+    """
+    :return: Set of the names ``code`` and the code nested in it assign or
+             delete with a ``global`` statement.
+    """
+    names = set()
+    ops = map(ord, code.co_code)
+    i, extended = 0, 0
+    while i < len(ops):
+        op = ops[i]
+        if op < dis.HAVE_ARGUMENT:
+            i += 1
+            continue
+        arg = ops[i + 1] + ops[i + 2] * 256 + extended
+        extended = arg * 65536 if op == dis.EXTENDED_ARG else 0
+        if op in (dis.opmap['STORE_GLOBAL'], dis.opmap['DELETE_GLOBAL']):
+            names.add(code.co_names[arg])
+        i += 3
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names.update(_stored_globals(const))
+    return names
+
+
+def _rebound_globals(module_globals):
+    """
+    :return: Set of the globals that the functions and methods defined in
+             the module with globals ``module_globals`` rebind as they run.
+    """
+    names = set()
+    for value in module_globals.values():
+        functions = [value]
+        if isinstance(value, (type, types.ClassType)):
+            functions = [getattr(v, '__func__', v)
+                         for v in vars(value).values()]
+        for f in functions:
+            if isinstance(f, types.FunctionType) and \
+                    f.func_globals is module_globals:
+                names.update(_stored_globals(f.func_code))
+    return names
+
+
+def _parameters(klass):
+    """
+    :return: Names of the parameters of the constructor of ``klass``.
+    """
+    try:
+        return inspect.getargspec(klass.__init__).args
+    except (TypeError, AttributeError):
+        return []
+
+
+class ResultCache(object):
+    """
+    Content addressed store of advantage estimates on local disk. A
+    simulator given a cache looks up every seeded ``compute_advantage``
+    call under a fingerprint of the simulator class, the game (its class,
+    parameters and scheme), the adversary, the resource limits of its
+    trials, the seed and the other arguments that change the result, and
+    returns the stored estimate instead of running the trials again.
+    Editing any of that code gives a new key, so stale results are not
+    returned, except after editing module level data the code reads (see
+    :func:`fingerprint`); clear the cache then. Unseeded runs and runs with
+    a time budget depend on chance and are never cached.
+
+    Each estimate is a small JSON file named by its key. When the files
+    take up more than ``max_bytes``, the least recently used ones are
+    removed.
+
+    Example Usage::
+
+        sim = WorldSim(GamePRF(prf, 16, 16), adversary,
+                       cache=ResultCache('.sim-cache'))
+        print sim.compute_advantage(10 ** 6, seed=1)  # runs the trials
+        print sim.compute_advantage(10 ** 6, seed=1)  # returns at once
+    """
+
+    def __init__(self, directory, max_bytes=1 << 26):
+        """
+        :param directory: Directory to keep the results in, created if
+                          needed.
+        :param max_bytes: Size the results may take up on disk.
+        """
+        self.directory, self.max_bytes = directory, max_bytes
+        self.hits = self.misses = 0
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def key(self, sim, options):
+        """
+        :param sim: The simulator.
+        :param options: Dict of the arguments of the run that change its
+                        result.
+        :return: Key of the run's result.
+        """
+        return fingerprint(sim.__class__, sim.worlds, sim.game, sim.adversary,
+                           sim.proposals, sim.limits, options)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def get(self, key):
+        """
+        :return: The :class:`Estimate` stored under ``key``, or None.
+        """
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                d = json.load(f)
+        except (IOError, ValueError):
+            self.misses += 1
+            return None
+        os.utime(path, None)
+        self.hits += 1
+        return Estimate(d['value'], d['low'], d['high'], d['trials'],
+                        d['confidence'], d['ratios'], d['stderr'],
+                        d['violations'], d['resources'])
+
+    def put(self, key, e):
+        """
+        Stores the estimate ``e`` under ``key`` and evicts old results if
+        the cache has grown too large.
+        """
+        d = {'value': float(e), 'low': e.low, 'high': e.high,
+             'trials': e.trials, 'confidence': e.confidence,
+             'ratios': e.ratios, 'stderr': e.stderr,
+             'violations': e.violations, 'resources': e.resources}
+        path = self._path(key)
+        tmp = '%s.%d.tmp' % (path, os.getpid())
+        with open(tmp, 'w') as f:
+            json.dump(d, f)
+        os.rename(tmp, path)
+        self.evict()
+
+    def evict(self):
+        """
+        Removes the least recently used results until the cache fits in
+        ``max_bytes``.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        """
+        Removes every stored result.
+        """
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                os.remove(os.path.join(self.directory, name))
@@ -7,6 +7,8 @@ class CCASim(BaseSim):
     game with an Adversary and allows you to compute an approximate advantage.
     """
 
+    worlds = (0, 1)
+
     def run(self, b):
         """
         Runs the game in a specific world.
@@ -17,26 +19,24 @@ class CCASim(BaseSim):
         self.game.initialize(b)
         return self.game.finalize(self.adversary(self.game.lr, self.game.dec))
 
-    def compute_success_ratio(self, b):
+    def compute_success_ratio(self, b, trials=1000, workers=None, seed=None):
         """
         Tries game in world and computes the ratio of success / total runs.
 
         :param world: Which world to compute for.
+        :param trials: Number of runs.
+        :param workers: Number of worker processes to run on.
+        :param seed: Seed that makes the run reproducible.
         :return: successes / total_runs
         """
-        results = []
-        for i in xrange(0, 1000):
-            results += [self.run(b)]
-
-        successes = results.count(True)
-        failures = results.count(False)
-        return successes/(successes + failures)
+        return self.success_ratio(b, trials, workers, seed)
 
-    def compute_advantage(self):
+    def compute_advantage(self, trials=None, **kwargs):
         """
         Adv = Pr[Right => 1] - Pr[Left => 1]
 
+        Accepts the options of :meth:`BaseSim.compute_advantage`.
+
         :return: Approximate advantage computed using the above equation.
         """
-
-        return self.compute_success_ratio(1) - (1 - self.compute_success_ratio(0))
+        return super(CCASim, self).compute_advantage(trials, **kwargs)
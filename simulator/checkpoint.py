@@ -0,0 +1,107 @@
+import json
+import os
+
+from crypto.simulator.accumulator import Accumulator
+
+
+class Checkpoint(object):
+    """
+    On disk state of a seeded fixed trial run. Every shard of such a run
+    draws from its own stream derived from the run seed, so the seed and the
+    set of finished shards pin down the position of every random stream;
+    together with the merged accumulators that is all a run needs to resume
+    and end with the same counts as if it had never stopped.
+
+    A run can also be one node's part of a larger run (see
+    ``BaseSim.run_shard``); its finished checkpoint is then the node's result
+    file.
+
+    The file is a small JSON document written atomically, so a run killed
+    while saving leaves the previous checkpoint intact.
+    """
+
+    def __init__(self, path, run):
+        """
+        :param path: File the checkpoint is stored in.
+        :param run: Dict describing the run: ``seed``, ``worlds``, ``trials``
+                    and ``shards`` (per world), ``node`` (``[index, count]``)
+                    and ``sim_worlds`` (the simulator's own worlds).
+        """
+        self.path, self.run = path, run
+        self.done = set()
+        self.accs = [Accumulator() for w in run['worlds']]
+
+    @property
+    def seed(self):
+        """
+        :return: Seed of the run.
+        """
+        return self.run['seed']
+
+    @property
+    def complete(self):
+        """
+        :return: True once every shard of the run (or node) has finished.
+        """
+        index, count = self.run['node']
+        return len(self.done) == sum(len(xrange(index, n, count))
+                                     for n in self.run['shards'])
+
+    @classmethod
+    def load(cls, path):
+        """
+        :param path: File a checkpoint was saved to.
+        :return: The :class:`Checkpoint` stored there.
+        """
+        with open(path) as f:
+            d = json.load(f)
+        c = cls(path, d['run'])
+        c.done = set(tuple(s) for s in d['done'])
+        c.accs = [Accumulator.from_dict(a) for a in d['accs']]
+        return c
+
+    @classmethod
+    def open(cls, path, run):
+        """
+        Loads the checkpoint at ``path`` if there is one, and starts a new one
+        otherwise.
+
+        :param run: Dict describing the run, see :meth:`__init__`. Its seed
+                    may be None if the checkpoint exists, to take the seed
+                    stored in it.
+        :return: A :class:`Checkpoint`.
+        """
+        if not os.path.exists(path):
+            if run['seed'] is None:
+                raise ValueError("A new checkpoint needs a seed.")
+            return cls(path, run)
+
+        c = cls.load(path)
+        if run['seed'] is None:
+            run = dict(run, seed=c.seed)
+        if c.run != run:
+            raise ValueError("Checkpoint " + path + " belongs to a different "
+                             "run.")
+        return c
+
+    def record(self, world, shard, acc):
+        """
+        Merges the result of a finished shard.
+
+        :param world: Index of the shard's world in ``self.worlds``.
+        :param shard: Index of the shard within its world.
+        :param acc: :class:`Accumulator` of the shard.
+        """
+        self.accs[world].merge(acc)
+        self.done.add((world, shard))
+
+    def save(self):
+        """
+        Writes the checkpoint to disk.
+        """
+        d = {'run': self.run, 'done': sorted(self.done),
+             'accs': [acc.to_dict() for acc in self.accs]}
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(d, f, separators=(',', ':'))
+        os.rename(tmp, self.path)
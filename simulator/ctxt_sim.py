@@ -16,26 +16,24 @@ class CTXTSim(BaseSim):
         self.adversary(self.game.enc, self.game.dec)
         return self.game.finalize()
 
-    def compute_success_ratio(self):
+    def compute_success_ratio(self, trials=1000, workers=None, seed=None):
         """
         Runs the game 1000 times and computes the ratio of successful runs
         over total runs.
 
+        :param trials: Number of runs.
+        :param workers: Number of worker processes to run on.
+        :param seed: Seed that makes the run reproducible.
         :return: successes / total_runs
         """
-        results = []
-        for i in xrange(0, 1000):
-            results += [self.run()]
+        return self.success_ratio(None, trials, workers, seed)
 
-        successes = float(results.count(True))
-        failures = float(results.count(False))
-        return successes / (successes + failures)
-
-    def compute_advantage(self):
+    def compute_advantage(self, trials=None, **kwargs):
         """
         Adv = Pr[UFCMA => True]
 
+        Accepts the options of :meth:`BaseSim.compute_advantage`.
+
         :return: Approximate advantage computed using the above equation.
         """
-
-        return self.compute_success_ratio()
\ No newline at end of file
+        return super(CTXTSim, self).compute_advantage(trials, **kwargs)
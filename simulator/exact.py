@@ -0,0 +1,178 @@
+import random
+
+#: Functions of ``random`` that are replaced while enumerating. The games,
+#: ``random_string`` and the ideal primitives only use the first few; the
+#: others cannot be enumerated and raise if called.
+_ENUMERABLE = ('randrange', 'randint', 'choice', 'getrandbits')
+_REFUSED = ('random', 'uniform', 'shuffle', 'sample', 'gauss')
+
+#: Default maximum number of coin sequences to enumerate, a few seconds to
+#: a minute of trials.
+LIMIT = 2 ** 20
+
+
+class CoinTree(object):
+    """
+    Depth first walk over every sequence of coins a trial can draw from
+    ``random``. Each run of the trial follows one path; after it the walk
+    moves to the next path by incrementing the last choice that still has
+    siblings, so every leaf is visited exactly once and the trial must be
+    deterministic given its coins.
+    """
+
+    def __init__(self, prefix=(), max_depth=4096):
+        """
+        :param prefix: Choices of the first draws, fixed for the whole walk.
+                       Used to split the tree between processes.
+        :param max_depth: Maximum number of draws in one trial. Trials that
+                          draw more (e.g. rejection sampling that keeps
+                          failing) cannot be enumerated.
+        """
+        self.fixed = len(prefix)
+        self.path = [[v, None] for v in prefix]
+        self.pos = 0
+        self.max_depth = max_depth
+
+    def draw(self, n):
+        """
+        :param n: Number of equally likely values of the draw.
+        :return: Index of the value taken on the current path.
+        """
+        if self.pos < len(self.path):
+            entry = self.path[self.pos]
+            if entry[1] is None:
+                entry[1] = n
+            elif entry[1] != n:
+                raise ValueError("Trial is not deterministic given its "
+                                 "coins, it cannot be enumerated.")
+        else:
+            if self.pos >= self.max_depth:
+                raise ValueError("Trial draws more than " +
+                                 str(self.max_depth) + " coins.")
+            entry = [0, n]
+            self.path.append(entry)
+        self.pos += 1
+        return entry[0]
+
+    def denominator(self):
+        """
+        :return: Inverse of the probability of the current path.
+        """
+        d = 1
+        for v, n in self.path[:self.pos]:
+            d *= n
+        return d
+
+    def size(self):
+        """
+        :return: Number of paths under the prefix if every path drew as
+                 many values as the current one.
+        """
+        d = 1
+        for v, n in self.path[self.fixed:self.pos]:
+            d *= n
+        return d
+
+    def advance(self):
+        """
+        Moves to the next path.
+
+        :return: False once every path under the prefix has been visited.
+        """
+        del self.path[self.pos:]
+        while len(self.path) > self.fixed:
+            entry = self.path[-1]
+            if entry[0] + 1 < entry[1]:
+                entry[0] += 1
+                return True
+            self.path.pop()
+        return False
+
+    def randrange(self, start, stop=None, step=1):
+        if stop is None:
+            start, stop = 0, start
+        r = xrange(start, stop, step)
+        return r[self.draw(len(r))]
+
+    def randint(self, a, b):
+        return self.randrange(a, b + 1)
+
+    def choice(self, seq):
+        return seq[self.draw(len(seq))]
+
+    def getrandbits(self, k):
+        return self.draw(2 ** k)
+
+    def refuse(self, *args, **kwargs):
+        raise ValueError("Only discrete draws from random can be enumerated.")
+
+    def __enter__(self):
+        self.saved = dict((name, getattr(random, name))
+                          for name in _ENUMERABLE + _REFUSED)
+        for name in _ENUMERABLE:
+            setattr(random, name, getattr(self, name))
+        for name in _REFUSED:
+            setattr(random, name, self.refuse)
+        return self
+
+    def __exit__(self, *exc):
+        for name, f in self.saved.items():
+            setattr(random, name, f)
+
+
+def enumerate_coins(trial, prefix=(), limit=LIMIT):
+    """
+    Computes the exact probability that ``trial`` returns a true value when
+    every draw it makes from ``random`` is uniform.
+
+    :param trial: Callable without arguments running one trial.
+    :param prefix: Fixed choices of the first draws, see :class:`CoinTree`.
+    :param limit: Maximum number of coin sequences to visit, or None for no
+                  limit. A trial whose first sequence already implies more
+                  is refused before enumerating, see :func:`check_size`.
+    :return: The probability (restricted to the prefix) as a Fraction.
+    """
+    # fractions pulls in decimal, which is slow to import.
+    from fractions import Fraction
+    wins = {}
+    leaves = 0
+    with CoinTree(prefix) as tree:
+        while True:
+            tree.pos = 0
+            if trial():
+                d = tree.denominator()
+                wins[d] = wins.get(d, 0) + 1
+            leaves += 1
+            if leaves == 1:
+                check_size(tree.size(), limit)
+            if not tree.advance():
+                break
+            if limit is not None and leaves >= limit:
+                raise ValueError("More than " + str(limit) + " coin "
+                                 "sequences to enumerate.")
+    return sum((Fraction(w, d) for d, w in wins.items()), Fraction(0))
+
+
+def check_size(size, limit):
+    """
+    Raises if a tree of ``size`` coin sequences is over ``limit``.
+    """
+    if limit is not None and size > limit:
+        raise ValueError("About " + str(size) + " coin sequences to "
+                         "enumerate, more than the limit of " + str(limit) +
+                         ". Use smaller parameters or raise the limit.")
+
+
+def root_arity(trial, limit=LIMIT):
+    """
+    Runs ``trial`` once to find out how many values its first draw has, and
+    checks that enumerating it fits in ``limit``, see :func:`check_size`.
+
+    :return: The number of values, or None if the trial draws no coins.
+    """
+    with CoinTree() as tree:
+        trial()
+    if not tree.path:
+        return None
+    check_size(tree.size(), limit)
+    return tree.path[0][1]
@@ -0,0 +1,97 @@
+import random
+
+
+class Proposal(object):
+    r"""
+    A biased sampler for part of the coins of a trial, used for importance
+    sampling. Calling a proposal draws a value from the biased distribution
+    ``q`` and multiplies the likelihood ratio of the current trial by
+    ``p(x) / q(x)``, where ``p`` is the distribution the game would normally
+    use. Proposals are plugged in wherever the game or the adversary samples,
+    e.g. as the ``key_gen`` of GameCR or GameUFCMA, and passed to
+    ``compute_advantage(proposals=...)`` so the simulator can weight every
+    trial by its likelihood ratio.
+
+    As long as ``q(x) > 0`` wherever ``p(x) > 0`` the weighted estimate is
+    unbiased; it has low variance when ``q`` puts its mass on the coins that
+    make the adversary win.
+
+    Example Usage:
+
+    .. testcode::
+
+        from crypto.games.game_cr import GameCR
+        from crypto.simulator.cr_sim import CRSim
+        from crypto.simulator.importance import restricted_strings
+
+        # The hash collides on every message only under the all zero key.
+        h = lambda k, m: "" if k == "\x00\x00" else m
+        keys = restricted_strings(2, "\x00\x01")
+        sim = CRSim(GameCR(h, 2, key_gen=keys), lambda k: ("a", "b"))
+
+        e = sim.compute_advantage(proposals=[keys])
+        print abs(e * 2 ** 16 - 1) < 0.3, e.relative_error < 0.1
+
+    .. testoutput::
+
+        True True
+    """
+
+    def __init__(self, sample, weight):
+        """
+        :param sample: Callable drawing a value from the biased distribution.
+                       It is called with the arguments the proposal is
+                       called with.
+        :param weight: Callable returning the likelihood ratio
+                       ``p(x) / q(x)`` of a value ``x`` drawn by ``sample``.
+        """
+        self.sample, self.weight = sample, weight
+        self.ratio = 1.0
+
+    def __call__(self, *args):
+        x = self.sample(*args)
+        self.ratio *= self.weight(x)
+        return x
+
+    def reset(self):
+        """
+        Starts a new trial. Called by the simulator before every trial.
+        """
+        self.ratio = 1.0
+
+
+def restricted_strings(length, alphabet, uniform=0.1):
+    """
+    Proposal for random strings of ``length`` bytes whose bytes are drawn
+    mostly from ``alphabet`` instead of all 256 values. Useful to concentrate
+    keys or messages on a small set where rare events are likely.
+
+    With probability ``uniform`` the string is drawn uniformly from all
+    strings instead (a defensive mixture), so that every string keeps a
+    positive probability and the estimate stays unbiased even when the
+    adversary can also win on strings outside the alphabet. The likelihood
+    ratio of a string ``x`` is ``p / (uniform * p + (1 - uniform) * q)``,
+    ``p`` and ``q`` being its probabilities under the uniform and the
+    restricted distribution.
+
+    :param length: Length of the strings in bytes.
+    :param alphabet: String of the byte values to favour.
+    :param uniform: Probability of drawing a uniform string. With 0 the
+                    estimate only counts wins on strings over the alphabet.
+    :return: A :class:`Proposal`.
+    """
+    allowed = frozenset(alphabet)
+    # q / p of a string over the alphabet, as in the docstring.
+    odds = (256.0 / len(allowed)) ** length
+
+    def sample():
+        if random.random() < uniform:
+            return ''.join(chr(random.randrange(256)) for _ in xrange(length))
+        return ''.join(random.choice(alphabet) for _ in xrange(length))
+
+    def weight(x):
+        if all(c in allowed for c in x):
+            return 1 / (uniform + (1 - uniform) * odds)
+        return 1 / uniform
+
+    return Proposal(sample, weight)
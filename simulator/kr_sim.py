@@ -17,28 +17,24 @@ class KRSim(BaseSim):
         self.game.initialize()
         return self.game.finalize(self.adversary(self.game.fn))
 
-    def compute_success_ratio(self, trials=1000):
+    def compute_success_ratio(self, trials=1000, workers=None, seed=None):
         """
         Runs the game 1000 times and computes the ratio of successful runs
         over total runs.
 
+        :param trials: Number of runs.
+        :param workers: Number of worker processes to run on.
+        :param seed: Seed that makes the run reproducible.
         :return: successes / total_runs
         """
+        return self.success_ratio(None, trials, workers, seed)
 
-        results = []
-        for i in xrange(0, trials):
-            results += [self.run()]
-
-        successes = float(results.count(True))
-        failures = float(results.count(False))
-
-        return successes / (successes + failures)
-
-    def compute_advantage(self, trials=1000):
+    def compute_advantage(self, trials=None, **kwargs):
         """
         Adv = Pr[KR => true]
 
+        Accepts the options of :meth:`BaseSim.compute_advantage`.
+
         :return: Approximate advantage computed using the above equation.
         """
-
-        return self.compute_success_ratio(trials)
+        return super(KRSim, self).compute_advantage(trials, **kwargs)
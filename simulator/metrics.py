@@ -0,0 +1,230 @@
+import os
+import threading
+import time
+
+from crypto.ideal import tables
+from crypto.simulator.accumulator import Accumulator
+
+
+class Metrics(object):
+    """
+    Live progress of a simulator's runs. While ``compute_advantage`` (or
+    any other run of the engine) is going, the metrics are refreshed every
+    ``interval`` seconds with the trials completed per world, the
+    throughput, the current estimate and its interval, the shards done and
+    in flight, and the size of the ideal primitives' tables. They are
+    written to ``path`` in the Prometheus text format (ready for the node
+    exporter's textfile collector) and/or passed to ``callback`` as a dict.
+
+    The engine only looks at the clock once per finished shard, so the
+    trials themselves run at full speed, and the shards are the same as
+    without metrics. Every shard comes back with the status of the worker
+    that ran it (see :func:`worker_status`): the trials and shards of every
+    worker are reported, and the table sizes are those of the worker
+    processes rather than of this one.
+
+    Example Usage::
+
+        sim = WorldSim(game, adversary,
+                       metrics=Metrics('/var/lib/node_exporter/sim.prom'))
+        sim.compute_advantage(10 ** 7, workers=8)
+    """
+
+    def __init__(self, path=None, callback=None, interval=10, labels=None):
+        """
+        :param path: File to write the metrics to, atomically.
+        :param callback: Callable given the metrics as a dict.
+        :param interval: Seconds between two refreshes.
+        :param labels: Dict of labels added to every exported metric, e.g.
+                       to tell the experiments of a job matrix apart.
+        """
+        self.path, self.callback = path, callback
+        self.interval = interval
+        self.labels = labels or {}
+        self.begin(None)
+
+    def begin(self, worlds, confidence=0.95, bound='wilson'):
+        """
+        Starts reporting a new run. Called by the simulator.
+
+        :param worlds: Worlds of the run.
+        :param confidence: Confidence level of the reported interval.
+        :param bound: Interval method of the reported interval.
+        """
+        self.worlds = worlds
+        self.confidence, self.bound = confidence, bound
+        self.start = self.last = time.time()
+        self.totals = None
+        self.current = None
+        self.shards = (0, 0)
+        self.workers = 0
+        self.worker_stats = {}
+        self.tables = {}
+
+    def progress(self, sim, worlds, accs, done, total, workers, status=None,
+                 trials=0):
+        """
+        Records the progress of one call of ``BaseSim.accumulate`` and
+        refreshes the metrics if they are due. Called by the simulator after
+        every shard.
+
+        :param sim: The simulator.
+        :param worlds: Worlds of ``accs``.
+        :param accs: Accumulators of the trials run so far by this call.
+        :param done: Number of shards finished.
+        :param total: Number of shards of this call.
+        :param workers: Number of workers running the shards.
+        :param status: :func:`worker_status` of the worker that ran the
+                       shard that just finished.
+        :param trials: Number of trials of that shard.
+        """
+        if self.worlds is None or list(worlds) != list(self.worlds):
+            self.begin(worlds, self.confidence, self.bound)
+        self.current, self.shards = accs, (done, total)
+        self.workers = workers or 1
+        if status is not None:
+            stats = self.worker_stats.setdefault(
+                status['worker'], {'shards': 0, 'trials': 0})
+            stats['shards'] += 1
+            stats['trials'] += trials
+            stats['last'] = status['time']
+            self.tables[status['pid']] = status['ideal_entries']
+        if time.time() - self.last >= self.interval:
+            self.emit(sim)
+
+    def commit(self, accs):
+        """
+        Adds the final results of a call of ``BaseSim.accumulate`` to the
+        run's totals.
+        """
+        if self.totals is None:
+            self.totals = [Accumulator() for acc in accs]
+        for total, acc in zip(self.totals, accs):
+            total.merge(acc)
+        self.current = None
+
+    def snapshot(self, sim):
+        """
+        :return: The current metrics as a dict.
+        """
+        accs = [Accumulator() for w in self.worlds or ()]
+        for part in (self.totals, self.current):
+            for acc, other in zip(accs, part or ()):
+                acc.merge(other)
+        elapsed = max(time.time() - self.start, 1e-9)
+        trials = sum(acc.trials for acc in accs)
+        metrics = {'trials': dict((str(w), acc.trials)
+                                  for w, acc in zip(self.worlds, accs)),
+                   'violations': sum(acc.violations for acc in accs),
+                   'trials_per_second': trials / elapsed,
+                   'elapsed': elapsed,
+                   'shards_done': self.shards[0],
+                   'shards_total': self.shards[1],
+                   'shards_running': min(self.workers,
+                                         self.shards[1] - self.shards[0]),
+                   'workers': self.workers,
+                   'worker_stats': dict((w, dict(stats)) for w, stats
+                                        in self.worker_stats.items()),
+                   'ideal_entries': {}}
+        if accs and all(acc.trials for acc in accs):
+            e = sim.estimate(accs, self.confidence, self.bound,
+                             worlds=self.worlds)
+            metrics.update(advantage=float(e), low=e.low, high=e.high)
+        for entries in self.tables.values():
+            for key, n in entries.items():
+                metrics['ideal_entries'][key] = \
+                    metrics['ideal_entries'].get(key, 0) + n
+        return metrics
+
+    def emit(self, sim):
+        """
+        Refreshes the metrics now.
+        """
+        self.last = time.time()
+        metrics = self.snapshot(sim)
+        if self.callback is not None:
+            self.callback(metrics)
+        if self.path is not None:
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w') as f:
+                f.write(prometheus(metrics, self.labels))
+            os.rename(tmp, self.path)
+
+
+def worker_status():
+    """
+    Status of the worker running this code, sent back with every shard of
+    a run with metrics.
+
+    :return: Dict with the name of the ``worker`` (process and thread), its
+             ``pid``, the ``time`` and the number of entries in every table
+             of the ideal primitives of its process (``ideal_entries``, by
+             primitive class and table name).
+    """
+    entries = {}
+    for p in tables.instances():
+        for name in p.stats_tables:
+            key = (p.__class__.__name__, name)
+            entries[key] = entries.get(key, 0) + len(getattr(p, name))
+    return {'worker': '%d/%s' % (os.getpid(),
+                                 threading.current_thread().name),
+            'pid': os.getpid(), 'time': time.time(),
+            'ideal_entries': entries}
+
+
+def _line(name, value, labels):
+    if labels:
+        name += '{' + ','.join('%s="%s"' % (k, str(v).replace('"', '\\"'))
+                               for k, v in sorted(labels.items())) + '}'
+    return '%s %r\n' % (name, float(value))
+
+
+def prometheus(metrics, labels=None):
+    """
+    Formats a :meth:`Metrics.snapshot` in the Prometheus text format.
+
+    :param metrics: Dict of metrics.
+    :param labels: Dict of labels added to every sample.
+    :return: The text.
+    """
+    labels = labels or {}
+    out = []
+
+    def metric(name, kind, help, samples):
+        out.append('# HELP crypto_sim_%s %s\n' % (name, help))
+        out.append('# TYPE crypto_sim_%s %s\n' % (name, kind))
+        for extra, value in samples:
+            out.append(_line('crypto_sim_' + name, value,
+                             dict(labels, **extra)))
+
+    metric('trials', 'counter', 'Trials completed.',
+           [({'world': w}, n) for w, n in sorted(metrics['trials'].items())])
+    metric('violations', 'counter', 'Trials that broke their limits.',
+           [({}, metrics['violations'])])
+    metric('trials_per_second', 'gauge', 'Trials completed per second.',
+           [({}, metrics['trials_per_second'])])
+    metric('elapsed_seconds', 'gauge', 'Time since the run started.',
+           [({}, metrics['elapsed'])])
+    metric('shards', 'gauge', 'Shards of the current batch by state.',
+           [({'state': 'done'}, metrics['shards_done']),
+            ({'state': 'running'}, metrics['shards_running']),
+            ({'state': 'total'}, metrics['shards_total'])])
+    metric('workers', 'gauge', 'Worker processes or threads.',
+           [({}, metrics['workers'])])
+    if 'advantage' in metrics:
+        metric('advantage', 'gauge', 'Current advantage estimate.',
+               [({'bound': 'estimate'}, metrics['advantage']),
+                ({'bound': 'low'}, metrics['low']),
+                ({'bound': 'high'}, metrics['high'])])
+    metric('worker_trials', 'counter', 'Trials completed by every worker.',
+           [({'worker': w}, stats['trials'])
+            for w, stats in sorted(metrics['worker_stats'].items())])
+    metric('worker_shards', 'counter', 'Shards completed by every worker.',
+           [({'worker': w}, stats['shards'])
+            for w, stats in sorted(metrics['worker_stats'].items())])
+    metric('ideal_entries', 'gauge',
+           'Entries in the tables of ideal primitives of the processes '
+           'running trials.',
+           [({'type': t, 'table': name}, n) for (t, name), n
+            in sorted(metrics['ideal_entries'].items())])
+    return ''.join(out)
@@ -0,0 +1,84 @@
+import multiprocessing
+
+# Simulators registered here before a pool is forked. Worker processes
+# inherit this table by memory, which is what lets them run games,
+# schemes and adversaries that cannot be pickled (closures, lambdas).
+_sims = {}
+
+
+def _call(job):
+    """
+    Entry point executed inside a worker process.
+
+    :param job: ``(key, name, index, args)`` tuple: calls method ``name``
+                of the simulator registered under ``key`` with ``args``.
+    :return: ``(index, result)`` where result is what the method returns.
+    """
+    key, name, index, args = job
+    return index, getattr(_sims[key], name)(*args)
+
+
+class TrialPool(object):
+    """
+    A persistent pool of forked worker processes bound to one simulator.
+
+    The simulator is registered before the workers are forked, so each
+    worker holds its own copy of the game and the adversary and only shard
+    descriptions and accumulators cross the process boundary. The pool is
+    kept alive between calls so the cost of forking is paid once; call
+    :meth:`close` (or :meth:`BaseSim.close`) to release the workers.
+    """
+
+    def __init__(self, sim, workers):
+        """
+        :param sim: Simulator whose trials the workers will run.
+        :param workers: Number of worker processes to fork.
+        """
+        self.key = id(sim)
+        self.workers = workers
+        self.game, self.adversary = sim.game, sim.adversary
+        self.proposals = sim.proposals
+        _sims[self.key] = sim
+        self._pool = multiprocessing.Pool(workers)
+
+    def serves(self, sim, workers):
+        """
+        :return: True if this pool was forked from ``sim`` in its current
+                 state and has ``workers`` workers, False otherwise.
+        """
+        return (self.key == id(sim) and self.workers == workers and
+                self.game is sim.game and self.adversary is sim.adversary and
+                self.proposals == sim.proposals)
+
+    def imap(self, name, arglist):
+        """
+        Calls a method of the simulator on the workers, once per entry of
+        ``arglist``, and yields the results as they complete.
+
+        :param name: Name of the simulator method.
+        :param arglist: List of argument tuples.
+        :return: Iterator of ``(index, result)`` tuples, where index is the
+                 position of the arguments in ``arglist``.
+        """
+        return self._pool.imap_unordered(
+            _call, [(self.key, name, i, tuple(args))
+                    for i, args in enumerate(arglist)], chunksize=1)
+
+    def call(self, name, arglist):
+        """
+        Like :meth:`imap` but waits for all calls to finish.
+
+        :return: List of results, in the same order as ``arglist``.
+        """
+        results = [None] * len(arglist)
+        for i, result in self.imap(name, arglist):
+            results[i] = result
+        return results
+
+    def close(self):
+        """
+        Shuts down the worker processes.
+        """
+        self._pool.close()
+        self._pool.join()
+        _sims.pop(self.key, None)
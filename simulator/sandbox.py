@@ -0,0 +1,249 @@
+import cPickle
+import errno
+import os
+import random
+import resource
+import select
+import signal
+import struct
+import time
+
+#: Outcome of a trial that broke one of its :class:`Limits`. It is neither a
+#: success nor a failure: simulators count it apart from the other trials.
+VIOLATION = 'violation'
+
+_OUTCOME = struct.Struct('>cdd')
+_LENGTH = struct.Struct('>I')
+
+
+class Limits(object):
+    """
+    Resource limits for the trials of a simulator. When a simulator is given
+    limits, its trials run in forked child processes: a trial that uses too
+    much CPU time, wall clock time or memory is stopped and recorded as a
+    :data:`VIOLATION` while the run goes on, instead of stalling the run or
+    getting the machine out of memory.
+
+    Forking for every trial would dominate the cost of cheap trials, so one
+    child is kept running and is sent batches of trials, and the limits are
+    enforced per trial inside it. After a violation the child is killed and
+    a new one takes over the rest of the batch. Every batch seeds
+    ``random`` from the parent's stream, so a seeded run stays
+    reproducible.
+
+    Example Usage::
+
+        sim = WorldSim(game, adversary, limits=Limits(cpu=1, wall=5,
+                                                      memory=2 ** 30))
+        e = sim.compute_advantage()
+        print e, e.violations
+    """
+
+    def __init__(self, cpu=None, wall=None, memory=None, batch=100):
+        """
+        :param cpu: CPU seconds a trial may use, rounded up to whole seconds.
+        :param wall: Wall clock seconds a trial may take.
+        :param memory: Bytes of address space the child process running the
+                       trials may use.
+        :param batch: Maximum number of trials sent to the child at once.
+        """
+        self.cpu, self.wall, self.memory = cpu, wall, memory
+        self.batch = batch
+
+    def iter_trials(self, sim, world=None, trials=None):
+        """
+        Runs trials of ``sim`` in a child process under the limits.
+
+        :param sim: Simulator whose trials to run.
+        :param world: World to run in, as for ``BaseSim.trial``.
+        :param trials: Number of trials to run, unbounded if ``None``.
+        :return: Generator of ``(outcome, elapsed)`` tuples, where outcome is
+                 :data:`VIOLATION` for trials that broke a limit.
+        """
+        done = 0
+        while trials is None or done < trials:
+            n = self.batch
+            if trials is not None:
+                n = min(n, trials - done)
+            for result in self._run_batch(sim, world, n):
+                yield result
+                done += 1
+
+    def _run_batch(self, sim, world, n):
+        """
+        Has the child run up to ``n`` trials and yields their results until
+        they are all done or one breaks a limit.
+        """
+        child = self._child_for(sim)
+        seed = random.getrandbits(64)
+        command = cPickle.dumps((world, n, seed), 2)
+        _write(child.commands, _LENGTH.pack(len(command)) + command)
+        finished = False
+        try:
+            for i in xrange(n):
+                start = time.time()
+                record = child.read(_OUTCOME.size, self.wall)
+                if record is None:
+                    yield VIOLATION, time.time() - start
+                    return
+                kind, outcome, elapsed = _OUTCOME.unpack(record)
+                if kind == 'e':
+                    raise cPickle.loads(child.read(int(outcome), None))
+                if kind == 'v':
+                    yield VIOLATION, elapsed
+                    return
+                yield outcome, elapsed
+            finished = True
+        finally:
+            if not finished:
+                self.close()
+
+    def _child_for(self, sim):
+        """
+        :return: The child process serving ``sim``, forked if needed.
+        """
+        child = getattr(self, '_child', None)
+        if child is not None and not child.serves(sim):
+            self.close()
+            child = None
+        if child is None:
+            child = self._child = _Child(sim, self)
+        return child
+
+    def close(self):
+        """
+        Stops the child process, if one is running.
+        """
+        child = getattr(self, '_child', None)
+        self._child = None
+        if child is not None:
+            child.close()
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['_child'] = None
+        return state
+
+
+class _Child(object):
+    """
+    A forked process running trials of one simulator on demand. It reads
+    pickled ``(world, n, seed)`` commands, each preceded by its length, and
+    writes one fixed size record per trial.
+    """
+
+    def __init__(self, sim, limits):
+        self.pid = None
+        self.parent = os.getpid()
+        self.game, self.adversary = sim.game, sim.adversary
+        self.proposals = sim.proposals
+        r, self.commands = os.pipe()
+        self.results, w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(self.commands)
+            os.close(self.results)
+            _serve(sim, limits, os.fdopen(r, 'rb'), w)
+        os.close(r)
+        os.close(w)
+        self.pid = pid
+
+    def serves(self, sim):
+        """
+        :return: True if the child was forked by this process from ``sim`` in
+                 its current state.
+        """
+        return (self.parent == os.getpid() and self.game is sim.game and
+                self.adversary is sim.adversary and
+                self.proposals == sim.proposals)
+
+    def read(self, size, timeout):
+        """
+        :return: ``size`` bytes of results, or None if the child died or the
+                 timeout passed first.
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        data = ''
+        while len(data) < size:
+            wait = None if deadline is None else deadline - time.time()
+            if wait is not None and wait <= 0:
+                return None
+            try:
+                ready, _, _ = select.select([self.results], [], [], wait)
+            except select.error as e:
+                if e.args[0] == errno.EINTR:
+                    continue
+                raise
+            if not ready:
+                return None
+            chunk = os.read(self.results, size - len(data))
+            if not chunk:
+                return None
+            data += chunk
+        return data
+
+    def close(self):
+        os.close(self.commands)
+        os.close(self.results)
+        if self.parent != os.getpid():
+            return
+        try:
+            os.kill(self.pid, signal.SIGKILL)
+        except OSError:
+            pass
+        os.waitpid(self.pid, 0)
+
+
+def _serve(sim, limits, commands, w):
+    """
+    Body of the child process. Never returns.
+    """
+    code = 0
+    # The parent kills the child instead of letting it exit, so games that
+    # buffer what they write (``transcript.Recorded``) are flushed before
+    # the parent learns that a trial is over.
+    flush = getattr(sim.game, 'flush', None) or (lambda: None)
+    try:
+        if limits.memory is not None:
+            resource.setrlimit(resource.RLIMIT_AS,
+                               (limits.memory, limits.memory))
+        while True:
+            header = commands.read(_LENGTH.size)
+            if len(header) < _LENGTH.size:
+                return
+            world, n, seed = cPickle.loads(
+                commands.read(_LENGTH.unpack(header)[0]))
+            random.seed(seed)
+            for _ in xrange(n):
+                if limits.cpu is not None:
+                    usage = resource.getrusage(resource.RUSAGE_SELF)
+                    used = usage.ru_utime + usage.ru_stime
+                    soft = int(used + limits.cpu) + 1
+                    resource.setrlimit(resource.RLIMIT_CPU,
+                                       (soft, resource.RLIM_INFINITY))
+                start = time.time()
+                try:
+                    outcome = float(sim.trial(world))
+                except MemoryError:
+                    _write(w, _OUTCOME.pack('v', 0.0, time.time() - start))
+                    return
+                except Exception as e:
+                    try:
+                        data = cPickle.dumps(e, 2)
+                    except Exception:
+                        data = cPickle.dumps(RuntimeError(repr(e)), 2)
+                    flush()
+                    _write(w, _OUTCOME.pack('e', len(data), 0.0) + data)
+                    return
+                elapsed = time.time() - start
+                flush()
+                _write(w, _OUTCOME.pack('o', outcome, elapsed))
+    except BaseException:
+        code = 1
+    finally:
+        os._exit(code)
+
+
+def _write(fd, data):
+    while data:
+        data = data[os.write(fd, data):]
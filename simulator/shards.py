@@ -0,0 +1,92 @@
+"""
+Merges the result files of a run split over several machines with
+``BaseSim.run_shard``. A shared directory (or copying the files to one
+place) is all the coordination needed::
+
+    python -m crypto.simulator.shards merge results/
+
+prints the advantage, its confidence interval and the number of trials as
+JSON.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+
+from crypto.simulator.accumulator import Accumulator
+from crypto.simulator.base_sim import BaseSim
+from crypto.simulator.checkpoint import Checkpoint
+
+
+def result_files(paths):
+    """
+    :param paths: Result files and directories holding result files.
+    :return: List of result files, directories expanded to their ``*.json``.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(glob.glob(os.path.join(path, '*.json')))
+        else:
+            files.append(path)
+    return files
+
+
+def merge(paths, confidence=0.95, bound='wilson'):
+    """
+    Combines the result files of every node of a run.
+
+    :param paths: Result files, one per node.
+    :param confidence: Confidence level of the interval.
+    :param bound: Interval method, see ``stats.BOUNDS``.
+    :return: The advantage of the whole run, as an ``Estimate``.
+    """
+    parts = [Checkpoint.load(path) for path in paths]
+    if not parts:
+        raise ValueError("No result files to merge.")
+
+    run = dict(parts[0].run, node=None)
+    count = parts[0].run['node'][1]
+    for part in parts:
+        if dict(part.run, node=None) != run:
+            raise ValueError(part.path + " belongs to a different run.")
+        if not part.complete:
+            raise ValueError(part.path + " is not finished.")
+    indices = sorted(part.run['node'][0] for part in parts)
+    if indices != range(count):
+        raise ValueError("Expected one result file for each of " +
+                         str(count) + " nodes, got nodes " +
+                         ", ".join(map(str, indices)) + ".")
+
+    accs = [Accumulator() for w in run['worlds']]
+    for part in parts:
+        for acc, part_acc in zip(accs, part.accs):
+            acc.merge(part_acc)
+
+    sim = BaseSim(None, None)
+    sim.worlds = tuple(run['sim_worlds'])
+    return sim.estimate(accs, confidence, bound, worlds=run['worlds'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m crypto.simulator.shards',
+        description='Merge the result files of a sharded simulation.')
+    sub = parser.add_subparsers(dest='command')
+    m = sub.add_parser('merge', help='merge node result files')
+    m.add_argument('paths', nargs='+',
+                   help='result files or directories containing them')
+    m.add_argument('--confidence', type=float, default=0.95)
+    m.add_argument('--bound', default='wilson')
+    args = parser.parse_args(argv)
+
+    e = merge(result_files(args.paths), args.confidence, args.bound)
+    json.dump({'advantage': float(e), 'low': e.low, 'high': e.high,
+               'confidence': e.confidence, 'trials': e.trials,
+               'stderr': e.stderr, 'violations': e.violations}, sys.stdout)
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+import math
+
+
+class Estimate(float):
+    """
+    An advantage estimate. It behaves exactly like the float returned by
+    ``compute_advantage`` and additionally carries the confidence interval
+    and the amount of work behind the estimate.
+
+    Example Usage:
+
+    .. testcode::
+
+        from crypto.simulator.stats import Estimate
+
+        e = Estimate(0.5, 0.45, 0.55, 1000, 0.95)
+
+        print e + 0, e.half_width
+
+    .. testoutput::
+
+        0.5 0.05
+    """
+
+    def __new__(cls, value, low, high, trials, confidence, ratios=None,
+                stderr=None, violations=0, resources=None):
+        """
+        :param value: The estimated advantage.
+        :param low: Lower end of the confidence interval.
+        :param high: Upper end of the confidence interval.
+        :param trials: Number of trials run, over all worlds.
+        :param confidence: Confidence level of the interval, e.g. ``0.95``.
+        :param ratios: Per world success ratios behind the estimate.
+        :param stderr: Standard error of the estimate.
+        :param violations: Number of trials left out for breaking their
+                           resource limits.
+        :param resources: Average resource usage per trial, e.g. oracle
+                          queries, if the game was instrumented.
+        """
+        e = super(Estimate, cls).__new__(cls, value)
+        e.low, e.high = low, high
+        e.trials, e.confidence = trials, confidence
+        e.ratios, e.stderr = ratios, stderr
+        e.violations, e.resources = violations, resources
+        return e
+
+    @property
+    def half_width(self):
+        """
+        :return: Half the width of the confidence interval.
+        """
+        return (self.high - self.low) / 2.0
+
+    @property
+    def relative_error(self):
+        """
+        :return: Standard error divided by the estimate.
+        """
+        if not self:
+            return float('inf')
+        return self.stderr / abs(self)
+
+    def __reduce__(self):
+        return (Estimate, (float(self), self.low, self.high, self.trials,
+                           self.confidence, self.ratios, self.stderr,
+                           self.violations, self.resources))
+
+
+def normal_quantile(p):
+    """
+    Inverse of the standard normal CDF, computed by bisection on ``erfc``.
+
+    :param p: Probability strictly between 0 and 1.
+    :return: z such that Pr[N(0, 1) <= z] = p.
+    """
+    lo, hi = -40.0, 40.0
+    for _ in xrange(200):
+        mid = (lo + hi) / 2
+        if 0.5 * math.erfc(-mid / math.sqrt(2)) < p:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2
+
+
+def hoeffding(acc, delta):
+    """
+    Hoeffding interval for the mean of outcomes in [0, 1].
+
+    :param acc: :class:`Accumulator` summarizing the outcomes.
+    :param delta: Allowed probability of the interval missing.
+    :return: ``(low, high)``
+    """
+    p = acc.mean
+    h = math.sqrt(math.log(2 / delta) / (2 * acc.trials))
+    return max(0.0, p - h), min(1.0, p + h)
+
+
+def wilson(acc, delta):
+    """
+    Wilson score interval for the mean of outcomes in [0, 1]. The score
+    interval assumes the variance ``p (1 - p)`` of a coin flip, the largest
+    any outcomes in [0, 1] with mean ``p`` can have, so it also holds for
+    outcomes that are not 0 or 1, if conservatively. It is never narrowed
+    by the observed variance: that is 0 until a rare event first happens,
+    which would give an interval of zero width.
+
+    :param acc: :class:`Accumulator` summarizing the outcomes.
+    :param delta: Allowed probability of the interval missing.
+    :return: ``(low, high)``
+    """
+    p, n = acc.mean, acc.trials
+    z = normal_quantile(1 - delta / 2)
+    z2 = z * z
+    center = (p + z2 / (2 * n)) / (1 + z2 / n)
+    h = z / (1 + z2 / n) * math.sqrt(p * (1 - p) / n + z2 / (4.0 * n * n))
+    return max(0.0, center - h), min(1.0, center + h)
+
+
+def bernstein(acc, delta):
+    """
+    Empirical Bernstein interval (Maurer and Pontil) for the mean of
+    outcomes in [0, 1]. It is much tighter than Hoeffding when the variance
+    is small, e.g. for probabilities close to 0 or 1.
+
+    :param acc: :class:`Accumulator` summarizing the outcomes.
+    :param delta: Allowed probability of the interval missing.
+    :return: ``(low, high)``
+    """
+    n = acc.trials
+    if n < 2:
+        return 0.0, 1.0
+    p = acc.mean
+    log = math.log(2 / delta)
+    h = math.sqrt(2 * acc.variance * log / n) + 7 * log / (3 * (n - 1))
+    return max(0.0, p - h), min(1.0, p + h)
+
+
+def normal(acc, delta):
+    """
+    Normal approximation interval, mean plus or minus ``z`` standard errors.
+    Unlike the other intervals it does not need the outcomes to lie in
+    [0, 1], so it is the one used for importance weighted outcomes.
+
+    :param acc: :class:`Accumulator` summarizing the outcomes.
+    :param delta: Allowed probability of the interval missing.
+    :return: ``(low, high)``
+    """
+    h = normal_quantile(1 - delta / 2) * acc.stderr
+    return max(0.0, acc.mean - h), min(1.0, acc.mean + h)
+
+
+#: Interval methods accepted by ``bound=`` arguments.
+BOUNDS = {
+    'hoeffding': hoeffding,
+    'wilson': wilson,
+    'bernstein': bernstein,
+    'normal': normal,
+}
+
+
+def intervals(accs, delta, bound='wilson'):
+    """
+    Computes simultaneous intervals for several means. The error
+    probability ``delta`` is split evenly between them, so all of them hold
+    together with probability at least ``1 - delta``. A mean without any
+    trials, e.g. when every trial violated the resource limits, gets the
+    interval [0, 1].
+
+    :param accs: List of :class:`Accumulator`.
+    :param delta: Allowed probability of any interval missing.
+    :param bound: One of the names in :data:`BOUNDS`.
+    :return: List of ``(low, high)`` tuples.
+    """
+    if bound not in BOUNDS:
+        raise ValueError("Unknown bound " + repr(bound) + ", should be one "
+                         "of " + ", ".join(sorted(BOUNDS)) + ".")
+    f = BOUNDS[bound]
+    d = delta / len(accs)
+    return [f(acc, d) if acc.trials else (0.0, 1.0) for acc in accs]
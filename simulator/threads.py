@@ -0,0 +1,175 @@
+import Queue
+import random
+import sys
+import threading
+
+#: Functions of ``random`` that are routed to the calling thread's own
+#: generator while threads run trials.
+_DISPATCHED = ('seed', 'getstate', 'setstate', 'random', 'uniform',
+               'randint', 'randrange', 'choice', 'sample', 'shuffle',
+               'getrandbits', 'gauss')
+
+_local = threading.local()
+
+# Bytes of C stack a thread needs per level of Python recursion, with room
+# to spare: CPython 2.7 uses about half of it.
+FRAME_STACK = 1024
+
+
+class ThreadRandom(object):
+    """
+    Context manager that makes the module level functions of ``random``
+    per thread: inside it, a thread that has set ``_local.rng`` draws from
+    (and seeds) its own ``random.Random`` and every other thread keeps using
+    the global generator. Games and primitives call ``random`` directly, so
+    this is what gives every worker thread an independent, reproducible
+    stream.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.lock = threading.Lock()
+
+    def _dispatcher(self, name, default):
+        def f(*args, **kwargs):
+            rng = getattr(_local, 'rng', None)
+            if rng is None:
+                return default(*args, **kwargs)
+            return getattr(rng, name)(*args, **kwargs)
+        return f
+
+    def __enter__(self):
+        with self.lock:
+            if self.depth == 0:
+                self.saved = dict((name, getattr(random, name))
+                                  for name in _DISPATCHED)
+                for name, f in self.saved.items():
+                    setattr(random, name, self._dispatcher(name, f))
+            self.depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        with self.lock:
+            self.depth -= 1
+            if self.depth == 0:
+                for name, f in self.saved.items():
+                    setattr(random, name, f)
+
+
+_thread_random = ThreadRandom()
+
+
+class TrialThreads(object):
+    """
+    A persistent pool of worker threads bound to one simulator, with the
+    same interface as :class:`pool.TrialPool`. Every thread runs trials on
+    its own clone of the simulator (and so of the game, see
+    ``Game.clone``) and draws from its own random generator.
+
+    Threads start instantly and share memory, so they beat processes for
+    schemes that release the GIL (PyCrypto's AES) or wait on I/O. Pure
+    Python schemes are better served by processes. The adversary is shared
+    between threads and must not keep state across trials.
+
+    For schemes that wrap a service (an HSM emulator, a stand-in for a
+    remote API) a trial mostly waits, and hundreds of threads can be waiting
+    at once. Every thread runs one shard at a time, so give the simulator a
+    ``concurrency`` to split runs into enough shards: at most ``workers``
+    trials are then in flight. Threads keep the default stack; set
+    :attr:`stack_size` to give them smaller stacks when thousands of them
+    must fit in memory.
+    """
+
+    #: Stack size of the worker threads in bytes, ``None`` for the platform
+    #: default. A smaller stack overflows into a crash of the interpreter
+    #: rather than a RuntimeError, so it is never made smaller than what
+    #: ``sys.getrecursionlimit()`` levels of recursion need.
+    stack_size = None
+
+    def __init__(self, sim, workers):
+        """
+        :param sim: Simulator whose trials the threads will run.
+        :param workers: Number of threads to start.
+        """
+        if sim.proposals:
+            raise ValueError("Importance sampling proposals keep per trial "
+                             "state, use the process executor.")
+        self.workers = workers
+        self.game, self.adversary = sim.game, sim.adversary
+        self.proposals = sim.proposals
+        self._jobs = Queue.Queue()
+        self._threads = []
+        size = 0
+        if self.stack_size is not None:
+            size = max(self.stack_size,
+                       sys.getrecursionlimit() * FRAME_STACK)
+        saved = threading.stack_size(size)
+        try:
+            for i in xrange(workers):
+                t = threading.Thread(target=self._work, args=(sim.clone(),))
+                t.daemon = True
+                t.start()
+                self._threads.append(t)
+        finally:
+            threading.stack_size(saved)
+
+    def serves(self, sim, workers):
+        """
+        :return: True if these threads were started from ``sim`` in its
+                 current state and there are ``workers`` of them.
+        """
+        return (self.workers == workers and self.game is sim.game and
+                self.adversary is sim.adversary and
+                self.proposals == sim.proposals)
+
+    def _work(self, sim):
+        _local.rng = random.Random()
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            name, index, args, out = job
+            try:
+                out.put((index, getattr(sim, name)(*args), None))
+            except Exception:
+                out.put((index, None, sys.exc_info()))
+
+    def imap(self, name, arglist):
+        """
+        Calls a method of the simulator on the threads, once per entry of
+        ``arglist``, and yields the results as they complete.
+
+        :param name: Name of the simulator method.
+        :param arglist: List of argument tuples.
+        :return: Iterator of ``(index, result)`` tuples, where index is the
+                 position of the arguments in ``arglist``.
+        """
+        out = Queue.Queue()
+        with _thread_random:
+            for i, args in enumerate(arglist):
+                self._jobs.put((name, i, tuple(args), out))
+            for _ in xrange(len(arglist)):
+                index, result, exc = out.get()
+                if exc is not None:
+                    raise exc[0], exc[1], exc[2]
+                yield index, result
+
+    def call(self, name, arglist):
+        """
+        Like :meth:`imap` but waits for all calls to finish.
+
+        :return: List of results, in the same order as ``arglist``.
+        """
+        results = [None] * len(arglist)
+        for i, result in self.imap(name, arglist):
+            results[i] = result
+        return results
+
+    def close(self):
+        """
+        Stops the threads.
+        """
+        for t in self._threads:
+            self._jobs.put(None)
+        for t in self._threads:
+            t.join()
@@ -17,27 +17,24 @@ class UFCMASim(BaseSim):
         self.game.initialize()
         return self.game.finalize(self.adversary(self.game.tag))
 
-    def compute_success_ratio(self, n=1000):
+    def compute_success_ratio(self, n=1000, workers=None, seed=None):
         """
         Runs the game 1000 times and computes the ratio of successful runs
         over total runs.
 
+        :param n: Number of runs.
+        :param workers: Number of worker processes to run on.
+        :param seed: Seed that makes the run reproducible.
         :return: successes / total_runs
         """
-        results = []
-        for i in xrange(0, n):
-            results += [self.run()]
+        return self.success_ratio(None, n, workers, seed)
 
-        successes = float(results.count(1))
-        failures = float(results.count(0))
-
-        return successes / (successes + failures)
-
-    def compute_advantage(self, n=1000):
+    def compute_advantage(self, n=None, **kwargs):
         """
         Adv = Pr[UFCMA => True]
 
+        Accepts the options of :meth:`BaseSim.compute_advantage`.
+
         :return: Approximate advantage computed using the above equation.
         """
-
-        return self.compute_success_ratio(n)
+        return super(UFCMASim, self).compute_advantage(n, **kwargs)
@@ -0,0 +1,156 @@
+"""
+Simulators for the lockstep games of ``crypto.games.game_vector``. They run
+their trials in batches of up to :attr:`VectorSim.batch` instances of the
+game at once and otherwise work like the other simulators: seeds, workers,
+adaptive stopping, checkpoints and shards all apply, since the engine only
+ever asks them for the summary of a shard of trials.
+
+This module needs NumPy.
+"""
+import time
+
+import numpy
+
+from crypto.simulator.accumulator import Accumulator, BUCKETS
+from crypto.simulator.base_sim import BaseSim, PAIRED, WEIGHTED
+
+
+def random_state(seed=None):
+    """
+    :param seed: Integer of any size, or ``None`` for a seed taken from the
+                 operating system.
+    :return: A ``numpy.random.RandomState`` seeded with ``seed``.
+    """
+    if seed is None:
+        return numpy.random.RandomState()
+    words = []
+    while True:
+        words.append(int(seed & 0xffffffff))
+        seed >>= 32
+        if not seed:
+            break
+    return numpy.random.RandomState(words)
+
+
+def summary(n, wins, elapsed):
+    """
+    :return: An :class:`Accumulator` of ``n`` trials, ``wins`` of them
+             successful, that took ``elapsed`` seconds in all.
+    """
+    acc = Accumulator()
+    acc.trials = n
+    acc.successes, acc.total = wins, float(wins)
+    acc.m2 = wins - wins * wins / float(n)
+    acc.time = elapsed
+    bucket = min(int(elapsed / n * 1e6).bit_length(), BUCKETS - 1)
+    acc.histogram[bucket] = n
+    return acc
+
+
+class VectorSim(BaseSim):
+    """
+    Base class of the lockstep simulators. Subclasses implement
+    ``run(world, n)``, which plays ``n`` instances of the game and returns
+    a boolean array of their outcomes.
+    """
+
+    #: Maximum number of game instances played at once.
+    batch = 10000
+
+    def trial(self, world=None):
+        raise ValueError("Lockstep simulators only run trials in batches.")
+
+    def run_trials(self, world, trials, seed=None):
+        """
+        Runs ``trials`` trials in ``world`` in this process, in batches.
+
+        :param world: World to run in, ``None`` for single world games.
+        :param trials: Number of trials to run.
+        :param seed: Seed of the game's generator, a fresh one if not
+                     given.
+        :return: An :class:`Accumulator` summarizing the trials.
+        """
+        if world in (PAIRED, WEIGHTED):
+            raise ValueError("Lockstep simulators only support the "
+                             "independent and stratified methods.")
+        self.game.rng = random_state(seed)
+        acc = Accumulator()
+        while acc.trials < trials:
+            n = min(self.batch, trials - acc.trials)
+            start = time.time()
+            wins = int(numpy.count_nonzero(self.run(world, n)))
+            acc.merge(summary(n, wins, time.time() - start))
+        return acc
+
+
+class VectorWorldSim(VectorSim):
+    """
+    Lockstep WorldSim, for VectorGamePRF.
+    """
+
+    worlds = (0, 1)
+
+    def run(self, world, n):
+        """
+        :return: Boolean array of the outcomes of ``n`` instances.
+        """
+        self.game.initialize(n, world)
+        return self.game.finalize(self.adversary(self.game.fn))
+
+    def compute_advantage(self, trials=None, **kwargs):
+        """
+        Adv = Pr[Real => 1] - Pr[Rand => 1]
+
+        Accepts the options of :meth:`BaseSim.compute_advantage`.
+
+        :return: Approximate advantage computed using the above equation.
+        """
+        return super(VectorWorldSim, self).compute_advantage(trials, **kwargs)
+
+
+class VectorLRSim(VectorSim):
+    """
+    Lockstep LRSim, for VectorGameLR.
+    """
+
+    worlds = (0, 1)
+
+    def run(self, b, n):
+        """
+        :return: Boolean array of the outcomes of ``n`` instances.
+        """
+        self.game.initialize(n, b)
+        return self.game.finalize(self.adversary(self.game.lr))
+
+    def compute_advantage(self, trials=None, **kwargs):
+        """
+        Adv = Pr[Right => 1] - Pr[Left => 1]
+
+        Accepts the options of :meth:`BaseSim.compute_advantage`.
+
+        :return: Approximate advantage computed using the above equation.
+        """
+        return super(VectorLRSim, self).compute_advantage(trials, **kwargs)
+
+
+class VectorKRSim(VectorSim):
+    """
+    Lockstep KRSim, for VectorGameKR.
+    """
+
+    def run(self, world, n):
+        """
+        :return: Boolean array of the outcomes of ``n`` instances.
+        """
+        self.game.initialize(n)
+        return self.game.finalize(self.adversary(self.game.fn))
+
+    def compute_advantage(self, trials=None, **kwargs):
+        """
+        Adv = Pr[KR => true]
+
+        Accepts the options of :meth:`BaseSim.compute_advantage`.
+
+        :return: Approximate advantage computed using the above equation.
+        """
+        return super(VectorKRSim, self).compute_advantage(trials, **kwargs)
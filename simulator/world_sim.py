@@ -8,6 +8,8 @@ class WorldSim(BaseSim):
     with an Adversary and allows you to compute an approximate advantage.
     """
 
+    worlds = (0, 1)
+
     def run(self, world):
         """
         Runs the game in a specific world.
@@ -18,30 +20,25 @@ class WorldSim(BaseSim):
         self.game.initialize(world)
         return self.game.finalize(self.adversary(self.game.fn))
 
-    def compute_success_ratio(self, world):
+    def compute_success_ratio(self, world, trials=1000, workers=None,
+                              seed=None):
         """
         Tries game in world and computes the ratio of success / total runs.
 
         :param world: Which world to compute for.
+        :param trials: Number of runs.
+        :param workers: Number of worker processes to run on.
+        :param seed: Seed that makes the run reproducible.
         :return: successes / total_runs
         """
-        results = []
-        for i in xrange(0, 1000):
-            results += [self.run(world)]
-
-        successes = float(results.count(1))
-        failures = float(results.count(0))
-
-        return successes / (successes + failures)
+        return self.success_ratio(world, trials, workers, seed)
 
-    def compute_advantage(self):
+    def compute_advantage(self, trials=None, **kwargs):
         """
         Adv = Pr[Real => 1] - Pr[Rand => 1]
 
+        Accepts the options of :meth:`BaseSim.compute_advantage`.
+
         :return: Approximate advantage computed using the above equation.
         """
-
-        pr_real_1 = float(self.compute_success_ratio(1))
-        pr_rand_1 = float(1 - self.compute_success_ratio(0))
-
-        return pr_real_1 - pr_rand_1
+        return super(WorldSim, self).compute_advantage(trials, **kwargs)
@@ -0,0 +1,244 @@
+"""
+Runs every adversary of a suite against every candidate scheme over a grid
+of parameters and prints the advantage table::
+
+    python -m crypto.sweep sweep.json --workers 8 --cache ~/.sim-cache
+
+A sweep file is an experiment (see ``crypto.run``) whose ``adversary``,
+``scheme`` and ``params`` are replaced by ``adversaries`` (names to import
+paths), ``schemes`` (names to the scheme argument dicts of experiments)
+and ``params`` whose values are lists of the values to try::
+
+    {"game": "GamePRF",
+     "schemes": {"xor": {"prf": "schemes.xor_prf"},
+                 "aes": {"prf": "schemes.aes_prf"}},
+     "adversaries": {"zeros": "adversaries.zeros",
+                     "pairs": "adversaries.pairs"},
+     "params": {"key_len": [16, 32], "input_len": [16]},
+     "trials": 100000, "seed": 1}
+
+Cells that share a scheme and parameters share their game, so a ``setup``
+(e.g. generating RSA parameters) and the tables of warmed ideal primitives
+are paid for once per worker rather than once per adversary. The cells
+are spread over worker processes, each cell running serially in one of
+them: a short pilot run first measures the cost of a trial of every cell,
+and the cells are then handed out most expensive first, so that cheap
+cells fill the other workers while a slow one runs instead of waiting
+behind it. ``pilot`` sets the number of trials per world of the pilot
+runs, 5 by default. Worker processes cannot start workers of their own,
+so with ``--workers`` the ``workers`` option of the cells is ignored.
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+
+from crypto.run import build, make_game, run
+from crypto.simulator.cache import ResultCache
+
+# Games of this process, by the scheme and parameters they were built from.
+_games = {}
+
+
+def cells(sweep):
+    """
+    Expands a sweep into the experiments of its cells, grouped by scheme
+    and parameters.
+
+    :param sweep: Dict describing the sweep.
+    :return: List of experiments, each with its ``adversary_name``,
+             ``scheme_name`` and the ``group`` of cells sharing its game.
+    """
+    grid = sweep.get('params', {})
+    names = sorted(grid)
+    values = [v if isinstance(v, list) else [v] for v in
+              (grid[name] for name in names)]
+    base = dict((k, v) for k, v in sweep.items()
+                if k not in ('schemes', 'adversaries', 'params'))
+    experiments = []
+    for scheme_name in sorted(sweep['schemes']):
+        for point in itertools.product(*values):
+            params = dict(zip(names, point))
+            group = json.dumps([sweep['game'], sweep.get('setup'),
+                                sweep['schemes'][scheme_name], params],
+                               sort_keys=True)
+            for adversary_name in sorted(sweep['adversaries']):
+                experiment = dict(base,
+                                  scheme=sweep['schemes'][scheme_name],
+                                  adversary=sweep['adversaries'][
+                                      adversary_name],
+                                  params=params, group=group,
+                                  scheme_name=scheme_name,
+                                  adversary_name=adversary_name)
+                experiment.setdefault('name', '%s/%s/%s' % (
+                    adversary_name, scheme_name,
+                    ','.join('%s=%s' % item for item in sorted(
+                        params.items()))))
+                experiments.append(experiment)
+    return experiments
+
+
+def _game(experiment):
+    """
+    :return: The game of ``experiment``, shared by the cells of its group
+             that run in this process.
+    """
+    group = experiment['group']
+    if group not in _games:
+        _games[group] = make_game(experiment)
+    return _games[group]
+
+
+def pilot(experiment, trials=5):
+    """
+    Measures the cost of a trial of a cell.
+
+    :param experiment: The cell.
+    :param trials: Trials to run in every world.
+    :return: Seconds per trial.
+    """
+    sim = build(experiment, game=_game(experiment))
+    start = time.time()
+    for world in sim.worlds:
+        sim.run_trials(world, trials)
+    return (time.time() - start) / (trials * len(sim.worlds))
+
+
+def _run_cell((index, experiment, phase, cache)):
+    """
+    Entry point of the worker processes.
+
+    :return: ``(index, result)``: seconds per trial for the pilot phase,
+             the result dict of ``crypto.run.run`` otherwise.
+    """
+    try:
+        if phase == 'pilot':
+            return index, pilot(experiment, experiment.get('pilot', 5))
+        if cache is not None:
+            cache = ResultCache(*cache)
+        return index, run(experiment, cache, game=_game(experiment))
+    except Exception as e:
+        traceback.print_exc()
+        return index, {'error': '%s: %s' % (e.__class__.__name__, e)}
+
+
+def schedule(experiments, costs):
+    """
+    Orders cells for the workers: the most expensive first.
+
+    :param experiments: The cells.
+    :param costs: Seconds per trial of every cell.
+    :return: List of indices into ``experiments``.
+    """
+    def total(i):
+        trials = experiments[i].get('trials') or 1000
+        return -costs[i] * trials
+    return sorted(range(len(experiments)), key=total)
+
+
+def sweep(experiments, workers=None, cache=None):
+    """
+    Runs the cells of a sweep.
+
+    :param experiments: Cells from :func:`cells`.
+    :param workers: Number of worker processes, the cells run in this
+                    process if ``None`` or 1. The cells then run serially
+                    in the workers, whatever their ``workers`` option.
+    :param cache: Optional ``(directory, max_bytes)`` of a
+                  :class:`ResultCache`.
+    :return: List of result dicts, in the order of ``experiments``, with
+             the ``cost`` of a trial from the pilot run if there was one.
+    """
+    results = [None] * len(experiments)
+    if not workers or workers == 1:
+        try:
+            for i, experiment in enumerate(experiments):
+                results[i] = _run_cell((i, experiment, 'run', cache))[1]
+        finally:
+            _games.clear()
+        return results
+    # Pool processes are daemons and may not start processes of their own.
+    experiments = [dict((k, v) for k, v in e.items() if k != 'workers')
+                   for e in experiments]
+    pool = multiprocessing.Pool(workers)
+    try:
+        costs = [None] * len(experiments)
+        for i, cost in pool.imap_unordered(
+                _run_cell, [(i, e, 'pilot', None)
+                            for i, e in enumerate(experiments)]):
+            costs[i] = cost if isinstance(cost, float) else 0.0
+        order = schedule(experiments, costs)
+        for i, result in pool.imap_unordered(
+                _run_cell, [(i, experiments[i], 'run', cache)
+                            for i in order]):
+            results[i] = dict(result, cost=costs[i])
+    finally:
+        pool.close()
+        pool.join()
+    return results
+
+
+def table(experiments, results):
+    """
+    Formats the results of a sweep as a text table, one row per cell.
+
+    :return: The table.
+    """
+    params = sorted(set(k for e in experiments for k in e['params']))
+    header = ['adversary', 'scheme'] + params + ['advantage', 'interval',
+                                                 'trials', 'seconds']
+    rows = [header]
+    for e, r in zip(experiments, results):
+        row = [e['adversary_name'], e['scheme_name']]
+        row += [str(e['params'].get(k, '')) for k in params]
+        if 'error' in r:
+            row += [r['error'], '', '', '']
+        else:
+            row += ['%.4f' % r['advantage'],
+                    '[%.4f, %.4f]' % (r['low'], r['high']),
+                    str(r['trials']), '%.2f' % r['elapsed']]
+        rows.append(row)
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    return '\n'.join('  '.join(cell.ljust(w) for cell, w in zip(row, widths))
+                     .rstrip() for row in rows) + '\n'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m crypto.sweep',
+        description='Run adversary x scheme x parameter sweeps.')
+    parser.add_argument('file', help='sweep file')
+    parser.add_argument('--workers', type=int,
+                        help='number of worker processes')
+    parser.add_argument('--cache', help='directory to cache results in')
+    parser.add_argument('--cache-size', type=int, default=1 << 26,
+                        help='bytes the cache may take up')
+    parser.add_argument('--json', action='store_true',
+                        help='print one JSON result per cell instead of '
+                             'the table')
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(args.file)))
+    with open(args.file) as f:
+        experiments = cells(json.load(f))
+    cache = None
+    if args.cache is not None:
+        cache = (os.path.expanduser(args.cache), args.cache_size)
+    results = sweep(experiments, args.workers, cache)
+    if args.json:
+        for e, r in zip(experiments, results):
+            json.dump(dict(r, name=e['name'], adversary=e['adversary_name'],
+                           scheme=e['scheme_name'], params=e['params']),
+                      sys.stdout, sort_keys=True)
+            sys.stdout.write('\n')
+    else:
+        sys.stdout.write(table(experiments, results))
+    return 1 if any('error' in r for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
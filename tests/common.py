@@ -0,0 +1,33 @@
+"""
+Schemes, adversaries and helpers shared by the tests.
+"""
+from crypto.games.game_prf import GamePRF
+from crypto.simulator.world_sim import WorldSim
+
+
+def low_bit_prf(k, x):
+    """
+    A PRF whose outputs always have their lowest bit cleared, so
+    :func:`low_bit_adversary` has advantage 1/2.
+    """
+    return ''.join(chr(ord(a) & 0xfe) for a in k)
+
+
+def low_bit_adversary(fn):
+    return int(not ord(fn('\x00\x00')[0]) & 1)
+
+
+def prf_sim(adversary=low_bit_adversary, **kwargs):
+    """
+    :return: A WorldSim of :func:`low_bit_prf` with two byte keys and
+             inputs, against ``adversary``.
+    """
+    return WorldSim(GamePRF(low_bit_prf, 2, 2), adversary, **kwargs)
+
+
+def same(a, b):
+    """
+    Asserts that two estimates are equal, interval and trials included.
+    """
+    assert (float(a), a.low, a.high, a.trials) == \
+        (float(b), b.low, b.high, b.trials)
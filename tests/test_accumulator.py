@@ -0,0 +1,37 @@
+import random
+
+from crypto.simulator.accumulator import Accumulator
+from crypto.tests.common import prf_sim
+
+
+def _accumulate(outcomes):
+    acc = Accumulator()
+    for x, elapsed in outcomes:
+        acc.add(x, elapsed)
+    return acc
+
+
+def test_merged_shards_match_one_stream():
+    rng = random.Random(1)
+    outcomes = [(rng.random(), rng.random() / 100) for _ in xrange(1000)]
+    whole = _accumulate(outcomes)
+    merged = Accumulator()
+    for i in xrange(0, 1000, 300):
+        merged.merge(_accumulate(outcomes[i:i + 300]))
+    assert merged.trials == whole.trials == 1000
+    assert abs(merged.mean - whole.mean) < 1e-12
+    assert abs(merged.variance - whole.variance) < 1e-12
+    assert merged.histogram == whole.histogram
+    restored = Accumulator.from_dict(merged.to_dict())
+    assert (restored.mean, restored.variance) == \
+        (merged.mean, merged.variance)
+
+
+def test_iter_trials_streams_without_a_limit():
+    sim = prf_sim()
+    trials = sim.iter_trials(1)
+    acc = Accumulator()
+    for _ in xrange(100):
+        acc.add(*next(trials))
+    assert (acc.trials, acc.successes) == (100, 100)
+    assert acc.latency(1) > 0
@@ -0,0 +1,81 @@
+import random
+
+from crypto.games.game_cca import GameCCA
+from crypto.games.game_int_ctxt import GameINTCTXT
+from crypto.games.game_lr import GameLR
+from crypto.games.game_prf import GamePRF
+from crypto.games.game_ufcma import GameUFCMA
+from crypto.simulator.cca_sim import CCASim
+from crypto.tests.common import low_bit_prf
+
+
+def xor(k, m):
+    return ''.join(chr(ord(a) ^ ord(b)) for a, b in zip(k, m))
+
+
+def _answers(game, world, single, batch, queries, batched=None):
+    """
+    :return: The answers to ``queries`` asked one at a time and as one
+             batch, each of a fresh run of ``game`` on the same coins.
+    """
+    answers = []
+    for call in (single, batch):
+        random.seed(1)
+        game.initialize(*world)
+        if call is single:
+            answers.append([getattr(game, call)(*q) for q in queries])
+        else:
+            answers.append(getattr(game, call)(batched or queries))
+    return answers
+
+
+def test_prf_batch_matches_single_queries():
+    messages = ['ab', 'cd', 'ab', 'ef']
+    for world in (0, 1):
+        game = GamePRF(low_bit_prf, 2, 2)
+        single, batch = _answers(game, (world,), 'fn', 'fn_many',
+                                 [(m,) for m in messages], messages)
+        assert single == batch
+        assert game.fn_many(''.join(messages)) == \
+            [game.fn(m) for m in messages]
+
+
+def test_lr_batch_refuses_what_single_queries_refuse():
+    calls = []
+
+    def encrypt_many(k, ms):
+        calls.append(len(ms))
+        return [xor(k, m) for m in ms]
+
+    pairs = [('ab', 'cd'), ('ab', 'cd'), ('a', 'bc'), ('ef', 'gh')]
+    game = GameLR(xor, 2, encrypt_many=encrypt_many)
+    single, batch = _answers(game, (1,), 'lr', 'lr_many', pairs)
+    assert single == batch
+    assert batch[1] is None and batch[2] is None
+    assert calls == [2]
+
+
+def test_cca_game_runs_with_batched_oracles():
+    game = GameCCA(xor, xor, 2, 2)
+    game.initialize(0)
+    assert len(game.key) == 2
+    cs = game.lr_many([('ab', 'cd'), ('ef', 'gh')])
+    assert game.dec_many(cs + [xor(game.key, 'xy')]) == [None, None, 'xy']
+
+    def adversary(lr, dec):
+        # Flipping a bit of the cipher text gets past the dec oracle.
+        c = lr('ab', 'cd')
+        return int(dec(xor(c, '\x01\x00')) == xor('cd', '\x01\x00'))
+    assert CCASim(game, adversary).compute_advantage(100, seed=1) == 1
+
+
+def test_mac_and_ctxt_batches_match_single_queries():
+    game = GameUFCMA(xor, lambda k, m, t: xor(k, m) == t, 2)
+    single, batch = _answers(game, (), 'tag', 'tag_many',
+                             [('ab',), ('cd',)], ['ab', 'cd'])
+    assert single == batch
+    game = GameINTCTXT(xor, xor, 2)
+    single, batch = _answers(game, (), 'enc', 'enc_many',
+                             [('ab',), ('ab',), ('cd',)], ['ab', 'ab', 'cd'])
+    assert single == batch
+    assert game.dec_many([batch[0], 'zz']) == [False, True]
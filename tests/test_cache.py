@@ -0,0 +1,30 @@
+from crypto import primitives
+from crypto.simulator.cache import ResultCache, fingerprint
+from crypto.tests.common import prf_sim, same
+
+
+def test_cache_hits_on_repeated_run(tmpdir):
+    cache = ResultCache(str(tmpdir))
+    first = prf_sim(cache=cache).compute_advantage(2000, seed=1)
+    second = prf_sim(cache=cache).compute_advantage(2000, seed=1)
+    assert (cache.hits, cache.misses) == (1, 1)
+    same(first, second)
+    prf_sim(cache=cache).compute_advantage(2000, seed=2)
+    assert cache.misses == 2
+
+
+def test_equivalent_arguments_share_a_key(tmpdir):
+    cache = ResultCache(str(tmpdir))
+    sim = prf_sim(cache=cache)
+    first = sim.compute_advantage(seed=1)
+    same(sim.compute_advantage(sim.trials, seed=1L), first)
+    same(prf_sim().compute_advantage(seed=1L), first)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_fingerprint_ignores_lazily_imported_modules():
+    primitives.AES_C = None
+    before = fingerprint(primitives.AES)
+    primitives.AES('k' * 16, 'm' * 16)
+    assert primitives.AES_C is not None
+    assert fingerprint(primitives.AES) == before
@@ -0,0 +1,51 @@
+import pytest
+
+from crypto.tests.common import low_bit_adversary, prf_sim, same
+
+
+class Interrupted(Exception):
+    pass
+
+
+class InterruptingAdversary(object):
+    """
+    :func:`low_bit_adversary` that gives up after a number of trials, to
+    stand in for a run that gets killed.
+    """
+
+    def __init__(self, trials):
+        self.trials = trials
+
+    def __call__(self, fn):
+        if self.trials == 0:
+            raise Interrupted()
+        self.trials -= 1
+        return low_bit_adversary(fn)
+
+
+def test_resumed_checkpoint_matches_uninterrupted_run(tmpdir):
+    path = str(tmpdir.join('run.json'))
+    sim = prf_sim(InterruptingAdversary(1500))
+    with pytest.raises(Interrupted):
+        sim.compute_advantage(2000, seed=1, checkpoint=path,
+                              checkpoint_interval=0)
+    resumed = prf_sim().compute_advantage(2000, seed=1, checkpoint=path)
+    same(resumed, prf_sim().compute_advantage(2000, seed=1))
+
+
+def test_resume_takes_the_seed_from_the_checkpoint(tmpdir):
+    path = str(tmpdir.join('run.json'))
+    with pytest.raises(Interrupted):
+        prf_sim(InterruptingAdversary(1500)).compute_advantage(
+            2000, seed=1, checkpoint=path, checkpoint_interval=0)
+    resumed = prf_sim().compute_advantage(2000, checkpoint=path)
+    same(resumed, prf_sim().compute_advantage(2000, seed=1))
+
+
+def test_checkpoint_of_another_run_is_refused(tmpdir):
+    path = str(tmpdir.join('run.json'))
+    prf_sim().compute_advantage(1000, seed=1, checkpoint=path)
+    with pytest.raises(ValueError):
+        prf_sim().compute_advantage(2000, seed=1, checkpoint=path)
+    with pytest.raises(ValueError):
+        prf_sim().compute_advantage(precision=0.1, seed=1, checkpoint=path)
@@ -0,0 +1,24 @@
+from fractions import Fraction
+
+import pytest
+
+from crypto.simulator.exact import LIMIT
+from crypto.tests.common import prf_sim
+
+
+def test_two_byte_key_prf_advantage_is_exact():
+    # The real world always answers with the lowest bit cleared and the
+    # random world half of the time: the advantage is 1 - 1/2.
+    assert prf_sim().compute_exact_advantage() == Fraction(1, 2)
+
+
+def test_exact_ratio_uses_only_the_coins_a_world_draws():
+    # 2^16 keys in the real world, 2^16 answers in the random one.
+    assert prf_sim().exact_ratio(0, limit=2 ** 16) == Fraction(1, 2)
+    assert prf_sim().exact_ratio(1, limit=2 ** 16) == 1
+    assert 2 ** 17 <= LIMIT
+
+
+def test_too_many_coins_are_refused_up_front():
+    with pytest.raises(ValueError):
+        prf_sim().exact_ratio(0, limit=2 ** 15)
@@ -0,0 +1,36 @@
+import random
+
+from crypto.games.game_cr import GameCR
+from crypto.simulator.cr_sim import CRSim
+from crypto.simulator.importance import restricted_strings
+
+
+def test_weights_average_to_one():
+    random.seed(1)
+    keys = restricted_strings(2, '\x00\x01')
+    total = 0.0
+    for _ in xrange(20000):
+        keys.reset()
+        keys()
+        total += keys.ratio
+    assert abs(total / 20000 - 1) < 0.05
+
+
+def test_importance_sampling_interval_covers_advantage():
+    # The hash collides on every message only under the all zero key.
+    h = lambda k, m: "" if k == "\x00\x00" else m
+    keys = restricted_strings(2, "\x00\x01")
+    sim = CRSim(GameCR(h, 2, key_gen=keys), lambda k: ("a", "b"))
+    e = sim.compute_advantage(20000, proposals=[keys], seed=1)
+    assert e.low <= 2.0 ** -16 <= e.high
+    assert e.relative_error < 0.1
+
+
+def test_wins_outside_the_alphabet_still_count():
+    # Collides under every key starting with a zero byte, most of which
+    # the restricted proposal never draws.
+    h = lambda k, m: "" if k[0] == "\x00" else m
+    keys = restricted_strings(2, "\x00\x01", uniform=0.5)
+    sim = CRSim(GameCR(h, 2, key_gen=keys), lambda k: ("a", "b"))
+    e = sim.compute_advantage(20000, proposals=[keys], seed=1)
+    assert e.low <= 2.0 ** -8 <= e.high
@@ -0,0 +1,34 @@
+from crypto.games.game_prf import GamePRF
+from crypto.games.instrument import Instrumented
+from crypto.simulator.world_sim import WorldSim
+from crypto.tests.common import low_bit_adversary, low_bit_prf
+
+
+def many_queries_adversary(fn):
+    for m in ('ab', 'cd', 'ef'):
+        fn(m)
+    return low_bit_adversary(fn)
+
+
+def test_usage_per_trial_is_reported():
+    game = Instrumented(GamePRF(low_bit_prf, 2, 2))
+    e = WorldSim(game, many_queries_adversary).compute_advantage(100, seed=1)
+    assert e.resources['queries'] == 4
+    assert e.resources['queries.fn'] == 4
+    assert e.resources['bytes'] == 8
+    assert e.resources['time.oracles'] > 0
+    assert 'refused' not in e.resources
+
+
+def test_queries_over_the_budget_are_refused():
+    game = Instrumented(GamePRF(low_bit_prf, 2, 2), budget=3)
+    game.initialize(1)
+    answers = [game.fn(m) for m in ('ab', 'cd', 'ef', 'gh')]
+    assert answers[3] is None and None not in answers[:3]
+    assert game.fn_many(['ij', 'kl']) == [None, None]
+    usage = game.take_usage()
+    assert (usage['queries'], usage['refused']) == (6, 3)
+    game.initialize(1)
+    # A batch that crosses the budget is answered up to it.
+    answers = game.fn_many(['ab', 'cd', 'ef', 'gh'])
+    assert answers == [game.game.fn(m) for m in ('ab', 'cd', 'ef')] + [None]
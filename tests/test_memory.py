@@ -0,0 +1,40 @@
+import gc
+
+from crypto.ideal import tables
+from crypto.ideal.block_cipher import BlockCipher
+from crypto.tests.common import low_bit_adversary, prf_sim
+
+
+def greedy_adversary(fn):
+    block = 'x' * (64 << 20)
+    return low_bit_adversary(fn) or not block
+
+
+def test_tables_are_counted():
+    cipher = BlockCipher(2, 2)
+    cipher.encrypt('ab', 'cd')
+    cipher.encrypt('ab', 'cd')
+    c = cipher.encrypt('ab', 'ef')
+    cipher.decrypt('ab', c)
+    stats = cipher.stats()
+    assert stats['tables']['messages']['entries'] == 2
+    assert stats['tables']['ciphers']['entries'] == 2
+    assert (stats['hits'], stats['misses']) == (2, 2)
+    assert stats['bytes'] > 0
+    assert stats in tables.report()
+
+
+def test_dead_primitives_are_not_reported():
+    gc.collect()
+    live = len(tables.instances())
+    cipher = BlockCipher(2, 2)
+    assert len(tables.instances()) == live + 1
+    del cipher
+    gc.collect()
+    assert len(tables.instances()) == live
+
+
+def test_memory_peak_of_trials_is_reported():
+    e = prf_sim(greedy_adversary, trace_memory=True).compute_advantage(10)
+    assert e.resources['memory.peak'] >= 64 << 20
+    assert prf_sim().compute_advantage(10).resources is None
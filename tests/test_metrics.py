@@ -0,0 +1,43 @@
+import os
+import random
+
+from crypto.games.game_prf import GamePRF
+from crypto.ideal.block_cipher import BlockCipher
+from crypto.simulator.metrics import Metrics, prometheus
+from crypto.simulator.world_sim import WorldSim
+from crypto.tests.common import low_bit_adversary, prf_sim, same
+
+
+def test_metrics_report_the_workers_and_their_tables():
+    cipher = BlockCipher(2, 2)
+    snapshots = []
+    sim = WorldSim(GamePRF(cipher.encrypt, 2, 2), low_bit_adversary,
+                   metrics=Metrics(callback=snapshots.append, interval=0))
+    try:
+        sim.compute_advantage(1000, workers=2, seed=1)
+    finally:
+        sim.close()
+    m = snapshots[-1]
+    # Only the workers filled the cipher's tables, one entry per key drawn
+    # in the real world.
+    assert len(cipher.ciphers) == 0
+    assert 0 < m['ideal_entries'][('BlockCipher', 'ciphers')] <= 1000
+    workers = m['worker_stats']
+    assert 1 <= len(workers) <= 2
+    assert sum(w['trials'] for w in workers.values()) == 2000
+    assert sum(w['shards'] for w in workers.values()) == m['shards_total']
+    assert not any(w.startswith('%d/' % os.getpid()) for w in workers)
+    assert 'crypto_sim_worker_trials{worker=' in prometheus(m)
+
+
+def test_metrics_do_not_change_the_result():
+    metered = prf_sim(metrics=Metrics(interval=0))
+    same(metered.compute_advantage(2000, seed=1),
+         prf_sim().compute_advantage(2000, seed=1))
+
+
+def test_metrics_keep_the_plain_loop():
+    random.seed(1)
+    plain = prf_sim().compute_advantage(2000)
+    random.seed(1)
+    same(prf_sim(metrics=Metrics(interval=0)).compute_advantage(2000), plain)
@@ -0,0 +1,39 @@
+import multiprocessing
+import time
+
+from crypto.tests.common import prf_sim, same
+
+
+def test_result_does_not_depend_on_workers():
+    serial = prf_sim().compute_advantage(2000, seed=1)
+    sim = prf_sim()
+    try:
+        for workers in (2, 3):
+            same(sim.compute_advantage(2000, workers=workers, seed=1), serial)
+    finally:
+        sim.close()
+
+
+def _best_time(f, repeat=5):
+    times = []
+    for _ in xrange(repeat):
+        start = time.time()
+        f()
+        times.append(time.time() - start)
+    return min(times)
+
+
+def test_workers_are_not_slower_than_serial_for_cheap_trials():
+    sim = prf_sim()
+    try:
+        # Starts the pool, which later calls reuse.
+        sim.compute_advantage(10, workers=2, seed=0)
+        serial = _best_time(lambda: sim.compute_advantage(1000, seed=1))
+        parallel = _best_time(
+            lambda: sim.compute_advantage(1000, workers=2, seed=1))
+    finally:
+        sim.close()
+    # On a single CPU the workers cannot help, only the messages to them
+    # may cost something.
+    slack = 1.2 if multiprocessing.cpu_count() > 1 else 2.0
+    assert parallel <= serial * slack
@@ -0,0 +1,46 @@
+import json
+
+from crypto.run import main
+
+
+EXPERIMENT = {'name': 'low-bit', 'game': 'GamePRF',
+              'scheme': {'prf': 'crypto.tests.common.low_bit_prf'},
+              'params': {'key_len': 2, 'input_len': 2},
+              'adversary': 'crypto.tests.common.low_bit_adversary',
+              'trials': 1000, 'seed': 1}
+
+
+def _main(tmpdir, experiments, *args):
+    path = tmpdir.join('experiments.json')
+    path.write(json.dumps(experiments))
+    out = tmpdir.join('results.jsonl')
+    status = main([str(path), '--output', str(out)] + list(args))
+    return status, [json.loads(line) for line in out.readlines()]
+
+
+def test_runs_every_experiment_of_a_file(tmpdir):
+    # Schemes and adversaries may live next to the experiment file.
+    tmpdir.join('run_test_adversaries.py').write(
+        'def guess_one(fn):\n    return 1\n')
+    other = dict(EXPERIMENT, name='guess-one',
+                 adversary='run_test_adversaries.guess_one')
+    status, results = _main(tmpdir, [EXPERIMENT, other])
+    assert status == 0
+    assert [r['name'] for r in results] == ['low-bit', 'guess-one']
+    assert results[0]['low'] <= 0.5 <= results[0]['high']
+    assert results[0]['trials'] == 2000
+    assert results[1]['advantage'] == 0
+
+
+def test_failed_experiment_is_reported(tmpdir):
+    broken = dict(EXPERIMENT, name='broken', game='GameNone')
+    status, results = _main(tmpdir, [broken, EXPERIMENT])
+    assert status == 1
+    assert 'error' in results[0] and 'error' not in results[1]
+
+
+def test_results_come_from_the_cache(tmpdir):
+    cache = str(tmpdir.join('cache'))
+    _main(tmpdir, EXPERIMENT, '--cache', cache)
+    results = _main(tmpdir, EXPERIMENT, '--cache', cache)[1]
+    assert results[0]['cached']
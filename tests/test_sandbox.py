@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+from crypto.simulator.sandbox import Limits
+from crypto.tests.common import low_bit_adversary, prf_sim, same
+
+
+def hanging_adversary(fn):
+    if ord(fn('\x00\x00')[0]) & 1:
+        time.sleep(60)
+    return low_bit_adversary(fn)
+
+
+def greedy_adversary(fn):
+    if ord(fn('\x00\x00')[0]) & 1:
+        'x' * 2 ** 30
+    return low_bit_adversary(fn)
+
+
+def failing_adversary(fn):
+    raise KeyError('adversary')
+
+
+def test_limited_runs_are_reproducible():
+    sim = prf_sim(limits=Limits(wall=10))
+    try:
+        e = sim.compute_advantage(200, seed=1)
+        same(sim.compute_advantage(200, seed=1), e)
+    finally:
+        sim.close()
+    assert e.violations == 0
+    assert e.low <= 0.5 <= e.high
+
+
+def test_trials_over_the_wall_clock_limit_are_violations():
+    # Half the trials in the random world hang.
+    sim = prf_sim(hanging_adversary, limits=Limits(wall=0.05))
+    try:
+        start = time.time()
+        e = sim.compute_advantage(20, seed=1)
+    finally:
+        sim.close()
+    assert time.time() - start < 5
+    assert 0 < e.violations < 20
+    assert e.trials + e.violations == 40
+
+
+def test_trials_over_the_memory_limit_are_violations():
+    sim = prf_sim(greedy_adversary, limits=Limits(memory=2 ** 29))
+    try:
+        e = sim.compute_advantage(20, seed=1)
+    finally:
+        sim.close()
+    assert 0 < e.violations < 20
+    assert e.trials + e.violations == 40
+
+
+def test_errors_of_sandboxed_trials_are_raised():
+    sim = prf_sim(failing_adversary, limits=Limits(wall=10))
+    try:
+        with pytest.raises(KeyError):
+            sim.compute_advantage(10)
+    finally:
+        sim.close()
@@ -0,0 +1,59 @@
+import threading
+
+import pytest
+
+from crypto.games.game_prf import GamePRF
+from crypto.games.server import OracleClient, OracleError, OracleServer
+
+
+def _serve(game, tmpdir):
+    server = OracleServer(game, str(tmpdir.join('game.sock')))
+    t = threading.Thread(target=server.serve_forever)
+    t.daemon = True
+    t.start()
+    client = OracleClient(server.path)
+    # A server that stops answering fails the test instead of hanging it.
+    client.sock.settimeout(10)
+    return server, client
+
+
+def test_unencodable_result_is_reported(tmpdir):
+    server, client = _serve(GamePRF(lambda k, x: 0.5, 2, 2), tmpdir)
+    try:
+        client.call('initialize', 1)
+        with pytest.raises(OracleError) as e:
+            client.call('fn', 'ab')
+        assert e.value.index == 0
+        with pytest.raises(OracleError):
+            client.batch('fn', [('ab',), ('cd',)])
+        # The connection is still usable.
+        assert client.call('finalize', 1) is True
+    finally:
+        client.close()
+        server.close()
+
+
+def test_batch_goes_to_the_batch_oracle_in_one_call(tmpdir):
+    calls = []
+
+    def prf(k, x):
+        return x[::-1]
+
+    def prf_many(k, xs):
+        calls.append(len(xs))
+        return [prf(k, x) for x in xs]
+
+    server, client = _serve(GamePRF(prf, 2, 2, prf_many=prf_many), tmpdir)
+    try:
+        client.call('initialize', 1)
+        messages = ['%02d' % i for i in range(100)]
+        assert client.batch('fn', [(m,) for m in messages]) == \
+            [m[::-1] for m in messages]
+        assert calls == [100]
+        with pytest.raises(OracleError) as e:
+            client.batch('fn', [('ab',), ('abc',)])
+        # The batch oracle raised for the batch as a whole.
+        assert e.value.index == -1
+    finally:
+        client.close()
+        server.close()
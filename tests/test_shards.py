@@ -0,0 +1,33 @@
+import json
+
+import pytest
+
+from crypto.simulator.shards import main, merge, result_files
+from crypto.tests.common import prf_sim, same
+
+
+def _run_nodes(tmpdir, count, seed=1):
+    paths = [str(tmpdir.join('node%d.json' % i)) for i in range(count)]
+    for i, path in enumerate(paths):
+        prf_sim().run_shard(path, i, count, seed=seed, trials=2000)
+    return paths
+
+
+def test_merged_shards_match_full_run(tmpdir):
+    paths = _run_nodes(tmpdir, 3)
+    same(merge(paths), prf_sim().compute_advantage(2000, seed=1))
+
+
+def test_missing_node_is_refused(tmpdir):
+    paths = _run_nodes(tmpdir, 3)
+    with pytest.raises(ValueError):
+        merge(paths[:2])
+
+
+def test_merge_command_reads_a_directory(tmpdir, capsys):
+    _run_nodes(tmpdir, 2)
+    assert len(result_files([str(tmpdir)])) == 2
+    main(['merge', str(tmpdir)])
+    out = json.loads(capsys.readouterr()[0])
+    assert out['trials'] == 4000
+    assert out['low'] <= 0.5 <= out['high']
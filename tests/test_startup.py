@@ -0,0 +1,15 @@
+import subprocess
+import sys
+
+SLOW = ('Crypto', 'IPython', 'numpy', 'multiprocessing')
+
+
+def test_simulating_does_not_import_slow_modules():
+    # A fresh interpreter, since this one has imported everything by now.
+    code = ('import sys\n'
+            'import crypto.games.game_prf, crypto.simulator.world_sim\n'
+            'import crypto.primitives, crypto.tools\n'
+            'print " ".join(sorted(set(m.split(".")[0] '
+            'for m in sys.modules)))\n')
+    loaded = subprocess.check_output([sys.executable, '-c', code]).split()
+    assert not set(SLOW) & set(loaded)
@@ -0,0 +1,56 @@
+import random
+
+from crypto.simulator.accumulator import Accumulator
+from crypto.simulator.base_sim import BaseSim
+from crypto.simulator.stats import BOUNDS
+
+
+class _Game(object):
+
+    def clone(self):
+        return self
+
+
+class RareWinSim(BaseSim):
+    """
+    Two world simulator of an adversary that guesses at random, except in
+    world 1 where it also spots the world one time in a thousand: its
+    advantage is 0.001.
+    """
+
+    worlds = (0, 1)
+
+    def __init__(self):
+        super(RareWinSim, self).__init__(_Game(), None)
+
+    def run(self, world):
+        x = random.random()
+        guess = 1 if x < 0.5 or (world == 1 and x > 0.999) else 0
+        return guess == world
+
+
+def _accumulator(outcomes):
+    acc = Accumulator()
+    for outcome in outcomes:
+        acc.add(outcome)
+    return acc
+
+
+def test_intervals_have_width_without_variance():
+    acc = _accumulator([0.5] * 200)
+    for name in ('hoeffding', 'wilson', 'bernstein'):
+        low, high = BOUNDS[name](acc, 0.05)
+        assert low < 0.5 < high, name
+
+
+def test_paired_rare_win_interval_covers_advantage():
+    e = RareWinSim().compute_advantage(method='paired', precision=0.01,
+                                       seed=1)
+    assert e.high > e.low
+    assert e.low <= 0.001 <= e.high
+    assert e.half_width <= 0.01
+
+
+def test_independent_rare_win_interval_covers_advantage():
+    e = RareWinSim().compute_advantage(precision=0.02, seed=1)
+    assert e.low <= 0.001 <= e.high
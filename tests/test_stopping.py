@@ -0,0 +1,16 @@
+from crypto.tests.common import prf_sim
+
+
+def test_stops_once_the_interval_is_tight_enough():
+    e = prf_sim().compute_advantage(precision=0.05, seed=1)
+    assert e.half_width <= 0.05
+    assert e.low <= 0.5 <= e.high
+    # A fixed run needs about 1300 trials for this precision, and the
+    # batches overshoot that by a bounded factor.
+    assert e.trials < 4000
+
+
+def test_trials_cap_a_run_with_a_precision():
+    e = prf_sim().compute_advantage(100, precision=0.001, seed=1)
+    assert e.trials <= 200
+    assert e.half_width > 0.001
@@ -0,0 +1,59 @@
+from crypto.run import resolve
+from crypto.sweep import cells, schedule, sweep, table
+
+#: Parameters :func:`count_setup` ran with in this process.
+setups = []
+
+
+def count_setup(key_len, input_len):
+    setups.append((key_len, input_len))
+    return {}
+
+
+def guess_one(fn):
+    return 1
+
+
+SWEEP = {'game': 'GamePRF',
+         'schemes': {'low-bit': {'prf': 'crypto.tests.common.low_bit_prf'},
+                     'xor': {'prf': 'crypto.tools.xor_strings'}},
+         'adversaries': {'low-bit': 'crypto.tests.common.low_bit_adversary',
+                         'one': 'crypto.tests.test_sweep.guess_one'},
+         'params': {'key_len': [2, 4], 'input_len': 2},
+         'setup': 'crypto.tests.test_sweep.count_setup',
+         'trials': 500, 'seed': 1}
+
+
+def test_cells_cover_the_grid():
+    experiments = cells(SWEEP)
+    assert len(experiments) == 8
+    assert len(set(e['group'] for e in experiments)) == 4
+    assert experiments[0]['name'] == 'low-bit/low-bit/input_len=2,key_len=2'
+
+
+def test_cells_of_a_group_share_their_setup():
+    # The sweep imports this module under its crypto package name, which
+    # need not be the module pytest loaded.
+    calls = resolve('crypto.tests.test_sweep.setups')
+    del calls[:]
+    experiments = cells(SWEEP)
+    results = sweep(experiments)
+    assert len(calls) == 4
+    assert all(r['advantage'] == 0 for e, r in zip(experiments, results)
+               if e['adversary_name'] == 'one')
+    text = table(experiments, results)
+    assert len(text.splitlines()) == 9
+
+
+def test_workers_give_the_serial_results():
+    experiments = cells(SWEEP)
+    serial = sweep(experiments)
+    parallel = sweep(experiments, workers=2)
+    assert [r['advantage'] for r in parallel] == \
+        [r['advantage'] for r in serial]
+    assert all(r['cost'] > 0 for r in parallel)
+
+
+def test_expensive_cells_go_first():
+    experiments = [{'trials': 100}, {'trials': 1000}, {}]
+    assert schedule(experiments, [1.0, 1.0, 2.0]) == [2, 1, 0]
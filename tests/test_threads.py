@@ -0,0 +1,59 @@
+import random
+import time
+
+from crypto.games.game_prf import GamePRF
+from crypto.simulator.threads import TrialThreads
+from crypto.tests.common import low_bit_adversary, low_bit_prf, prf_sim, same
+
+
+def sleeping_adversary(fn):
+    # Stands in for a scheme that waits on a remote service.
+    time.sleep(0.01)
+    return low_bit_adversary(fn)
+
+
+def test_clones_keep_their_own_state():
+    game = GamePRF(low_bit_prf, 2, 2)
+    game.initialize(0)
+    game.fn('ab')
+    clone = game.clone()
+    clone.fn('cd')
+    assert sorted(game.messages) == ['ab']
+    assert sorted(clone.messages) == ['ab', 'cd']
+    assert clone.prf is game.prf
+
+
+def test_threads_give_the_serial_result():
+    serial = prf_sim().compute_advantage(2000, seed=1)
+    sim = prf_sim(executor='thread')
+    try:
+        same(sim.compute_advantage(2000, workers=3, seed=1), serial)
+    finally:
+        sim.close()
+
+
+def test_threads_draw_from_their_own_streams():
+    sim = prf_sim()
+    pool = TrialThreads(sim, 2)
+    try:
+        state = random.getstate()
+        a, b = pool.call('run_trials', [(0, 100, 1), (0, 100, 1)])
+        # Seeding a worker thread leaves the global stream alone.
+        assert random.getstate() == state
+        assert (a.successes, a.mean) == (b.successes, b.mean)
+    finally:
+        pool.close()
+
+
+def test_blocking_trials_run_concurrently():
+    sim = prf_sim(sleeping_adversary, executor='thread', concurrency=100)
+    try:
+        start = time.time()
+        e = sim.compute_advantage(400, workers=100, seed=1)
+        elapsed = time.time() - start
+        # 800 trials of 10ms take 8s one after another, and 1.4s in the
+        # six shards the run would have without concurrency.
+        assert elapsed < 1
+        same(sim.compute_advantage(400, workers=50, seed=1), e)
+    finally:
+        sim.close()
@@ -0,0 +1,26 @@
+import time
+
+from crypto.tests.common import low_bit_adversary, prf_sim
+
+
+def slow_adversary(fn):
+    time.sleep(0.001)
+    return low_bit_adversary(fn)
+
+
+def test_run_stays_within_its_time_budget():
+    sim = prf_sim(slow_adversary)
+    start = time.time()
+    e = sim.compute_advantage(time_budget=0.5)
+    elapsed = time.time() - start
+    # A trial takes a little over 1ms, so the budget is overshot by about
+    # that much; the rest is slack for a loaded machine.
+    assert elapsed < 0.6
+    # At least half of the budget goes to trials.
+    assert e.trials > 200
+    assert e.low <= 0.5 <= e.high
+
+
+def test_trials_cap_a_run_with_a_time_budget():
+    e = prf_sim().compute_advantage(100, time_budget=10)
+    assert e.trials == 200
@@ -0,0 +1,58 @@
+import glob
+
+from crypto.games.game_prf import GamePRF
+from crypto.games.transcript import Recorded, Transcript
+from crypto.simulator.sandbox import Limits
+from crypto.simulator.world_sim import WorldSim
+from crypto.tests.common import low_bit_adversary, low_bit_prf
+
+
+def _records(path):
+    records = []
+    for name in sorted(glob.glob(path + '*')):
+        transcript = Transcript(name)
+        records.extend((r.trial, r.operation, r.args(), r.result(), r.error)
+                       for r in transcript)
+        transcript.close()
+    return records
+
+
+def _recorded_sim(path, **kwargs):
+    return WorldSim(Recorded(GamePRF(low_bit_prf, 2, 2), path),
+                    low_bit_adversary, **kwargs)
+
+
+def test_sandboxed_trials_are_recorded(tmpdir):
+    path = str(tmpdir.join('prf.bin'))
+    sim = _recorded_sim(path, limits=Limits(wall=10))
+    sim.compute_advantage(100)
+    sim.close()
+    operations = [r[1] for r in _records(path)]
+    assert operations.count('initialize') == 200
+    assert operations.count('fn') == 200
+
+
+def test_workers_write_their_own_files(tmpdir):
+    path = str(tmpdir.join('prf.bin'))
+    sim = _recorded_sim(path)
+    sim.compute_advantage(1000, workers=2, seed=1)
+    sim.close()
+    assert len(glob.glob(path + '.*')) == 2
+    records = _records(path)
+    assert [r[1] for r in records].count('finalize') == 2000
+    # Files that were not interleaved hold every trial's records in order.
+    for name in glob.glob(path + '.*'):
+        transcript = Transcript(name)
+        ops = [r.operation for r in transcript]
+        transcript.close()
+        assert ops == ['initialize', 'fn', 'finalize'] * (len(ops) // 3)
+
+
+def test_unencodable_result_is_an_error_record(tmpdir):
+    path = str(tmpdir.join('prf.bin'))
+    game = Recorded(GamePRF(lambda k, x: [0.5], 2, 2), path)
+    WorldSim(game, lambda fn: fn('ab') and 0).compute_advantage(10)
+    game.flush()
+    # Only the real world's answers are lists of floats.
+    errors = [r[1:] for r in _records(path) if r[4]]
+    assert errors == [('fn', "('ab',)", '[0.5]', True)] * 10
@@ -0,0 +1,35 @@
+import random
+
+from crypto.tests.common import prf_sim
+
+
+def coin_adversary(fn):
+    """
+    Guesses 0 when the low bit is set and flips a coin otherwise, so it has
+    advantage 1/4 and its guesses in the two worlds share the coin under
+    common random numbers.
+    """
+    if ord(fn('\x00\x00')[0]) & 1:
+        return 0
+    return random.randrange(2)
+
+
+def test_paired_interval_covers_advantage():
+    e = prf_sim().compute_advantage(method='paired', precision=0.02, seed=1)
+    assert e.low <= 0.5 <= e.high
+
+
+def test_pairing_lowers_the_standard_error():
+    sim = prf_sim(coin_adversary)
+    paired = sim.compute_advantage(2000, method='paired', seed=1)
+    independent = sim.compute_advantage(2000, seed=1)
+    assert paired.low <= 0.25 <= paired.high
+    assert paired.trials == independent.trials
+    assert paired.stderr < 0.8 * independent.stderr
+
+
+def test_stratified_interval_covers_advantage():
+    e = prf_sim(coin_adversary).compute_advantage(2000, method='stratified',
+                                                  seed=1)
+    assert e.trials == 4000
+    assert e.low <= 0.25 <= e.high
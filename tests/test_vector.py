@@ -0,0 +1,54 @@
+import numpy
+import pytest
+
+from crypto.games.game_vector import VectorGameLR, VectorGamePRF
+from crypto.simulator.vector_sim import VectorLRSim, VectorWorldSim
+from crypto.tests.common import same
+
+
+def low_bit_prf(k, x):
+    return k & 0xfe
+
+
+def low_bit_adversary(fn):
+    return 1 - (fn(numpy.zeros(2, dtype=numpy.uint8))[:, 0] & 1)
+
+
+def test_lockstep_prf_advantage():
+    sim = VectorWorldSim(VectorGamePRF(low_bit_prf, 2, 2), low_bit_adversary)
+    e = sim.compute_advantage(20000, seed=1)
+    assert e.low <= 0.5 <= e.high
+    same(sim.compute_advantage(20000, seed=1), e)
+    threaded = VectorWorldSim(VectorGamePRF(low_bit_prf, 2, 2),
+                              low_bit_adversary, executor='thread')
+    try:
+        same(threaded.compute_advantage(20000, workers=2, seed=1), e)
+    finally:
+        threaded.close()
+
+
+def test_repeated_pairs_are_masked_per_instance():
+    game = VectorGameLR(lambda k, m: k ^ m, 2)
+    game.initialize(3, 1)
+    l = numpy.array([[0, 0], [1, 1], [2, 2]], dtype=numpy.uint8)
+    r = numpy.ones((3, 2), dtype=numpy.uint8)
+    assert not game.lr(l, r).mask.any()
+    # Only the first instance asks the same pair again.
+    l[1:] += 10
+    c = game.lr(l, r)
+    assert c.mask.tolist() == [[True, True], [False, False], [False, False]]
+    assert (c[1:] == game.key[1:] ^ 1).all()
+    assert game.lr(numpy.zeros(2), numpy.zeros(3)).mask.all()
+
+
+def test_lockstep_lr_advantage():
+    def adversary(lr):
+        zero, one = numpy.zeros(2), numpy.ones(2)
+        # The same pair twice gets no answer, so this adversary must
+        # notice which world the one answer it gets comes from.
+        c0 = lr(zero, one)
+        return (lr(zero, one).mask[:, 0] & (c0[:, 0] == 1)).astype(int)
+    sim = VectorLRSim(VectorGameLR(lambda k, m: m, 2), adversary)
+    assert sim.compute_advantage(1000, seed=1) == 1
+    with pytest.raises(ValueError):
+        sim.compute_advantage(1000, seed=1, method='paired')
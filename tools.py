@@ -3,10 +3,20 @@ from StringIO import StringIO
 
 import random
 
-try:
-    from IPython import embed as debug
-except ImportError:
-    pass
+def debug(**kwargs):
+    """
+    Drops into an IPython shell in the caller's namespace, like IPython's
+    ``embed``. IPython is only imported when this is called, as importing
+    it takes far longer than importing the rest of the package.
+
+    :param kwargs: Options of the shell, as for ``embed``.
+    """
+    from IPython.terminal.embed import InteractiveShellEmbed
+    from IPython.terminal.ipapp import load_default_config
+    if kwargs.get('config') is None:
+        kwargs['config'] = load_default_config()
+    InteractiveShellEmbed(**kwargs)(stack_depth=2)
+
 
 def egcd(a, b):
     """